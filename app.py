@@ -3,10 +3,17 @@ import sys
 from PyQt6.QtWidgets import QApplication
 
 from windows.main import MainApp
+from backendRequests.httpSession import SessionPool
+from utils.worker import Worker
+from backendRequests.asyncRequests import AsyncAPIClient
 
 if __name__ == '__main__':
 
     app = QApplication(sys.argv)
+    app.setApplicationName('wms')  # 决定用户缓存目录(QStandardPaths.CacheLocation)的名称
+    AsyncAPIClient.install_event_loop(app)
+    app.aboutToQuit.connect(SessionPool.close)
+    app.aboutToQuit.connect(Worker.shutdown)
     main_app = MainApp()
     main_app.show_login()
-    sys.exit(app.exec())
\ No newline at end of file
+    sys.exit(AsyncAPIClient.exec(app))
\ No newline at end of file
@@ -6,7 +6,11 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('resources', 'resources')],
-    hiddenimports=[],
+    hiddenimports=['inventory.inventoryInterface', 'history.historyInterface', 'orders.ordersInterface',
+                   'project.projectInterface', 'provider.providerInterface', 'users.userInterface',
+                   'employee.employeeInterface', 'operation_logs.logsInterface',
+                   # 可选依赖在 try/except 中导入, 显式列出以确保打包
+                   'qasync', 'pypinyin', 'orjson', 'brotli'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
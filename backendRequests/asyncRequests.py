@@ -0,0 +1,124 @@
+import asyncio
+import threading
+
+from backendRequests.jsonRequests import APIClient
+from utils.worker import Worker
+from utils.app_logger import get_logger
+
+try:
+    import qasync  # 用于将 asyncio 事件循环与 Qt 事件循环集成, 未安装时退回后台线程中的事件循环
+except ImportError:
+    qasync = None
+
+error_logger = get_logger(logger_name='error_logger', log_file='error.log')
+
+
+class AsyncAPIClient:
+    """
+    asyncio 版本的 APIClient
+    请求仍由 APIClient 在共享线程池中执行(复用连接池与 JWT 请求头), 这里只把返回的 Future 包装为可 await 的对象,
+    从而可以用 gather 并发地发起多个请求, 例如同时获取 /orders/count 与 /orders/page/N
+    安装了 qasync 时协程运行在与 Qt 集成的事件循环上; 否则运行在后台线程的事件循环上, 结果通过 Worker 投递回 GUI 线程
+    """
+    timeout = 30  # 与 APIClient 中 requests 的超时时间一致
+
+    _loop = None
+    _qt_loop = False
+    _lock = threading.Lock()
+
+    @staticmethod
+    def install_event_loop(app) -> bool:
+        """
+        为 QApplication 安装 qasync 事件循环, 需在创建窗口前调用
+        :return: 是否成功安装(未安装 qasync 时返回 False)
+        """
+        if qasync is None:
+            return False
+        loop = qasync.QEventLoop(app)
+        asyncio.set_event_loop(loop)
+        AsyncAPIClient._loop = loop
+        AsyncAPIClient._qt_loop = True
+        return True
+
+    @staticmethod
+    def exec(app) -> int:
+        """运行应用主循环, 已安装 qasync 事件循环时由其驱动 Qt 事件循环"""
+        if AsyncAPIClient._qt_loop:
+            with AsyncAPIClient._loop:
+                AsyncAPIClient._loop.run_forever()
+            return 0
+        return app.exec()
+
+    @staticmethod
+    async def get_request(url: str, is_stream=False):
+        return await AsyncAPIClient._await(APIClient.get_request(url, is_stream=is_stream))
+
+    @staticmethod
+    async def post_request(url: str, data: dict, compress=False):
+        return await AsyncAPIClient._await(APIClient.post_request(url, data, compress))
+
+    @staticmethod
+    async def delete_request(url: str, id_list: list):
+        return await AsyncAPIClient._await(APIClient.delete_request(url, id_list))
+
+    @staticmethod
+    async def gather(*coroutines, return_exceptions=False) -> list:
+        """并发执行多个请求协程, 按传入顺序返回结果"""
+        return await asyncio.gather(*coroutines, return_exceptions=return_exceptions)
+
+    @staticmethod
+    def run(coroutine, callback=None, error_callback=None):
+        """
+        在 GUI 代码中启动协程, 完成后在 GUI 线程中调用回调
+        :param coroutine: 协程对象
+        :param callback: 成功时的回调, 参数为协程返回值
+        :param error_callback: 抛出异常时的回调, 参数为异常对象
+        """
+        loop = AsyncAPIClient._get_loop()
+        if AsyncAPIClient._qt_loop:
+            # qasync 事件循环运行在 GUI 线程, 任务完成时的回调也在 GUI 线程中执行
+            task = loop.create_task(coroutine)
+            task.add_done_callback(lambda t: AsyncAPIClient._deliver(t, callback, error_callback))
+            return task
+        future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+        Worker.watch(future, callback, error_callback)
+        return future
+
+    @staticmethod
+    async def _await(future):
+        """将线程池返回的 concurrent.futures.Future 包装为 asyncio Future 并应用超时"""
+        result = await asyncio.wait_for(asyncio.wrap_future(future), timeout=AsyncAPIClient.timeout)
+        if isinstance(result, tuple) and len(result) == 1:
+            result = result[0]
+        return result
+
+    @staticmethod
+    def _get_loop():
+        with AsyncAPIClient._lock:
+            if AsyncAPIClient._loop is None:
+                # 未安装 qasync 时在后台线程中运行一个事件循环
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='AsyncAPIClientLoop', daemon=True).start()
+                AsyncAPIClient._loop = loop
+            return AsyncAPIClient._loop
+
+    @staticmethod
+    def _deliver(task, callback, error_callback):
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is None and callback is not None:
+            try:
+                callback(task.result())
+                return
+            except Exception as e:
+                # 与 Worker 一致: 回调抛出的异常记录后交给 error_callback, 不传播到事件循环中
+                error = e
+        if error is None:
+            return
+        error_logger.error(f'AsyncAPIClient._deliver: {error}')
+        if error_callback is not None:
+            try:
+                error_callback(error)
+            except Exception as e:
+                error_logger.error(f'AsyncAPIClient._deliver: {e}')
@@ -0,0 +1,115 @@
+import time
+
+from backendRequests.asyncRequests import AsyncAPIClient
+from config import URL, BOOTSTRAP_TTL
+from utils.reference_data import ReferenceDataStore, CATEGORIES_URL, PROVIDERS_URL, PROJECTS_URL, EMPLOYEES_URL
+from utils.app_logger import get_logger
+
+error_logger = get_logger(logger_name='error_logger', log_file='error.log')
+app_logger = get_logger(logger_name='app_logger', log_file='app.log')
+
+# 登录后并发预取的请求: 名称 -> URL; URL 需与各界面首次加载时请求的 URL 一致
+BOOTSTRAP_REQUESTS = {
+    'inventory_count': URL + '/inventory/count',
+    'inventory_page': URL + '/inventory/page/1',
+    'orders_count': URL + '/orders/count',
+    'orders_page': URL + '/orders/page/1',
+    'categories': CATEGORIES_URL,
+    'providers': PROVIDERS_URL,
+    'projects': PROJECTS_URL,
+    'employees': EMPLOYEES_URL,
+    'users': URL + '/users/all',
+}
+
+
+class BootstrapPrefetch:
+    """
+    登录后的预取阶段
+    登录成功后同时请求库存与订单的首页数据和总量, 以及类别、供应商、项目、员工与用户列表;
+    预取在后台进行, 不阻塞主窗口的构建与显示; 结果按 URL 保存, 各界面构建时通过 take() 取出作为首次加载的数据,
+    结果尚未到达时界面自行请求(与仍在进行的预取请求 URL 相同, 会被 APIClient 合并为一次请求);
+    每个结果只使用一次, 超过 BOOTSTRAP_TTL 秒未被取用的结果视为过期; 参考数据同时写入 ReferenceDataStore
+    只能在 GUI 线程中调用
+    """
+    timings = {}  # 名称 -> 请求耗时(秒)
+    total = 0.0  # 整个预取阶段的耗时(秒)
+    _responses = {}  # URL -> (返回结果, 获取时间)
+    _running = False
+
+    @staticmethod
+    def start(callback=None) -> bool:
+        """
+        开始预取, 完成(包括失败)后在 GUI 线程中调用 callback(timings)
+        :return: 预取已在进行中时返回 False, 不会重复发起
+        """
+        if BootstrapPrefetch._running:
+            return False
+        BootstrapPrefetch._running = True
+        BootstrapPrefetch._responses.clear()
+        BootstrapPrefetch.timings = {}
+
+        def finished(result):
+            BootstrapPrefetch._running = False
+            if isinstance(result, dict):
+                BootstrapPrefetch._on_prefetched(result)
+            else:
+                error_logger.error(f'BootstrapPrefetch.start: {result}')
+            if callback is not None:
+                callback(BootstrapPrefetch.timings)
+
+        AsyncAPIClient.run(BootstrapPrefetch._prefetch_async(), callback=finished, error_callback=finished)
+        return True
+
+    @staticmethod
+    def take(url: str):
+        """取出预取到的返回结果, 没有预取、已被取用或已过期时返回 None"""
+        entry = BootstrapPrefetch._responses.pop(url, None)
+        if entry is None or time.monotonic() - entry[1] > BOOTSTRAP_TTL:
+            return None
+        return entry[0]
+
+    @staticmethod
+    def seed_source(source, page: int = 1):
+        """用预取到的首页数据与总量填充分页数据源, 界面首次加载时直接命中缓存"""
+        count_response = BootstrapPrefetch.take(source.count_url({}))
+        response = BootstrapPrefetch.take(source.page_url(page, {}))
+        if count_response is not None and response is not None:
+            source.seed(page, count_response, response)
+
+    @staticmethod
+    def report() -> str:
+        parts = [f'{name}={seconds * 1000:.0f}ms' for name, seconds in BootstrapPrefetch.timings.items()]
+        return f'total={BootstrapPrefetch.total * 1000:.0f}ms ' + ' '.join(parts)
+
+    @staticmethod
+    async def _prefetch_async() -> dict:
+        start = time.perf_counter()
+        names = list(BOOTSTRAP_REQUESTS)
+        responses = await AsyncAPIClient.gather(
+            *(BootstrapPrefetch._timed(name, BOOTSTRAP_REQUESTS[name]) for name in names),
+            return_exceptions=True
+        )
+        BootstrapPrefetch.total = time.perf_counter() - start
+        return dict(zip(names, responses))
+
+    @staticmethod
+    async def _timed(name: str, url: str):
+        start = time.perf_counter()
+        try:
+            return await AsyncAPIClient.get_request(url)
+        finally:
+            BootstrapPrefetch.timings[name] = time.perf_counter() - start
+
+    @staticmethod
+    def _on_prefetched(results: dict):
+        now = time.monotonic()
+        store = ReferenceDataStore.instance()
+        for name, response in results.items():
+            if isinstance(response, Exception) or not isinstance(response, dict):
+                # 请求失败的项由界面在首次加载时重新请求
+                error_logger.error(f'BootstrapPrefetch.{name}: {response}')
+                continue
+            BootstrapPrefetch._responses[BOOTSTRAP_REQUESTS[name]] = (response, now)
+            if name in store.COLLECTIONS:
+                store.seed(name, response)
+        app_logger.info(f'bootstrap prefetch: {BootstrapPrefetch.report()}')
@@ -0,0 +1,79 @@
+import threading
+from collections import OrderedDict
+
+
+class ConditionalCache:
+    """
+    HTTP 条件请求缓存
+    按 URL 保存响应的 ETag / Last-Modified 与解码后的响应体; 再次请求时携带 If-None-Match / If-Modified-Since,
+    后端返回 304 时直接复用缓存的响应体, 省去下载与 JSON 解析. 超过条目数或字节数上限时淘汰最久未使用的 URL,
+超过单条上限的响应体不缓存, 避免大列表的响应体常驻内存
+    缓存的响应体会被多个调用方共享, 调用方不应修改返回结果
+    """
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = None, max_body_bytes: int = None):
+        """
+        :param max_bytes: 全部响应体的字节数上限, None 表示不限制
+        :param max_body_bytes: 单个响应体的字节数上限, None 表示不限制
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_body_bytes = max_body_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (etag, last_modified, body, size)
+        self._total_bytes = 0
+
+    def validators(self, key) -> dict:
+        """返回需要附加到请求中的条件请求头"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return {}
+            self._entries.move_to_end(key)
+            etag, last_modified, _, _ = entry
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def body(self, key):
+        """返回缓存的响应体, 不存在时返回 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[2] if entry is not None else None
+
+    def store(self, key, headers, body, size: int = 0):
+        """
+        响应中带有 ETag 或 Last-Modified 且未超过单条上限时保存响应体, 否则丢弃该 URL 的旧缓存
+        :param size: 响应体的字节数, 用于计算内存占用
+        """
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        with self._lock:
+            self._pop(key)
+            if not etag and not last_modified:
+                return
+            if self.max_body_bytes is not None and size > self.max_body_bytes:
+                return
+            self._entries[key] = (etag, last_modified, body, size)
+            self._total_bytes += size
+            while len(self._entries) > self.max_entries or \
+                    (self.max_bytes is not None and self._total_bytes > self.max_bytes):
+                _, (_, _, _, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+    def discard(self, key):
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[3]
@@ -0,0 +1,105 @@
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import HTTP_POOL_SIZE, HTTP_IDLE_TIMEOUT
+
+try:
+    # 安装了 brotli 时 urllib3 可以自动解压 br 编码的响应
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+
+class SessionPool:
+    """
+    进程内共享的 requests.Session
+    所有请求复用同一个带连接池的 Session, 保持 keep-alive, 避免每次请求都重新建立 TCP 连接;
+    后台回收线程在连接空闲超过 idle_timeout 秒后关闭连接, 下次请求时重新创建
+    """
+    pool_size = HTTP_POOL_SIZE
+    idle_timeout = HTTP_IDLE_TIMEOUT
+
+    _session = None
+    _lock = threading.Lock()
+    _in_use = 0  # 正在使用 Session 的请求数量, 大于 0 时回收线程不会关闭连接
+    _last_used = 0.0
+    _reaper = None
+    _stop_event = threading.Event()
+
+    @staticmethod
+    def configure(pool_size: int = None, idle_timeout: int = None):
+        """修改连接池大小与空闲超时时间, 已有的 Session 会被关闭并在下次请求时按新配置重建"""
+        with SessionPool._lock:
+            if pool_size is not None:
+                SessionPool.pool_size = pool_size
+            if idle_timeout is not None:
+                SessionPool.idle_timeout = idle_timeout
+            if SessionPool._in_use == 0:
+                SessionPool._close_session()
+
+    @staticmethod
+    @contextmanager
+    def session():
+        """
+        获取共享 Session 的上下文管理器
+        :return: requests.Session
+        """
+        with SessionPool._lock:
+            if SessionPool._session is None:
+                SessionPool._session = SessionPool._create_session()
+            SessionPool._in_use += 1
+            SessionPool._ensure_reaper()
+            session = SessionPool._session
+        try:
+            yield session
+        finally:
+            with SessionPool._lock:
+                SessionPool._in_use -= 1
+                SessionPool._last_used = time.monotonic()
+
+    @staticmethod
+    def close():
+        """关闭连接池并停止回收线程, 在程序退出时调用"""
+        SessionPool._stop_event.set()
+        with SessionPool._lock:
+            SessionPool._close_session()
+
+    @staticmethod
+    def _create_session() -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=SessionPool.pool_size, pool_maxsize=SessionPool.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({"Connection": "keep-alive", "Accept-Encoding": ACCEPT_ENCODING})
+        return session
+
+    @staticmethod
+    def _close_session():
+        """调用方需持有 _lock"""
+        if SessionPool._session is not None:
+            SessionPool._session.close()
+            SessionPool._session = None
+
+    @staticmethod
+    def _ensure_reaper():
+        """调用方需持有 _lock"""
+        if SessionPool._reaper is not None and SessionPool._reaper.is_alive():
+            return
+        SessionPool._stop_event.clear()
+        SessionPool._reaper = threading.Thread(target=SessionPool._reap_idle_connections, name='SessionReaper',
+                                               daemon=True)
+        SessionPool._reaper.start()
+
+    @staticmethod
+    def _reap_idle_connections():
+        """回收线程: 定期检查, 空闲超时后关闭所有连接"""
+        while not SessionPool._stop_event.wait(max(SessionPool.idle_timeout / 4, 1)):
+            with SessionPool._lock:
+                idle = time.monotonic() - SessionPool._last_used
+                if SessionPool._session is not None and SessionPool._in_use == 0 and idle >= SessionPool.idle_timeout:
+                    SessionPool._close_session()
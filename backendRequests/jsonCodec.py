@@ -0,0 +1,48 @@
+import json
+
+try:
+    import orjson  # 解析大体积 JSON 的速度明显快于标准库, 未安装时使用标准库 json
+except ImportError:
+    orjson = None
+
+
+def _json_loads(data):
+    return json.loads(data)
+
+
+def _json_dumps(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def _orjson_dumps(obj) -> bytes:
+    return orjson.dumps(obj)
+
+
+_BACKENDS = {'json': (_json_loads, _json_dumps)}
+if orjson is not None:
+    _BACKENDS['orjson'] = (orjson.loads, _orjson_dumps)
+
+backend = 'orjson' if orjson is not None else 'json'
+_loads, _dumps = _BACKENDS[backend]
+
+
+def set_backend(name: str):
+    """
+    切换 JSON 编解码实现
+    :param name: 'orjson' 或 'json'
+    """
+    global backend, _loads, _dumps
+    if name not in _BACKENDS:
+        raise ValueError(f'JSON backend {name} is not available')
+    backend = name
+    _loads, _dumps = _BACKENDS[name]
+
+
+def loads(data):
+    """将响应体(bytes 或 str)解码为 Python 对象"""
+    return _loads(data)
+
+
+def dumps(obj) -> bytes:
+    """将 Python 对象编码为 UTF-8 JSON 字节串"""
+    return _dumps(obj)
@@ -1,10 +1,21 @@
 import json
+import gzip
 from utils.worker import Worker
+from backendRequests.httpSession import SessionPool
+from backendRequests.singleFlight import SingleFlight
+from backendRequests.conditionalCache import ConditionalCache
+from backendRequests import jsonCodec
+from config import SINGLE_FLIGHT_WINDOW, CONDITIONAL_CACHE_SIZE, CONDITIONAL_CACHE_MAX_BYTES, \
+    CONDITIONAL_CACHE_MAX_BODY_BYTES, GZIP_REQUEST_BODIES, GZIP_MIN_SIZE
 import requests
 
 
 class APIClient:
     jwt_token = None  # 用于保存 JWT Token
+    single_flight = SingleFlight(SINGLE_FLIGHT_WINDOW)  # 合并相同的 GET 请求
+    conditional_cache = ConditionalCache(CONDITIONAL_CACHE_SIZE, CONDITIONAL_CACHE_MAX_BYTES,
+                                         CONDITIONAL_CACHE_MAX_BODY_BYTES)  # ETag / Last-Modified 缓存
+    gzip_supported = True  # 后端拒绝 gzip 请求体(400/415)后置为 False
 
     @staticmethod
     def set_jwt_token(token: str):
@@ -19,37 +30,87 @@ class APIClient:
             headers["Authorization"] = f"Bearer {APIClient.jwt_token}"
         return headers
 
+    @staticmethod
+    def get_request(url: str, is_stream=False):
+        """相同用户对相同 URL 的并发或紧接着的 GET 请求共享同一个请求及其结果"""
+        key = (url, is_stream, APIClient.jwt_token)  # 切换用户后不复用上一个用户的结果
+        return APIClient.single_flight.do(key, lambda: APIClient._get_request(url, is_stream))
+
+    @staticmethod
+    def post_request(url: str, data: dict, compress=False):
+        """
+        数据变更前后都丢弃可复用的 GET 结果, 避免读到变更前的数据;
+        变更完成后的丢弃在请求任务中、Future 完成之前执行, 调用方收到结果后发起的 GET 一定会重新请求
+        :param compress: 是否以 gzip 压缩请求体, 用于批量导入等大体积请求
+        """
+        APIClient.single_flight.forget()
+        return APIClient._post_request(url, data, compress)
+
+    @staticmethod
+    def delete_request(url: str, id_list: list):
+        APIClient.single_flight.forget()
+        return APIClient._delete_request(url, id_list)
+
     @Worker.run_in_thread_with_result
-    def get_request(url: str, is_stream=False) -> json or str:
+    def _get_request(url: str, is_stream=False) -> json or str:
 
         try:
             headers = APIClient.get_headers()
-            response = requests.get(url, headers=headers, timeout=30, stream=is_stream)
-            response.raise_for_status()  # 如果返回状态码非 200-299，抛出 HTTPError
-            if is_stream:
-                return response.content
-            else:
-                return response.json()
-        except requests.exceptions.RequestException as e:
+            cache_key = (url, APIClient.jwt_token)  # 不同用户的缓存互不共享
+            if not is_stream:
+                headers.update(APIClient.conditional_cache.validators(cache_key))
+            with SessionPool.session() as session:
+                response = session.get(url, headers=headers, timeout=30, stream=is_stream)
+                if response.status_code == 304:
+                    # 数据未变化, 复用上次解码的响应体
+                    body = APIClient.conditional_cache.body(cache_key)
+                    if body is not None:
+                        return body
+                    # 缓存已被淘汰, 不带条件请求头重新获取
+                    response = session.get(url, headers=APIClient.get_headers(), timeout=30)
+                response.raise_for_status()  # 如果返回状态码非 200-299，抛出 HTTPError
+                if is_stream:
+                    return response.content
+                else:
+                    body = jsonCodec.loads(response.content)
+                    APIClient.conditional_cache.store(cache_key, response.headers, body, len(response.content))
+                    return body
+        except (requests.exceptions.RequestException, ValueError) as e:
             return f"Error occurred: {e}"
 
     @Worker.run_in_thread_with_result
-    def post_request(url: str, data: dict) -> json or str:
+    def _post_request(url: str, data: dict, compress=False) -> json or str:
         try:
             headers = APIClient.get_headers()
-            response = requests.post(url, headers=headers, json=data, timeout=30)
+            body = plain_body = jsonCodec.dumps(data)
+            gzipped = compress and GZIP_REQUEST_BODIES and APIClient.gzip_supported and len(body) >= GZIP_MIN_SIZE
+            if gzipped:
+                body = gzip.compress(body, compresslevel=6)
+                headers["Content-Encoding"] = "gzip"
+            with SessionPool.session() as session:
+                response = session.post(url, headers=headers, data=body, timeout=30)
+                if gzipped and response.status_code in (400, 415):
+                    # 后端不支持 gzip 压缩的请求体, 改为发送未压缩的请求体, 之后的请求也不再压缩
+                    APIClient.gzip_supported = False
+                    del headers["Content-Encoding"]
+                    response = session.post(url, headers=headers, data=plain_body, timeout=30)
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return jsonCodec.loads(response.content)
+        except (requests.exceptions.RequestException, ValueError) as e:
             return f"Error occurred: {e}"
+        finally:
+            APIClient.single_flight.forget()
 
     @Worker.run_in_thread_with_result
-    def delete_request(url: str, id_list: list) -> json or str:
+    def _delete_request(url: str, id_list: list) -> json or str:
         try:
             headers = APIClient.get_headers()
             data = {"ids": id_list}  # 构造 JSON 数据
-            response = requests.delete(url, headers=headers, json=data, timeout=30)
+            with SessionPool.session() as session:
+                response = session.delete(url, headers=headers, json=data, timeout=30)
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return jsonCodec.loads(response.content)
+        except (requests.exceptions.RequestException, ValueError) as e:
             return f"Error occurred: {e}"
+        finally:
+            APIClient.single_flight.forget()
@@ -0,0 +1,68 @@
+import sys
+import threading
+from collections import OrderedDict
+
+from utils.record_store import CompactRecord
+
+
+def estimate_size(obj) -> int:
+    """粗略估算 JSON 解码结果占用的内存字节数"""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += sys.getsizeof(key) + estimate_size(value)
+    elif isinstance(obj, CompactRecord):
+        for value in obj.values():
+            size += estimate_size(value)
+    elif isinstance(obj, list):
+        for item in obj:
+            size += estimate_size(item)
+    return size
+
+
+class PageCache:
+    """
+    分页数据的 LRU 缓存
+    按估算的内存占用限制容量, 超出 max_bytes 时淘汰最久未访问的页
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._pages = OrderedDict()  # key -> (response, size)
+        self._bytes = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._pages.get(key)
+            if entry is None:
+                return None
+            self._pages.move_to_end(key)
+            return entry[0]
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._pages
+
+    def put(self, key, response):
+        size = estimate_size(response)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._pages.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._pages[key] = (response, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._pages.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+            self._bytes = 0
+
+    @property
+    def size(self) -> int:
+        return self._bytes
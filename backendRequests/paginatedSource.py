@@ -0,0 +1,124 @@
+import math
+
+from backendRequests.asyncRequests import AsyncAPIClient
+from backendRequests.pageCache import PageCache
+from config import PAGE_CACHE_MAX_BYTES
+from utils.record_store import compacted_copy
+
+
+class PaginatedSource:
+    """
+    分页数据源
+    同时请求数据总量与当前页数据并合并结果, 翻页只需一次往返;
+    总量按过滤条件缓存, 在翻页之间复用, 数据发生变更(invalidate)或过滤条件变化时重新获取;
+    已获取的页保存在 LRU 缓存中, 并可在后台预取相邻页, 翻到已缓存的页时无需等待后端;
+    页数据在后台线程中转换为 CompactRecord, 缓存与表格模型共用同一份紧凑记录
+    """
+
+    def __init__(self, count_url, page_url, count_parser, per_page: int = 20):
+        """
+        :param count_url: 函数 (params) -> 总量接口 URL
+        :param page_url: 函数 (page, params) -> 分页接口 URL
+        :param count_parser: 函数 (response) -> 总量, 解析失败时返回 0
+        :param per_page: 每页条目数, 需与后端保持一致
+        """
+        self.count_url = count_url
+        self.page_url = page_url
+        self.count_parser = count_parser
+        self.per_page = per_page
+        self.cache = PageCache(PAGE_CACHE_MAX_BYTES)
+        self._count = None  # (过滤条件, 总量)
+        self._generation = 0  # 每次 invalidate 加一, 使 invalidate 之前发出的请求结果不再写入缓存
+
+    def invalidate(self):
+        """丢弃缓存的总量与分页数据, 在新增、修改、删除数据后调用"""
+        self._generation += 1
+        self._count = None
+        self.cache.clear()
+
+    def seed(self, page: int, count_response, response, params: dict = None):
+        """用已获取到的总量与页数据填充缓存, 例如登录后的预取结果; 请求失败的结果不写入"""
+        if not isinstance(count_response, dict):
+            return
+        self._count = (self._params_key(params), self.count_parser(count_response))
+        response = self._compact(response)
+        self._store_page(self._generation, self._params_key(params), page, response)
+
+    def cached_count(self, params: dict = None):
+        """返回当前过滤条件下缓存的总量, 没有缓存时返回 None"""
+        key = self._params_key(params)
+        cached = self._count
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        return None
+
+    def total_pages(self, count: int) -> int:
+        return math.ceil(count / self.per_page) if count else 1
+
+    def fetch(self, page: int, params: dict = None, callback=None, error_callback=None):
+        """
+        获取一页数据, 完成后在 GUI 线程中以 dict 调用 callback:
+        {'page': 页码, 'count': 总量, 'total_pages': 总页数, 'response': 分页接口的返回结果}
+        """
+        return AsyncAPIClient.run(self.fetch_async(page, params), callback=callback, error_callback=error_callback)
+
+    async def fetch_async(self, page: int, params: dict = None) -> dict:
+        key = self._params_key(params)
+        generation = self._generation
+        count = self.cached_count(params)
+        response = self.cache.get((key, page))
+        if response is not None and count is not None:
+            # 命中缓存, 无需请求后端
+            pass
+        elif count is None:
+            # 总量与页数据并发请求
+            count_request = AsyncAPIClient.get_request(self.count_url(params))
+            if response is None:
+                count_response, response = await AsyncAPIClient.gather(
+                    count_request,
+                    AsyncAPIClient.get_request(self.page_url(page, params)),
+                )
+            else:
+                count_response = await count_request
+            count = self.count_parser(count_response)
+            if isinstance(count_response, dict) and generation == self._generation:
+                # 请求失败时不缓存总量
+                self._count = (key, count)
+        else:
+            response = await AsyncAPIClient.get_request(self.page_url(page, params))
+        response = self._compact(response)
+        self._store_page(generation, key, page, response)
+        return {'page': page, 'count': count, 'total_pages': self.total_pages(count), 'response': response}
+
+    def prefetch_adjacent(self, page: int, total_pages: int, params: dict = None):
+        """在后台预取当前页的前一页与后一页"""
+        key = self._params_key(params)
+        for adjacent in (page + 1, page - 1):
+            if 1 <= adjacent <= total_pages and (key, adjacent) not in self.cache:
+                AsyncAPIClient.run(self._prefetch(adjacent, params))
+
+    async def _prefetch(self, page: int, params: dict = None):
+        generation = self._generation
+        response = await AsyncAPIClient.get_request(self.page_url(page, params))
+        response = self._compact(response)
+        self._store_page(generation, self._params_key(params), page, response)
+
+    def _store_page(self, generation: int, key, page: int, response):
+        """只缓存成功的结果, 且 invalidate 之后返回的旧请求结果不写入缓存"""
+        if generation == self._generation and isinstance(response, dict) and response.get('success') is True:
+            self.cache.put((key, page), response)
+
+    @staticmethod
+    def _compact(response):
+        """
+        返回页数据转换为 CompactRecord 后的副本, 写入页缓存的是该副本;
+        原返回结果可能同时被条件请求缓存与合并的请求共享, 不做修改. 已转换过的(命中页缓存)原样返回
+        """
+        if isinstance(response, dict) and isinstance(response.get('data'), list) \
+                and any(isinstance(record, dict) for record in response['data']):
+            return dict(response, data=compacted_copy(response['data']))
+        return response
+
+    @staticmethod
+    def _params_key(params: dict = None):
+        return tuple(sorted((params or {}).items()))
@@ -0,0 +1,61 @@
+import threading
+import time
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    合并相同的请求
+    key 相同的并发请求共享同一个 Future; 请求成功完成后的 reuse_window 秒内, 紧接着发起的相同请求也直接复用该结果
+    """
+
+    def __init__(self, reuse_window: float = 0.0):
+        self.reuse_window = reuse_window
+        self._lock = threading.Lock()
+        self._futures = {}  # key -> (future, 完成时间, 未完成时为 None)
+
+    def do(self, key, func) -> Future:
+        """
+        :param key: 请求的唯一标识, 如 URL
+        :param func: 发起请求并返回 Future 的函数, 仅在没有可复用的请求时调用
+        :return: 共享的 Future
+        """
+        with self._lock:
+            self._purge_expired()
+            entry = self._futures.get(key)
+            if entry is not None:
+                return entry[0]
+            future = func()
+            self._futures[key] = (future, None)
+        future.add_done_callback(lambda f: self._on_done(key, f))
+        return future
+
+    def forget(self):
+        """丢弃所有可复用的请求, 在数据发生变更(POST/DELETE)时调用, 之后的请求会重新发往后端"""
+        with self._lock:
+            self._futures.clear()
+
+    def _on_done(self, key, future: Future):
+        with self._lock:
+            entry = self._futures.get(key)
+            if entry is None or entry[0] is not future:
+                return
+            if self.reuse_window > 0 and self._succeeded(future):
+                self._futures[key] = (future, time.monotonic())
+            else:
+                del self._futures[key]
+
+    def _purge_expired(self):
+        """调用方需持有 _lock"""
+        now = time.monotonic()
+        expired = [key for key, (_, done_at) in self._futures.items()
+                   if done_at is not None and now - done_at > self.reuse_window]
+        for key in expired:
+            del self._futures[key]
+
+    @staticmethod
+    def _succeeded(future: Future) -> bool:
+        """请求失败(抛出异常或返回错误信息字符串)时不复用结果"""
+        if future.cancelled() or future.exception() is not None:
+            return False
+        return not isinstance(future.result(), str)
@@ -0,0 +1,390 @@
+"""
+端到端基准测试
+启动模拟后端(benchmarks.mock_backend), 在 offscreen 平台下驱动 OrdersInterface、InventoryInterface、HistoryInterface
+完成翻页、搜索与 Excel 导出/导入, 每个场景在独立的子进程中运行并报告:
+    墙钟耗时、GUI 线程被阻塞的总时长与最长一次阻塞、请求数(以及其中返回 304 的次数)、进程峰值 RSS
+GUI 线程阻塞时间由每 5 毫秒触发一次的定时器测量: 两次触发的间隔超过一帧(16 毫秒)时, 超出定时器间隔的部分计为阻塞
+保存结果后, 可在发布新版本前与基线对比, 任一指标超出容差时以非零状态码退出
+
+用法: python -m benchmarks.bench_e2e [--scenarios orders_pages inventory_export ...] [--orders 2000] [--inventories 2000]
+                                    [--latency 50] [--pages 5] [--save result.json] [--compare baseline.json]
+                                    [--tolerance 0.2]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+MONITOR_INTERVAL_MS = 5
+STALL_THRESHOLD_MS = 16
+
+
+def peak_rss() -> int:
+    """当前进程的峰值常驻内存(字节)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss)
+
+
+class StallMonitor:
+    """用 GUI 线程中的定时器测量事件循环被阻塞的时间"""
+
+    def __init__(self):
+        from PyQt6.QtCore import QTimer
+        self.blocked = 0.0
+        self.max_stall = 0.0
+        self._last = None
+        self._timer = QTimer()
+        self._timer.setInterval(MONITOR_INTERVAL_MS)
+        self._timer.timeout.connect(self._tick)
+
+    def start(self):
+        self.blocked = 0.0
+        self.max_stall = 0.0
+        self._last = time.perf_counter()
+        self._timer.start()
+
+    def stop(self):
+        self._tick()
+        self._timer.stop()
+
+    def _tick(self):
+        now = time.perf_counter()
+        gap = (now - self._last) * 1000
+        self._last = now
+        if gap > STALL_THRESHOLD_MS:
+            self.blocked += gap - MONITOR_INTERVAL_MS
+            self.max_stall = max(self.max_stall, gap)
+
+
+class Context:
+    """场景运行环境: QApplication、模拟后端与临时目录"""
+
+    def __init__(self, app, backend, tmpdir: str, pages: int):
+        self.app = app
+        self.backend = backend
+        self.tmpdir = tmpdir
+        self.pages = pages
+
+    def wait(self, predicate, timeout: float = 60):
+        """处理事件直到条件满足"""
+        deadline = time.perf_counter() + timeout
+        while not predicate():
+            if time.perf_counter() > deadline:
+                raise TimeoutError('等待界面完成加载超时')
+            self.app.processEvents()
+            time.sleep(0.001)
+        self.app.processEvents()
+
+    def settle(self, interface):
+        """等待分页界面的请求返回且分批填充完成"""
+        self.wait(lambda: interface.execBtn.isEnabled() and not interface.populator.active)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.tmpdir, name)
+
+
+def use_file(save_path: str = None, open_path: str = None):
+    """让文件对话框直接返回指定路径"""
+    from PyQt6.QtWidgets import QFileDialog
+    if save_path is not None:
+        QFileDialog.getSaveFileName = staticmethod(lambda *args, **kwargs: (save_path, 'Excel Files (*.xlsx)'))
+    if open_path is not None:
+        QFileDialog.getOpenFileName = staticmethod(lambda *args, **kwargs: (open_path, 'Excel Files (*.xlsx)'))
+
+
+def write_workbook(path: str, headers: list, rows):
+    import openpyxl
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(headers)
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+
+
+# 场景: 函数 (ctx) -> run; 函数本身完成准备工作(不计时), 返回的 run 为被测量的操作
+
+def orders_pages(ctx):
+    from orders.ordersInterface import OrdersInterface
+
+    def run():
+        interface = OrdersInterface()
+        ctx.settle(interface)
+        for _ in range(ctx.pages):
+            interface.load_next_page()
+            ctx.settle(interface)
+    return run
+
+
+def orders_search(ctx):
+    from orders.ordersInterface import OrdersInterface
+    interface = OrdersInterface()
+    ctx.settle(interface)
+
+    def run():
+        interface.typeComboBox.setCurrentIndex(1)  # 出库
+        interface.search_orders_by_conditions()
+        ctx.settle(interface)
+    return run
+
+
+def orders_export(ctx):
+    from orders.ordersInterface import OrdersInterface
+    interface = OrdersInterface()
+    ctx.settle(interface)
+    use_file(save_path=ctx.path('orders.xlsx'))
+
+    def run():
+        interface.export_to_excel()
+        ctx.settle(interface)  # 导出数据在后台获取, 返回并写入文件后按钮才恢复可用
+    return run
+
+
+def orders_import(ctx):
+    from orders.ordersInterface import OrdersInterface
+    headers = ['单号', '类型', '货品id', '货品名称', '型号', '类别', '供应商', '项目', '状态',
+               '经办人', '提交日期', '审核日期', '单价', '数量']
+    keys = ['order_id', 'order_type', 'cargo_id', 'cargo_name', 'model', 'categories', 'provider', 'project',
+            'status', 'employee_name', 'published_at', 'processed_at', 'price', 'count']
+    write_workbook(ctx.path('orders_import.xlsx'), headers,
+                   ([order[key] for key in keys] for order in ctx.backend.orders))
+    interface = OrdersInterface()
+    ctx.settle(interface)
+    use_file(open_path=ctx.path('orders_import.xlsx'))
+
+    def run():
+        interface.import_from_excel()
+        ctx.settle(interface)
+    return run
+
+
+def inventory_pages(ctx):
+    from inventory.inventoryInterface import InventoryInterface
+
+    def run():
+        interface = InventoryInterface()
+        ctx.settle(interface)
+        for _ in range(ctx.pages):
+            interface.load_next_page()
+            ctx.settle(interface)
+    return run
+
+
+def inventory_search(ctx):
+    from inventory.inventoryInterface import InventoryInterface
+    interface = InventoryInterface()
+    ctx.settle(interface)
+
+    def run():
+        interface.cargo_name_input.setText('货品1')
+        interface.search_inventories()
+        ctx.settle(interface)
+    return run
+
+
+def inventory_export(ctx):
+    import inventory.inventoryInterface as module
+
+    class ConfirmBox:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def exec(self):
+            return True
+
+    module.MessageBox = ConfirmBox  # 跳过导出前的确认对话框
+    interface = module.InventoryInterface()
+    ctx.settle(interface)
+    use_file(save_path=ctx.path('inventory.xlsx'))
+
+    def run():
+        interface.export_to_excel()
+        ctx.settle(interface)
+    return run
+
+
+def inventory_import(ctx):
+    from inventory.inventoryInterface import InventoryInterface
+    headers = ["货品编号", "货品名称", "型号", "类别", "数量", "单价", "规格", "总价"]
+    keys = ['cargo_id', 'cargo_name', 'model', 'categories', 'count', 'price', 'specification', 'total_price']
+    write_workbook(ctx.path('inventory_import.xlsx'), headers,
+                   ([inventory[key] for key in keys] for inventory in ctx.backend.inventories))
+    interface = InventoryInterface()
+    ctx.settle(interface)
+    use_file(open_path=ctx.path('inventory_import.xlsx'))
+
+    def run():
+        interface.import_from_excel()
+        ctx.settle(interface)
+    return run
+
+
+def history_search(ctx):
+    from history.historyInterface import HistoryInterface
+    interface = HistoryInterface()
+
+    def run():
+        interface.year_input.setText('2024')
+        interface.month_input.setText('5')
+        interface.search_data_by_date()
+        ctx.app.processEvents()
+    return run
+
+
+def history_export(ctx):
+    from history.historyInterface import HistoryInterface
+    interface = HistoryInterface()
+    interface.year_input.setText('2024')
+    interface.month_input.setText('5')
+    interface.search_data_by_date()
+    use_file(save_path=ctx.path('history.xlsx'))
+    return interface.export_to_excel
+
+
+def history_import(ctx):
+    from benchmarks.mock_backend import make_history
+    from history.historyInterface import HistoryInterface
+    headers = ['id', '年', '月', '货品名', '型号', '规格', '分类', '期初单价', '期初数量', '期初总价', '期末单价',
+               '期末数量', '期末总价']
+    keys = ['id', 'year', 'month', 'cargo_name', 'model', 'specification', 'categories', 'starting_price',
+            'starting_count', 'starting_total_price', 'closing_price', 'closing_count', 'closing_total_price']
+    write_workbook(ctx.path('history_import.xlsx'), headers,
+                   ([record[key] for key in keys] for record in make_history(ctx.backend.inventories, 2024, 5)))
+    interface = HistoryInterface()
+    use_file(open_path=ctx.path('history_import.xlsx'))
+    return interface.import_from_excel
+
+
+SCENARIOS = {
+    'orders_pages': orders_pages,
+    'orders_search': orders_search,
+    'orders_export': orders_export,
+    'orders_import': orders_import,
+    'inventory_pages': inventory_pages,
+    'inventory_search': inventory_search,
+    'inventory_export': inventory_export,
+    'inventory_import': inventory_import,
+    'history_search': history_search,
+    'history_export': history_export,
+    'history_import': history_import,
+}
+
+# 对比基线时检查的指标
+METRICS = ['seconds', 'blocked', 'requests', 'peak_rss']
+
+
+def run_scenario(name: str, args) -> dict:
+    """在当前进程中运行单个场景并返回结果"""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from benchmarks.mock_backend import MockBackend, make_token
+    import config
+
+    backend = MockBackend(orders=args.orders, inventories=args.inventories, latency_ms=args.latency).start()
+    config.URL = backend.url  # 界面模块在导入时读取 URL, 必须在导入之前替换
+
+    from PyQt6.QtWidgets import QApplication
+    from backendRequests.jsonRequests import APIClient
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    APIClient.jwt_token = make_token()
+    monitor = StallMonitor()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        ctx = Context(app, backend, tmpdir, args.pages)
+        run = SCENARIOS[name](ctx)
+        app.processEvents()
+        before = backend.stats()
+        monitor.start()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        monitor.stop()
+        after = backend.stats()
+
+    backend.stop()
+    return {
+        'scenario': name,
+        'seconds': elapsed,
+        'blocked': monitor.blocked / 1000,
+        'max_stall': monitor.max_stall / 1000,
+        'requests': after['requests'] - before['requests'],
+        'not_modified': after['not_modified'] - before['not_modified'],
+        'imported': sum(after['imported'].values()) - sum(before['imported'].values()),
+        'peak_rss': peak_rss(),
+    }
+
+
+def compare(results: list, baseline_path: str, tolerance: float) -> list:
+    """返回超出基线容差的 (场景, 指标, 基线值, 当前值)"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {result['scenario']: result for result in json.load(f)}
+    regressions = []
+    for result in results:
+        base = baseline.get(result['scenario'])
+        if base is None:
+            continue
+        for metric in METRICS:
+            # 阻塞时间很短时相对变化意义不大, 至少增加 50 毫秒才视为退化
+            slack = 0.05 if metric == 'blocked' else 0
+            if result[metric] > base[metric] * (1 + tolerance) + slack:
+                regressions.append((result['scenario'], metric, base[metric], result[metric]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--orders', type=int, default=2000, help='模拟后端中的订单条数')
+    parser.add_argument('--inventories', type=int, default=2000, help='模拟后端中的库存条数, 也是历史记录的条数')
+    parser.add_argument('--latency', type=float, default=50, help='模拟后端每个请求的延迟(毫秒)')
+    parser.add_argument('--pages', type=int, default=5, help='翻页场景中连续翻页的次数')
+    parser.add_argument('--save', help='将结果保存为 JSON, 可作为之后对比的基线')
+    parser.add_argument('--compare', help='与之前保存的基线对比')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='对比基线时允许的相对增长')
+    parser.add_argument('--scenario', choices=list(SCENARIOS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        # 子进程: 运行单个场景, 以 JSON 输出结果
+        print(json.dumps(run_scenario(args.scenario, args)))
+        return
+
+    print(f'订单 {args.orders} 条, 库存 {args.inventories} 条, 模拟后端延迟 {args.latency:.0f} ms')
+    print(f'{"场景":<20}{"耗时(ms)":>12}{"阻塞(ms)":>12}{"最长阻塞(ms)":>14}{"请求数":>8}{"304":>6}'
+          f'{"导入条数":>10}{"峰值RSS(MiB)":>14}')
+    results = []
+    for name in args.scenarios:
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_e2e', '--scenario', name, '--orders', str(args.orders),
+             '--inventories', str(args.inventories), '--latency', str(args.latency), '--pages', str(args.pages)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        results.append(result)
+        print(f'{name:<20}{result["seconds"] * 1000:>12.1f}{result["blocked"] * 1000:>12.1f}'
+              f'{result["max_stall"] * 1000:>14.1f}{result["requests"]:>8}{result["not_modified"]:>6}'
+              f'{result["imported"]:>10}{result["peak_rss"] / 1024 / 1024:>14.1f}')
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for scenario, metric, base, current in regressions:
+            print(f'退化: {scenario}.{metric} {base:.4g} -> {current:.4g}')
+        if regressions:
+            sys.exit(1)
+        print('与基线相比没有超出容差的退化')
+
+
+if __name__ == '__main__':
+    main()
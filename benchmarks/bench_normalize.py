@@ -0,0 +1,102 @@
+"""
+订单数据格式化基准测试
+对比旧实现(逐行 reconstruct_data 重建 dict, 每个日期都执行 strptime + strftime)与
+normalize_records(按列批量格式化, 日期结果按原始字符串 LRU 缓存, 标签映射预先计算)
+按页(默认 20 行)统计每页的平均转换耗时; "冷缓存"在每轮开始前清空日期缓存
+
+用法: python -m benchmarks.bench_normalize [--rows 10000] [--per-page 20] [--repeat 5]
+"""
+import argparse
+from datetime import datetime
+
+from benchmarks.bench_transport import make_orders, timed
+from orders.ordersTableModel import ORDER_COLUMNS
+from utils.functional_utils import convert_date_to_chinese
+from utils.normalize import normalize_records
+
+
+def legacy_convert_date(date_str):
+    """旧版 convert_date_to_chinese 的实现"""
+    date_obj = datetime.strptime(date_str, "%a, %d %b %Y %H:%M:%S %Z")
+    month_map = {
+        "Jan": "1", "Feb": "2", "Mar": "3", "Apr": "4",
+        "May": "5", "Jun": "6", "Jul": "7", "Aug": "8",
+        "Sep": "9", "Oct": "10", "Nov": "11", "Dec": "12"
+    }
+    date_obj.strftime("%a")
+    month_chinese = month_map[date_obj.strftime("%b")]
+    return f"{date_obj.year}-{month_chinese}-{date_obj.day} "
+
+
+def legacy_reconstruct_data(data):
+    """旧版 OrdersInterface.reconstruct_data 的实现"""
+    order_type_mapping = {
+        "inbound": "入库",
+        "outbound": "出库"
+    }
+    status_mapping = {
+        "pass": "已完成",
+        "waiting": "待处理",
+        "reject": "已取消"
+    }
+    return {
+        "order_id": data['order_id'],
+        "order_type": order_type_mapping[data['order_type']],
+        "cargo_id": data['cargo_id'],
+        "cargo_name": data['cargo_name'],
+        "model": data['model'],
+        "categories": data['categories'],
+        "price": data['price'],
+        "provider": data['provider'],
+        "project": data['project'],
+        "status": status_mapping[data['status']],
+        "employee_name": data['employee_name'],
+        "published_at": legacy_convert_date(data['published_at']),
+        "processed_at": legacy_convert_date(data['processed_at']),
+        "count": data['count'],
+        "specification": data['specification'],
+        "total_price": data['total_price']
+    }
+
+
+def legacy_transform(pages: list):
+    keys = [spec.key for spec in ORDER_COLUMNS]
+    for page in pages:
+        for order in page:
+            data = legacy_reconstruct_data(order)
+            # 旧版 setup_table_row 对每个单元格执行 str()
+            [str(data[key]) for key in keys]
+
+
+def normalized_transform(pages: list):
+    for page in pages:
+        normalize_records(page, ORDER_COLUMNS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--per-page', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    orders = make_orders(args.rows)
+    pages = [orders[i:i + args.per_page] for i in range(0, len(orders), args.per_page)]
+
+    def cold():
+        convert_date_to_chinese.cache_clear()
+        normalized_transform(pages)
+
+    results = [
+        ('reconstruct_data', timed(lambda: legacy_transform(pages), args.repeat)),
+        ('normalize(冷缓存)', timed(cold, args.repeat)),
+        ('normalize(热缓存)', timed(lambda: normalized_transform(pages), args.repeat)),
+    ]
+    print(f'{args.rows} 行, 每页 {args.per_page} 行, 共 {len(pages)} 页')
+    print(f'{"实现":<20}{"总耗时(ms)":>14}{"每页(µs)":>14}')
+    for name, seconds in results:
+        print(f'{name:<20}{seconds * 1000:>14.2f}{seconds / len(pages) * 1e6:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
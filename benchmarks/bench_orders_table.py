@@ -0,0 +1,108 @@
+"""
+订单表格渲染基准测试
+对比旧实现(TableWidget + 每行 CheckBox 控件 + 逐格 QTableWidgetItem)与 OrdersTableModel + TableView
+在不同数据量下的渲染耗时与内存占用(RSS 增量); 每个场景在独立的子进程中运行, 互不影响内存统计
+
+用法: python -m benchmarks.bench_orders_table [--rows 1000 10000 100000] [--legacy-max 10000]
+无显示环境下会自动使用 offscreen 平台
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+def current_rss() -> int:
+    """当前进程的常驻内存(字节)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def populate_legacy(table, orders: list):
+    """旧版 OrdersInterface.populate_table 的实现"""
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtWidgets import QTableWidgetItem
+    from qfluentwidgets import CheckBox
+    from orders.ordersTableModel import ORDER_COLUMNS
+
+    table.setRowCount(len(orders))
+    for row, order in enumerate(orders):
+        table.setCellWidget(row, 0, CheckBox())
+        for col, spec in enumerate(ORDER_COLUMNS):
+            item = QTableWidgetItem(spec.formatter(order.get(spec.key, '')))
+            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
+            table.setItem(row, col + 1, item)
+
+
+def run_scenario(implementation: str, rows: int) -> dict:
+    """在当前进程中运行单个场景并返回结果"""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication, QHeaderView
+    from qfluentwidgets import TableWidget, TableView
+    from benchmarks.bench_transport import make_orders
+    from orders.ordersTableModel import OrdersTableModel, ORDER_COLUMNS
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    orders = make_orders(rows)
+    if implementation == 'legacy':
+        table = TableWidget()
+        table.setColumnCount(len(ORDER_COLUMNS) + 1)
+        table.setHorizontalHeaderLabels([''] + [spec.header for spec in ORDER_COLUMNS])
+    else:
+        table = TableView()
+        table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        model = OrdersTableModel(parent=table)
+        table.setModel(model)
+    table.resize(1280, 760)
+    table.show()
+    app.processEvents()
+
+    rss_before = current_rss()
+    start = time.perf_counter()
+    if implementation == 'legacy':
+        populate_legacy(table, orders)
+    else:
+        model.set_records(orders)
+    app.processEvents()  # 包含首次绘制
+    elapsed = time.perf_counter() - start
+    rss_after = current_rss()
+    return {'implementation': implementation, 'rows': rows, 'seconds': elapsed, 'rss_delta': rss_after - rss_before}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--legacy-max', type=int, default=10000, help='旧实现只测试不超过该行数的场景, 避免耗时过长')
+    parser.add_argument('--scenario', choices=['legacy', 'model'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        # 子进程: 运行单个场景, 以 JSON 输出结果
+        print(json.dumps(run_scenario(args.scenario, args.rows[0])))
+        return
+
+    print(f'{"实现":<8}{"行数":>10}{"渲染耗时(ms)":>16}{"RSS 增量(MiB)":>16}')
+    for rows in args.rows:
+        for implementation in ('legacy', 'model'):
+            if implementation == 'legacy' and rows > args.legacy_max:
+                print(f'{implementation:<8}{rows:>10}{"跳过":>16}{"-":>16}')
+                continue
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_orders_table', '--scenario', implementation,
+                 '--rows', str(rows)],
+                capture_output=True, text=True, check=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f'{implementation:<8}{rows:>10}{result["seconds"] * 1000:>16.1f}'
+                  f'{result["rss_delta"] / 1024 / 1024:>16.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+订单记录内存占用基准测试
+按应用实际的处理方式, 对比后端返回的 dict 列表与 compacted_copy 转换后的 CompactRecord 列表(字段保存在 __slots__ 中,
+类别、供应商、项目、经办人等重复字符串驻留为同一份)保存 N 条订单时的内存占用与峰值(tracemalloc):
+- dict: 直接使用解码后的响应体
+- CompactRecord: 转换到新列表, 响应体随后释放(未被条件请求缓存持有时, 如超过缓存大小上限的响应)
+- CompactRecord+缓存: 转换到新列表, 响应体同时被条件请求缓存持有
+
+用法: python -m benchmarks.bench_record_store [--rows 100000]
+"""
+import argparse
+import json
+import tracemalloc
+
+from benchmarks.bench_transport import make_orders
+from utils.record_store import compacted_copy
+
+
+def measure(payload: str, compact: bool, keep_response: bool) -> tuple:
+    """返回 (保存记录的内存, 峰值内存), 单位字节"""
+    tracemalloc.start()
+    response = json.loads(payload)
+    records = compacted_copy(response['data']) if compact else response['data']
+    if not keep_response:
+        del response
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    # 经过 JSON 编解码, 与实际从 /orders/all 获取的数据一样每个字符串都是独立的对象
+    payload = json.dumps({'success': True, 'data': make_orders(args.rows)}, ensure_ascii=False)
+    print(f'{"实现":<20}{"行数":>10}{"保存(MiB)":>14}{"峰值(MiB)":>14}')
+    for name, compact, keep_response in (('dict', False, False), ('CompactRecord', True, False),
+                                         ('CompactRecord+缓存', True, True)):
+        current, peak = measure(payload, compact, keep_response)
+        print(f'{name:<20}{args.rows:>10}{current / 1024 / 1024:>14.1f}{peak / 1024 / 1024:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+主窗口启动基准测试
+对比登录后一次性构建全部子界面(旧实现)、延迟构建子界面(LazyInterface)以及在后台并发预取首屏数据的同时延迟构建(bootstrap)时,
+从登录成功到窗口完成首次绘制、当前界面显示出首页数据所需的时间, 以及这段时间内发出的请求数量;
+bootstrap 场景另外输出预取阶段每个请求与整体的耗时; 后端使用带固定延迟的模拟后端,
+每个场景在独立的子进程中运行, 避免模块导入缓存影响结果
+
+用法: python -m benchmarks.bench_startup [--latency 50] [--rows 2000] [--repeat 3]
+无显示环境下会自动使用 offscreen 平台
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+def run_scenario(implementation: str, latency: float, rows: int) -> dict:
+    """在当前进程中运行单个场景并返回结果"""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from benchmarks.mock_backend import MockBackend, make_token
+    import config
+
+    backend = MockBackend(orders=rows, inventories=rows, latency_ms=latency).start()
+    config.URL = backend.url  # 界面模块在导入时读取 URL, 必须在导入之前替换
+
+    from PyQt6.QtWidgets import QApplication
+    from backendRequests.jsonRequests import APIClient
+    from backendRequests.bootstrap import BootstrapPrefetch
+    from windows.management import MainWindow
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    APIClient.jwt_token = make_token()
+
+    start = time.perf_counter()
+    done = []
+    if implementation == 'bootstrap':
+        # 与 MainApp.show_main_window 一致: 启动预取后立即构建主窗口, 不等待预取完成
+        BootstrapPrefetch.start(callback=done.append)
+    window = MainWindow()
+    if implementation == 'eager':
+        # 旧实现: 显示主窗口前在构造函数中依次构建全部子界面
+        window.warmup_queue.clear()
+        stack = window.stackedWidget
+        for i in range(stack.count()):
+            stack.widget(i).ensure_built()
+    window.show()
+    app.processEvents()  # 首次绘制, 以及构建当前界面的定时器
+    current = window.stackedWidget.currentWidget()
+    deadline = time.perf_counter() + 30
+    # 等待当前界面构建完成且首页数据已显示
+    while (not current.built or not current.interface.inventories) and time.perf_counter() < deadline:
+        app.processEvents()
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+    requests = backend.request_count
+    if implementation == 'bootstrap':
+        # 预取阶段的耗时在计时结束后再等待其完成后读取
+        while not done and time.perf_counter() < deadline:
+            app.processEvents()
+
+    APIClient.jwt_token = None  # 跳过 closeEvent 中的注销请求
+    backend.stop()
+    return {'implementation': implementation, 'seconds': elapsed, 'requests': requests,
+            'bootstrap': BootstrapPrefetch.report() if implementation == 'bootstrap' else ''}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=50, help='模拟后端每个请求的延迟(毫秒)')
+    parser.add_argument('--rows', type=int, default=2000, help='模拟后端中订单与库存的条数')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--scenario', choices=['eager', 'lazy', 'bootstrap'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        # 子进程: 运行单个场景, 以 JSON 输出结果
+        print(json.dumps(run_scenario(args.scenario, args.latency, args.rows)))
+        return
+
+    print(f'模拟后端延迟 {args.latency:.0f} ms, 数据 {args.rows} 条')
+    print(f'{"实现":<10}{"首次可交互(ms)":>18}{"请求数":>10}')
+    for implementation in ('eager', 'lazy', 'bootstrap'):
+        results = []
+        for _ in range(args.repeat):
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_startup', '--scenario', implementation,
+                 '--latency', str(args.latency), '--rows', str(args.rows)],
+                capture_output=True, text=True, check=True
+            ).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+        best = min(results, key=lambda result: result['seconds'])
+        print(f'{implementation:<10}{best["seconds"] * 1000:>18.1f}{best["requests"]:>10}')
+        if best['bootstrap']:
+            print(f'  预取耗时: {best["bootstrap"]}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+传输压缩与 JSON 解码基准测试
+模拟 /orders/all 返回 50k 条订单的响应体, 对比不同压缩方式的传输字节数与不同 JSON 实现的解码耗时
+
+用法: python -m benchmarks.bench_transport [--rows 50000] [--repeat 5]
+"""
+import argparse
+import gzip
+import json
+import random
+import time
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CATEGORIES = ['电气元件', '气动元件', '机械加工件', '标准件', '传感器', '线缆', '工具', '耗材']
+PROVIDERS = ['沈阳华威机电', '上海星辰自动化', '大连精工', '北京恒通', 'null']
+PROJECTS = ['一号线改造', '二期扩建', '焊装车间', '总装车间', 'null']
+EMPLOYEES = ['张伟', '王芳', '李娜', '刘洋', '陈杰', '杨磊']
+
+
+def make_orders(rows: int, seed: int = 213) -> list:
+    """生成与后端 /orders/all 返回格式一致的订单数据"""
+    rng = random.Random(seed)
+    orders = []
+    for i in range(rows):
+        count = rng.randint(1, 500)
+        price = round(rng.uniform(0.5, 3000), 2)
+        day = rng.randint(1, 28)
+        orders.append({
+            'order_id': f'ORD{20240000 + i}',
+            'order_type': rng.choice(['inbound', 'outbound']),
+            'cargo_id': f'C{rng.randint(1, 5000):06d}',
+            'cargo_name': f'货品{rng.randint(1, 5000)}',
+            'model': f'M-{rng.randint(100, 999)}-{rng.choice("ABCDEF")}',
+            'categories': rng.choice(CATEGORIES),
+            'provider': rng.choice(PROVIDERS),
+            'project': rng.choice(PROJECTS),
+            'status': rng.choice(['pass', 'waiting', 'reject']),
+            'employee_name': rng.choice(EMPLOYEES),
+            'published_at': f'Tue, {day:02d} Nov 2024 00:00:00 GMT',
+            'processed_at': f'Wed, {day:02d} Nov 2024 00:00:00 GMT',
+            'price': str(price),
+            'count': count,
+            'specification': rng.choice(['个', '套', '米', '箱']),
+            'total_price': str(round(price * count, 2)),
+        })
+    return orders
+
+
+def timed(func, repeat: int) -> float:
+    """返回多次执行中的最短耗时(秒)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    payload = json.dumps({'success': True, 'data': make_orders(args.rows)}, ensure_ascii=False).encode('utf-8')
+    raw_size = len(payload)
+
+    print(f'订单数: {args.rows}, 原始响应体: {raw_size / 1024 / 1024:.2f} MiB')
+    print()
+    print(f'{"编码":<10}{"传输字节":>14}{"压缩比":>10}{"解压耗时(ms)":>16}')
+    encodings = [
+        ('identity', payload, lambda data: data),
+        ('gzip', gzip.compress(payload, compresslevel=6), gzip.decompress),
+        ('deflate', zlib.compress(payload, 6), zlib.decompress),
+    ]
+    if brotli is not None:
+        encodings.append(('br', brotli.compress(payload, quality=5), brotli.decompress))
+    for name, encoded, decode in encodings:
+        elapsed = timed(lambda: decode(encoded), args.repeat)
+        print(f'{name:<10}{len(encoded):>14,}{raw_size / len(encoded):>10.1f}{elapsed * 1000:>16.1f}')
+    if brotli is None:
+        print('(未安装 brotli, 跳过 br)')
+
+    print()
+    print(f'{"JSON 实现":<10}{"解码耗时(ms)":>16}')
+    decoders = [('json', json.loads)]
+    if orjson is not None:
+        decoders.append(('orjson', orjson.loads))
+    results = {}
+    for name, loads in decoders:
+        results[name] = timed(lambda: loads(payload), args.repeat)
+        print(f'{name:<10}{results[name] * 1000:>16.1f}')
+    if orjson is None:
+        print('(未安装 orjson, 跳过)')
+    else:
+        print(f'orjson 相对 json 加速: {results["json"] / results["orjson"]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
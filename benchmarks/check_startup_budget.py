@@ -0,0 +1,73 @@
+"""
+登录窗口启动时间检查
+在 offscreen 平台的新进程中从导入 app 开始计时, 直到登录窗口完成首次绘制;
+多次运行取中位数, 超过预算或登录前已导入了应延迟加载的模块时以非零状态码退出, 可在 CI 中作为回归检查
+
+用法: python -m benchmarks.check_startup_budget [--budget-ms 1500] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# 登录窗口显示前不应导入的模块: 只在导出/导入、解码 Token 或进入主窗口后才需要
+DEFERRED_MODULES = [
+    'openpyxl', 'jwt', 'pytz', 'windows.management',
+    'inventory.inventoryInterface', 'orders.ordersInterface', 'history.historyInterface',
+    'employee.employeeInterface', 'users.userInterface', 'project.projectInterface',
+    'provider.providerInterface', 'operation_logs.logsInterface',
+]
+
+
+def run_once() -> dict:
+    """在当前进程中显示登录窗口并返回耗时与提前导入的模块"""
+    start = time.perf_counter()
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    from windows.main import MainApp  # 与 app.py 导入的内容一致
+
+    app = QApplication(sys.argv)
+    main_app = MainApp()
+    main_app.show_login()
+    app.processEvents()  # 首次绘制
+    elapsed = time.perf_counter() - start
+    return {'seconds': elapsed, 'loaded': [name for name in DEFERRED_MODULES if name in sys.modules]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget-ms', type=float, default=1500, help='登录窗口显示耗时的预算(毫秒)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_once()))
+        return
+
+    results = []
+    for _ in range(args.repeat):
+        output = subprocess.run([sys.executable, '-m', 'benchmarks.check_startup_budget', '--child'],
+                                capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    median_ms = statistics.median(result['seconds'] for result in results) * 1000
+    loaded = sorted({name for result in results for name in result['loaded']})
+
+    print(f'登录窗口显示耗时(中位数): {median_ms:.1f} ms, 预算 {args.budget_ms:.0f} ms')
+    failed = False
+    if median_ms > args.budget_ms:
+        print('失败: 超出预算')
+        failed = True
+    if loaded:
+        print(f'失败: 登录前导入了应延迟加载的模块: {", ".join(loaded)}')
+        failed = True
+    if not failed:
+        print('通过')
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
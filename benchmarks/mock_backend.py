@@ -0,0 +1,342 @@
+"""
+基准测试用的模拟后端
+在后台线程中运行 HTTP 服务, 按真实后端的接口格式返回生成的数据, 覆盖客户端用到的全部接口
+(订单、库存、历史记录、日志、参考数据、用户与员工, 以及导入导出); 每个请求附加固定延迟, 模拟网络往返;
+GET 结果带 ETag, 请求头中的 If-None-Match 匹配时返回 304; 支持 gzip 压缩的请求体
+
+用法: python -m benchmarks.mock_backend [--port 8765] [--latency 50] [--orders 2000] [--inventories 2000]
+在基准测试中使用:
+    with MockBackend(latency_ms=50) as backend:
+        config.URL = backend.url  # 需在导入界面模块之前设置
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from benchmarks.bench_transport import make_orders, CATEGORIES, PROVIDERS, PROJECTS, EMPLOYEES
+
+# 按接口统计请求数时, 将路径末尾的页码或 id 归并为 <id>
+ID_SEGMENT = re.compile(r'/[^/]*\d[^/]*$')
+
+
+def make_inventories(rows: int, seed: int = 213) -> list:
+    """生成与后端 /inventory/all 返回格式一致的库存数据"""
+    rng = random.Random(seed)
+    inventories = []
+    for i in range(rows):
+        count = rng.randint(0, 2000)
+        price = round(rng.uniform(0.5, 3000), 2)
+        inventories.append({
+            'cargo_id': f'C{i + 1:06d}',
+            'cargo_name': f'货品{i + 1}',
+            'model': f'M-{rng.randint(100, 999)}-{rng.choice("ABCDEF")}',
+            'categories': rng.choice(CATEGORIES),
+            'count': count,
+            'price': str(price),
+            'specification': rng.choice(['个', '套', '米', '箱']),
+            'total_price': str(round(price * count, 2)),
+        })
+    return inventories
+
+
+def make_history(inventories: list, year: int, month: int, seed: int = 213) -> list:
+    """生成与后端 /history/search 返回格式一致的月度期初/期末库存记录"""
+    rng = random.Random(seed + year * 12 + month)
+    records = []
+    for i, inventory in enumerate(inventories):
+        price = float(inventory['price'])
+        starting_count = rng.randint(0, 2000)
+        closing_count = max(starting_count + rng.randint(-300, 300), 0)
+        records.append({
+            'id': i + 1,
+            'year': year,
+            'month': month,
+            'cargo_name': inventory['cargo_name'],
+            'model': inventory['model'],
+            'specification': inventory['specification'],
+            'categories': inventory['categories'],
+            'starting_price': str(price),
+            'starting_count': starting_count,
+            'starting_total_price': str(round(price * starting_count, 2)),
+            'closing_price': str(price),
+            'closing_count': closing_count,
+            'closing_total_price': str(round(price * closing_count, 2)),
+        })
+    return records
+
+
+def make_token(permissions: str = 'RW', hours: int = 8) -> str:
+    """生成可以通过 decode_token 校验的 JWT"""
+    import jwt
+    from config import TOKEN_SECRET_KEY
+    now = datetime.now()
+    payload = {'username': 'bench', 'permissions': permissions,
+               'iat': int(now.timestamp()), 'exp': int((now + timedelta(hours=hours)).timestamp())}
+    return jwt.encode(payload, TOKEN_SECRET_KEY, algorithm='HS256')
+
+
+class MockBackend:
+    """
+    模拟后端, 支持 with 语句; url 属性为服务地址
+    request_count 为收到的请求总数, requests 按 "方法 路径" 分别计数, not_modified_count 为返回 304 的次数,
+    imported 记录各导入接口收到的条目数, 可用于确认 Excel 导入的数据确实发送到了后端
+    """
+
+    def __init__(self, orders: int = 2000, inventories: int = 2000, latency_ms: float = 50, per_page: int = 20,
+                 port: int = 0, log_lines: int = 2000):
+        self.orders = make_orders(orders)
+        self.inventories = make_inventories(inventories)
+        self.latency = latency_ms / 1000
+        self.per_page = per_page
+        self.log_lines = log_lines
+        self.request_count = 0
+        self.not_modified_count = 0
+        self.requests = Counter()
+        self.imported = Counter()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+        self.get_routes = [
+            (r'/inventory/categories/get', self.categories),
+            (r'/providers/all', lambda query: {'success': True, 'data': [{'provider_name': p} for p in PROVIDERS]}),
+            (r'/providers/search', lambda query: self.search_names(PROVIDERS, 'provider_name', query)),
+            (r'/project/all', lambda query: {'success': True, 'data': [{'project_name': p} for p in PROJECTS]}),
+            (r'/project/search', lambda query: self.search_names(PROJECTS, 'project_name', query)),
+            (r'/employees/all', lambda query: {'success': True, 'data': self.employees()}),
+            (r'/employees/search', lambda query: {'success': True, 'data': self.employees(query)}),
+            (r'/employees/(\d+)', lambda query, employee_id: {'success': True,
+                                                             'data': self.employees()[int(employee_id) - 1]}),
+            (r'/users/all', lambda query: {'users': self.users()}),
+            (r'/users/search', lambda query: {'success': True, 'users': self.users(query)}),
+            (r'/users/(\d+)', lambda query, user_id: {'success': True, 'data': self.users()[int(user_id) - 1]}),
+            (r'/inventory/count', lambda query: {'count': len(self.filter_inventories(query))}),
+            (r'/inventory/page/(\d+)', lambda query, page: self.page(self.filter_inventories(query), page)),
+            (r'/inventory/all', lambda query: {'success': True, 'data': self.filter_inventories(query)}),
+            (r'/inventory/search', self.search_inventories),
+            (r'/inventory/([^/]+)', lambda query, cargo_id: self.find(self.inventories, 'cargo_id', cargo_id)),
+            (r'/orders/count', lambda query: {'success': True, 'data': len(self.orders)}),
+            (r'/orders/page/(\d+)', lambda query, page: self.page(self.orders, page)),
+            (r'/orders/all', lambda query: {'success': True, 'data': self.orders}),
+            (r'/orders/search', self.search_orders),
+            (r'/orders/print/(.+)', lambda query, order_id: b'%PDF-1.4\n% mock\n'),
+            (r'/orders/([^/]+)', lambda query, order_id: self.find(self.orders, 'order_id', order_id)),
+            (r'/history/search', self.search_history),
+            (r'/logs/getfiles', lambda query: {'success': True, 'data': self.log_files()}),
+            (r'/logs/content/(.+)', self.log_content),
+        ]
+        self.post_routes = [
+            (r'/users/login', lambda body: {'success': True, 'token': make_token()}),
+            (r'/orders/batch_query', self.batch_query_orders),
+            (r'/orders/import', lambda body: self.import_dataset('orders', body, failed_order_ids=None)),
+            (r'/inventory/import', lambda body: self.import_dataset('inventory', body, skipped=0, skipped_row=[])),
+            (r'/history/import', lambda body: self.import_dataset('history', body, failed=0)),
+        ]
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='MockBackend', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'requests': self.request_count, 'not_modified': self.not_modified_count,
+                    'imported': dict(self.imported)}
+
+    # 查询接口
+
+    def categories(self, query):
+        return {'success': True, 'categories': [{'categories': c} for c in CATEGORIES]}
+
+    def employees(self, query=None) -> list:
+        condition = (query or {}).get('condition', [''])[0]
+        return [
+            {'employee_id': i + 1, 'employee_name': name, 'gender': '男', 'position': '库管'}
+            for i, name in enumerate(EMPLOYEES) if condition in name
+        ]
+
+    def users(self, query=None) -> list:
+        condition = (query or {}).get('condition', [''])[0]
+        return [
+            {'user_id': i + 1, 'username': f'user{i + 1}', 'password': '-', 'employee_id': i + 1,
+             'created_at': 'Tue, 05 Nov 2024 00:00:00 GMT', 'status': 1, 'privilege': 'RW'}
+            for i in range(len(EMPLOYEES)) if condition in f'user{i + 1}'
+        ]
+
+    @staticmethod
+    def search_names(names: list, key: str, query) -> dict:
+        name = query.get('name', [''])[0]
+        return {'success': True, 'data': [{key: n} for n in names if name in n]}
+
+    def filter_inventories(self, query) -> list:
+        category = query.get('category', [None])[0]
+        return [item for item in self.inventories if item['categories'] == category] if category else self.inventories
+
+    def search_inventories(self, query):
+        cargo_name = query.get('cargo_name', [''])[0]
+        model = query.get('model', [''])[0]
+        data = [item for item in self.inventories if cargo_name in item['cargo_name'] and model in item['model']]
+        return {'success': True, 'data': data} if data else {'success': False, 'message': '没有匹配的结果'}
+
+    def search_orders(self, query):
+        conditions = {'categories': query.get('i.categories', [None])[0],
+                      'order_type': query.get('o.order_type', [None])[0],
+                      'status': query.get('o.status', [None])[0]}
+        conditions = {key: value for key, value in conditions.items() if value is not None}
+        data = [order for order in self.orders if all(order[key] == value for key, value in conditions.items())]
+        return {'success': True, 'data': data} if data else {'success': False, 'message': '没有匹配的结果'}
+
+    def search_history(self, query):
+        year = int(query.get('year', ['2024'])[0])
+        month = int(query.get('month', ['1'])[0])
+        return {'success': True, 'data': make_history(self.inventories, year, month)}
+
+    def log_files(self) -> list:
+        today = datetime.today()
+        return [f'operation.log.{(today - timedelta(days=i)).strftime("%Y-%m-%d")}' for i in range(7)]
+
+    def log_content(self, query, filename):
+        lines = [f'2024-12-31 08:{i // 60 % 60:02d}:{i % 60:02d} - INFO - user{i % 6 + 1} 修改了订单 O{i:08d}'
+                 for i in range(self.log_lines)]
+        return {'success': True, 'data': lines}
+
+    @staticmethod
+    def find(records: list, key: str, value: str) -> dict:
+        for record in records:
+            if str(record[key]) == value:
+                return {'success': True, 'data': record}
+        return {'success': False, 'message': '没有找到对应的记录'}
+
+    def page(self, records: list, page: str) -> dict:
+        start = (int(page) - 1) * self.per_page
+        return {'success': True, 'data': records[start:start + self.per_page]}
+
+    # 写入接口
+
+    def batch_query_orders(self, body):
+        ids = set(str(order_id) for order_id in body.get('ids', []))
+        return {'success': True, 'data': [order for order in self.orders if str(order['order_id']) in ids]}
+
+    def import_dataset(self, name: str, body, **extra) -> dict:
+        dataset = body.get('dataset') or []
+        with self._lock:
+            self.imported[name] += len(dataset)
+        result = {'success': True, 'imported': len(dataset), 'succeed': len(dataset)}
+        result.update(extra)
+        return result
+
+    # HTTP 处理
+
+    def handle(self, method: str, path: str, body: bytes):
+        """返回 (状态码, 响应对象), 响应对象为 bytes 时作为文件原样返回"""
+        parts = urlsplit(path)
+        route = unquote(parts.path)
+        with self._lock:
+            self.request_count += 1
+            self.requests[f'{method} {ID_SEGMENT.sub("/<id>", route)}'] += 1
+        time.sleep(self.latency)
+        if method == 'GET':
+            query = parse_qs(parts.query)
+            for pattern, handler in self.get_routes:
+                match = re.fullmatch(pattern, route)
+                if match:
+                    return 200, handler(query, *match.groups())
+            return 404, {'success': False, 'message': 'not found'}
+        data = json.loads(body) if body else {}
+        for pattern, handler in self.post_routes:
+            if method == 'POST' and re.fullmatch(pattern, route):
+                return 200, handler(data)
+        return 200, {'success': True, 'message': '操作成功'}
+
+    def _handler_class(self):
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # 保持连接, 与客户端的连接池配合
+
+            def _respond(self, method: str):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                if self.headers.get('Content-Encoding') == 'gzip':
+                    body = gzip.decompress(body)
+                status, payload = backend.handle(method, self.path, body)
+                if isinstance(payload, bytes):  # 订单打印返回 PDF 文件
+                    return self._send(status, payload, 'application/pdf')
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                etag = None
+                if method == 'GET' and status == 200:
+                    etag = '"' + hashlib.sha1(data).hexdigest() + '"'
+                    if self.headers.get('If-None-Match') == etag:
+                        with backend._lock:
+                            backend.not_modified_count += 1
+                        return self._send(304, b'', None, etag)
+                self._send(status, data, 'application/json', etag)
+
+            def _send(self, status: int, data: bytes, content_type, etag=None):
+                self.send_response(status)
+                if content_type:
+                    self.send_header('Content-Type', content_type)
+                if etag:
+                    self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._respond('GET')
+
+            def do_POST(self):
+                self._respond('POST')
+
+            def do_DELETE(self):
+                self._respond('DELETE')
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=50, help='每个请求的延迟(毫秒)')
+    parser.add_argument('--orders', type=int, default=2000)
+    parser.add_argument('--inventories', type=int, default=2000)
+    args = parser.parse_args()
+
+    backend = MockBackend(args.orders, args.inventories, args.latency, port=args.port).start()
+    print(f'模拟后端运行于 {backend.url}, 按 Ctrl+C 退出')
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        backend.stop()
+
+
+if __name__ == '__main__':
+    main()
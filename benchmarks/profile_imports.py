@@ -0,0 +1,68 @@
+"""
+启动导入耗时分析
+在子进程中以 python -X importtime 导入指定模块(默认为 app, 即登录窗口显示前需要导入的全部模块),
+解析输出后按累计耗时列出最慢的模块, 并按顶层包汇总自身耗时
+
+用法: python -m benchmarks.profile_imports [--module app] [--top 30] [--raw importtime.log]
+"""
+import argparse
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+# import time: self [us] | cumulative | imported package
+LINE_PATTERN = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def run_importtime(module: str) -> str:
+    """在新的解释器中导入模块, 返回 -X importtime 的输出"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return result.stderr
+
+
+def parse_importtime(output: str) -> list:
+    """:return: [(模块名, 自身耗时(us), 累计耗时(us), 嵌套深度)]"""
+    entries = []
+    for line in output.splitlines():
+        match = LINE_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default='app', help='要分析的模块')
+    parser.add_argument('--top', type=int, default=30, help='列出累计耗时最长的模块数量')
+    parser.add_argument('--raw', help='同时将 -X importtime 的原始输出保存到该文件')
+    args = parser.parse_args()
+
+    output = run_importtime(args.module)
+    if args.raw:
+        with open(args.raw, 'w', encoding='utf-8') as f:
+            f.write(output)
+    entries = parse_importtime(output)
+    total = sum(entry[1] for entry in entries)
+
+    print(f'导入 {args.module}: 共 {len(entries)} 个模块, 总耗时 {total / 1000:.1f} ms')
+    print()
+    print(f'{"累计(ms)":>10}{"自身(ms)":>10}  模块')
+    for name, self_us, cumulative_us, depth in sorted(entries, key=lambda entry: -entry[2])[:args.top]:
+        print(f'{cumulative_us / 1000:>10.1f}{self_us / 1000:>10.1f}  {"  " * depth}{name}')
+
+    packages = defaultdict(int)
+    for name, self_us, _, _ in entries:
+        packages[name.split('.')[0]] += self_us
+    print()
+    print(f'{"自身合计(ms)":>12}  顶层包')
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f'{self_us / 1000:>12.1f}  {package}')
+
+
+if __name__ == '__main__':
+    main()
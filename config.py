@@ -2,4 +2,66 @@ URL = 'http://182.92.242.105:8000'
 # URL = 'http://127.0.0.1:5000'
 TOKEN_SECRET_KEY = '213wms'
 
-SALT = '213encrypted'
\ No newline at end of file
+SALT = '213encrypted'
+
+# HTTP 连接池配置
+HTTP_POOL_SIZE = 10  # 每个主机保持的最大连接数
+HTTP_IDLE_TIMEOUT = 60  # 连接空闲超过该秒数后由回收线程关闭
+
+# 后台线程池配置
+WORKER_MAX_THREADS = 8  # 同时执行的后台请求数量上限
+
+# 相同 GET 请求完成后结果可被复用的时间(秒), 0 表示只合并并发中的请求
+SINGLE_FLIGHT_WINDOW = 1.0
+
+# 参考数据(类别、供应商、项目、员工)在内存中的缓存时间(秒)
+REFERENCE_DATA_TTL = {
+    'categories': 300,
+    'providers': 300,
+    'projects': 300,
+    'employees': 120,
+}
+
+# 条件请求(ETag / Last-Modified)缓存的 URL 数量上限
+CONDITIONAL_CACHE_SIZE = 64
+# 条件请求缓存的响应体占用上限(字节, 按未解码的响应体大小估算); 超过单条上限的响应体(如 /orders/all)不缓存
+CONDITIONAL_CACHE_MAX_BYTES = 8 * 1024 * 1024
+CONDITIONAL_CACHE_MAX_BODY_BYTES = 1024 * 1024
+
+# 传输压缩: 超过该字节数的批量导入请求体使用 gzip 压缩发送
+# 需后端能够解码 Content-Encoding: gzip 的请求体, 确认后端支持后改为 True 开启;
+# 开启后后端仍以 400/415 拒绝压缩的请求体时, 自动改为发送未压缩的请求体
+GZIP_REQUEST_BODIES = False
+GZIP_MIN_SIZE = 1024
+
+# 分页缓存: 每个界面缓存的分页数据占用内存上限(字节, 估算值)
+PAGE_CACHE_MAX_BYTES = 4 * 1024 * 1024
+
+# 连续滚动模式: 是否默认开启, 以及表格中最多保留的行数(超出时淘汰最早加载的页)
+INFINITE_SCROLL_DEFAULT = False
+INFINITE_SCROLL_ROW_BUDGET = 200
+
+# 表格格式化: 日期转换结果的缓存条目数, 以及按块批量格式化时每块的行数与最多缓存的块数
+DATE_CACHE_SIZE = 4096
+NORMALIZE_BLOCK_SIZE = 256
+NORMALIZE_MAX_BLOCKS = 64
+
+# 分批填充表格: 结果超过该行数时分批插入, 每批的行数以及每次占用事件循环的时间上限(毫秒)
+INCREMENTAL_POPULATE_THRESHOLD = 2000
+INCREMENTAL_BATCH_ROWS = 500
+INCREMENTAL_TIME_SLICE_MS = 12
+
+# 子界面延迟构建: 主窗口显示后是否在空闲时依次预先构建其余界面, 开始预热前的等待时间与每个界面之间的间隔(毫秒)
+INTERFACE_WARMUP = True
+INTERFACE_WARMUP_DELAY_MS = 2000
+INTERFACE_WARMUP_INTERVAL_MS = 300
+
+# 批量编辑时依次打开编辑对话框的条目数上限; 选中全部匹配结果时不支持批量编辑
+BATCH_EDIT_MAX = 20
+
+# 登录后预取的首屏数据在被界面取用前的有效时间(秒), 超时后界面重新请求
+BOOTSTRAP_TTL = 120
+
+# 预先缩放的登录背景与图标的磁盘缓存目录(None 表示使用当前用户的缓存目录), 以及窗口图标预先缩放的尺寸
+RESOURCE_CACHE_DIR = None
+LOGO_ICON_SIZES = (16, 24, 32, 48, 64, 256)
@@ -3,6 +3,7 @@ from PyQt6.QtWidgets import QGridLayout
 from qfluentwidgets import MessageBoxBase, LineEdit, ComboBox, StrongBodyLabel, SubtitleLabel, InfoBar
 from backendRequests.jsonRequests import APIClient
 from utils.worker import Worker
+from utils.ui_components import create_loading_bar, set_loading_state
 from config import URL
 from utils.app_logger import get_logger
 
@@ -93,10 +94,22 @@ class UpdateEmployeeDialog(BaseEmployeeDialog):
         self.set_employee_info()
 
     def set_employee_info(self):
+        """非阻塞地获取员工信息, 返回前显示加载状态并禁用修改按钮"""
+        self.loading_bar = create_loading_bar(self)
+        self.viewLayout.insertWidget(1, self.loading_bar)
+        set_loading_state(self.loading_bar, True, self.yesButton)
         url = URL + f'/employees/{self.employee_id}'
-        # response = APIClient.get_request(url)
+        Worker.run_async(APIClient.get_request, url, callback=self.on_employee_info_loaded,
+                         error_callback=self.on_employee_info_failed)
+
+    def on_employee_info_failed(self, error: Exception):
+        set_loading_state(self.loading_bar, False, self.yesButton)
+        InfoBar.error(title='加载失败', content=str(error), parent=self, duration=5000)
+        error_logger.error(f'EmployeeDialog.set_employee_info: {str(error)}')
+
+    def on_employee_info_loaded(self, response):
+        set_loading_state(self.loading_bar, False, self.yesButton)
         try:
-            response = Worker.unpack_thread_queue(APIClient.get_request, url)
             if response['success'] is True:
                 data = response['data']
                 self.employee_name_input.setText(data['employee_name'])
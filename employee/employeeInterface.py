@@ -1,16 +1,19 @@
 import sys
 
-from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QApplication, QHeaderView, QTableWidgetItem
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QApplication
 from qfluentwidgets import CardWidget, StrongBodyLabel, LineEdit, setCustomStyleSheet, PushButton, ComboBox, \
-    TableWidget, SmoothMode, InfoBar, CheckBox
+    InfoBar
 
 from utils.custom_styles import ADD_BUTTON_STYLE
 from backendRequests.jsonRequests import APIClient
+from backendRequests.bootstrap import BootstrapPrefetch
 from config import URL
-from utils.ui_components import create_btn_widget
+from utils.ui_components import create_table_view
+from utils.table_model import ColumnSpec, RecordTableModel
+from utils.optimistic import optimistic_update
 from employee.employeeDialog import AddEmployeeDialog, UpdateEmployeeDialog
 from utils.worker import Worker
+from utils.reference_data import ReferenceDataStore
 from utils.app_logger import get_logger
 
 error_logger = get_logger(logger_name='error_logger', log_file='error.log')
@@ -64,19 +67,16 @@ class EmployeeInterface(QWidget):
 
         layout.addWidget(card_widget)
 
-        self.table_widget = TableWidget(self)
-        self.table_widget.setBorderRadius(8)
-        self.table_widget.setBorderVisible(True)
-        self.table_widget.verticalHeader().setVisible(True)  # 不显示行号
-        self.table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.table_widget.scrollDelagate.verticalSmoothScroll.setSmoothMode(SmoothMode.NO_SMOOTH)
+        self.table_model = RecordTableModel([
+            ColumnSpec('employee_id', '员工id'),
+            ColumnSpec('employee_name', '姓名'),
+            ColumnSpec('gender', '性别'),
+            ColumnSpec('position', '职务'),
+            ColumnSpec(None, '操作', action=lambda record: self.update_employee(record['employee_id'])),
+        ], id_key='employee_id', checkable=True, parent=self)
+        self.table_view = create_table_view(self, self.table_model, show_row_numbers=True)
 
-        # 设置表头
-        self.table_widget.setColumnCount(6)
-        self.table_widget.setHorizontalHeaderLabels(
-            ["", "员工id", "姓名", "性别", "职务", "操作"])
-
-        layout.addWidget(self.table_widget)
+        layout.addWidget(self.table_view)
 
         self.setStyleSheet("EmployeeInterface {background-color:white;}")
         self.resize(1280, 760)
@@ -89,15 +89,24 @@ class EmployeeInterface(QWidget):
             case 2:
                 self.delete_employees()
 
-    def load_data(self):
+    def load_data(self, refresh: bool = False):
+        """:param refresh: 数据变更后的刷新, 按 employee_id 比较后只更新变化的行"""
         url = URL + '/employees/all'
         # response = APIClient.get_request(url)
+        # 首次加载优先使用登录后预取的结果, 没有时在后台请求, 返回后再填充表格
+        response = BootstrapPrefetch.take(url)
+        if response is not None:
+            self.on_data_loaded(response, refresh)
+            return
+        Worker.run_async(APIClient.get_request, url, callback=lambda response: self.on_data_loaded(response, refresh),
+                         error_callback=lambda e: error_logger.error(f'EmployeeInterface.load_data: {e}'))
+
+    def on_data_loaded(self, response, refresh: bool = False):
         try:
-            response = Worker.unpack_thread_queue(APIClient.get_request, url)
             if isinstance(response, (dict, list)):  # 有效 JSON
                 if response.get('success') is True:  # 有数据
                     self.employees = response.get('data')
-                    self.populate_table()
+                    self.populate_table(refresh)
                 else:
                     InfoBar.warning(title='获取数据失败', content=response.get('message'), parent=self, duration=5000)
             elif isinstance(response, str):  # 错误信息
@@ -107,29 +116,12 @@ class EmployeeInterface(QWidget):
         except Exception as e:
             error_logger.error(f'EmployeeInterface.load_data(): {str(e)}')
 
-    def populate_table(self):
-        """生成表格, 遍历从后端获取的数据并逐行填入到表格中"""
-        self.table_widget.setRowCount(len(self.employees))
-        for row, employee_info in enumerate(self.employees):
-            self.setup_table_row(row, employee_info)
-
-    def setup_table_row(self, row: int, employee_info: dict):
-        # 将多选框绘制到每行的首列
-        checkbox = CheckBox()
-        self.table_widget.setCellWidget(row, 0, checkbox)
-        for col, key in enumerate(['employee_id', 'employee_name', 'gender', 'position']):
-            value = employee_info.get(key, '')
-            # 单元格赋值
-            item = QTableWidgetItem(str(value))
-            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
-            self.table_widget.setItem(row, col + 1, item)  #注意：第一列是多选框，所以在赋值时从第二列开始
-
-        # 为每行添加编辑按钮
-        action_widget = create_btn_widget(
-            callback=lambda: self.update_employee(employee_info['employee_id'])
-        )
-        self.table_widget.setCellWidget(row, 5, action_widget)  # 将组件添加到每行的最后一列
+    def populate_table(self, refresh: bool = False):
+        """将从后端获取的数据交给表格模型, 单元格内容在绘制时按需生成; refresh 为 True 时只更新变化的行"""
+        if refresh:
+            self.table_model.update_records(self.employees)
+        else:
+            self.table_model.set_records(self.employees)
 
     def search_employees(self):
         condition = self.search_input.text().strip()
@@ -161,8 +153,8 @@ class EmployeeInterface(QWidget):
                 response = Worker.unpack_thread_queue(APIClient.post_request, url, info)
                 if response.get('success') is True:
                     InfoBar.success(title='操作成功', content=response.get('message'), parent=self, duration=5000)
-                    self.load_data()
-                    self.populate_table()
+                    ReferenceDataStore.instance().invalidate('employees')
+                    self.load_data(refresh=True)
                 elif response.get('success') is False:
                     InfoBar.error(title='操作失败', content=response.get('message'), parent=self, duration=5000)
                 elif response.get('error') is not None:
@@ -176,29 +168,30 @@ class EmployeeInterface(QWidget):
             dialog = UpdateEmployeeDialog(employee_id, self)
             if dialog.exec():
                 new_employee_info = dialog.get_employee_info()
-                response = Worker.unpack_thread_queue(APIClient.post_request, url, new_employee_info)
-                if response.get('success') is True:
-                    InfoBar.success(title='操作成功', content=response['message'], parent=self, duration=5000)
-                    self.load_data()
-                    self.populate_table()
-                    return
-                elif response.get('success') is False:
-                    InfoBar.error(title='操作失败', content=response['message'], parent=self, duration=5000)
-                    return
-                elif response.get('success') is not None:
-                    InfoBar.error(title='操作失败', content=response['error'], parent=self, duration=5000)
-                    return
+                # 先修改表格中的对应行, 请求在后台执行, 失败时回滚
+                optimistic_update(self.table_model, employee_id, new_employee_info, APIClient.post_request, url,
+                                  new_employee_info, on_success=self.on_update_succeeded,
+                                  on_failure=self.on_update_failed)
         except Exception as e:
             error_logger.error(f'EmployeeInterface.update_employee(): {str(e)}')
 
+    def on_update_succeeded(self, response: dict):
+        InfoBar.success(title='操作成功', content=response.get('message'), parent=self, duration=5000)
+        ReferenceDataStore.instance().invalidate('employees')
+        self.load_data(refresh=True)
+
+    def on_update_failed(self, message: str):
+        InfoBar.error(title='操作失败', content=f'{message}, 已撤销表格中的修改', parent=self, duration=5000)
+
     def delete_employees(self):
         url = URL + '/employees/delete'
         selected_ids = self.get_selected_employee_ids()
         try:
             response = Worker.unpack_thread_queue(APIClient.delete_request, url, selected_ids)
             if response.get('success') is True:
-                self.load_data()
-                self.populate_table()
+                self.table_model.selection.clear()
+                ReferenceDataStore.instance().invalidate('employees')
+                self.load_data(refresh=True)
                 InfoBar.success(title='删除成功', content='已成功删除所选员工信息', parent=self, duration=5000)
                 return
             elif response.get('success') is False:
@@ -212,14 +205,7 @@ class EmployeeInterface(QWidget):
 
     def get_selected_employee_ids(self) -> list:
         """获取并返回多选框被选中的数据的cargo_id"""
-        selected_employee_ids = []
-        for row in range(self.table_widget.rowCount()):
-            checkbox = self.table_widget.cellWidget(row, 0)
-            if checkbox.isChecked():
-                employee_id = str(self.table_widget.item(row, 1).text())
-                selected_employee_ids.append(employee_id)
-
-        return selected_employee_ids
+        return [str(employee_id) for employee_id in self.table_model.selection.selected_ids()]
 
 
 if __name__ == '__main__':
@@ -1,11 +1,11 @@
 import sys
 
-import openpyxl
-from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QHeaderView, QApplication, QTableWidgetItem, QFileDialog
-from qfluentwidgets import CardWidget, StrongBodyLabel, TableWidget, SmoothMode, LineEdit, PushButton, InfoBar, ComboBox
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QApplication, QFileDialog
+from qfluentwidgets import CardWidget, StrongBodyLabel, LineEdit, PushButton, InfoBar, ComboBox
 from backendRequests.jsonRequests import APIClient
 from utils.app_logger import get_logger
+from utils.table_model import ColumnSpec, RecordTableModel
+from utils.ui_components import create_table_view
 from utils.worker import Worker
 from config import URL
 
@@ -59,18 +59,21 @@ class HistoryInterface(QWidget):
 
         layout.addWidget(card_widget)
 
-        self.table_widget = TableWidget(self)
-        self.table_widget.setBorderRadius(8)
-        self.table_widget.setBorderVisible(True)
-        self.table_widget.verticalHeader().setVisible(False)  # 不显示行号
-        self.table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.table_widget.scrollDelagate.verticalSmoothScroll.setSmoothMode(SmoothMode.NO_SMOOTH)
-
-        # 设置表头
-        self.table_widget.setColumnCount(11)
-        self.table_widget.setHorizontalHeaderLabels(
-            ['id', '货品名', '型号', '规格', '分类', '期初单价', '期初数量', '期初总价', '期末单价', '期末数量', '期末总价'])
-        layout.addWidget(self.table_widget)
+        self.table_model = RecordTableModel([
+            ColumnSpec('id', 'id'),
+            ColumnSpec('cargo_name', '货品名'),
+            ColumnSpec('model', '型号'),
+            ColumnSpec('specification', '规格'),
+            ColumnSpec('categories', '分类'),
+            ColumnSpec('starting_price', '期初单价'),
+            ColumnSpec('starting_count', '期初数量'),
+            ColumnSpec('starting_total_price', '期初总价'),
+            ColumnSpec('closing_price', '期末单价'),
+            ColumnSpec('closing_count', '期末数量'),
+            ColumnSpec('closing_total_price', '期末总价'),
+        ], id_key='id', parent=self)
+        self.table_view = create_table_view(self, self.table_model)
+        layout.addWidget(self.table_view)
 
         self.setStyleSheet("HistoryInterface {background-color:white;}")
         self.resize(1280, 760)
@@ -102,22 +105,8 @@ class HistoryInterface(QWidget):
                 error_logger.error(f'historyInterface.search_data_by_date: {e}')
 
     def populate_table(self):
-        """生成表格, 遍历从后端获取的数据并逐行填入到表格中"""
-        self.table_widget.setRowCount(len(self.records))
-        for row, record_info in enumerate(self.records):
-            self.setup_table_row(row, record_info)
-
-    def setup_table_row(self, row: int, record_info: dict):
-        data_keys = ['id', 'cargo_name', 'model', 'specification', 'categories', 'starting_price', 'starting_count',
-                     'starting_total_price', 'closing_price', 'closing_count', 'closing_total_price']
-        # 将多选框绘制到每行的首列
-        for col, key in enumerate(data_keys):
-            value = record_info.get(key, '')
-            # 单元格赋值
-            item = QTableWidgetItem(str(value))
-            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
-            self.table_widget.setItem(row, col, item)  #注意：第一列是多选框，所以在赋值时从第二列开始
+        """将从后端获取的数据交给表格模型, 单元格内容在绘制时按需生成"""
+        self.table_model.set_records(self.records)
 
     def export_to_excel(self):
         if self.records is None:
@@ -125,6 +114,8 @@ class HistoryInterface(QWidget):
             return
         try:
             filename = f'{self.record_date}库存记录'
+            # openpyxl 导入较慢, 只在导出/导入 Excel 时才导入
+            import openpyxl
             wb = openpyxl.Workbook()
             ws = wb.active
             ws.title = filename
@@ -164,6 +155,7 @@ class HistoryInterface(QWidget):
                 InfoBar.warning("操作取消", "用户终止了导入操作", parent=self, duration=4000)
                 return
             else:
+                import openpyxl
                 wb = openpyxl.load_workbook(filename=file_path)
                 ws = wb.active
                 expected_header = ['id', '年', '月', '货品名', '型号', '规格', '分类', '期初单价', '期初数量', '期初总价', '期末单价', '期末数量', '期末总价']
@@ -197,7 +189,7 @@ class HistoryInterface(QWidget):
                             dataset.append(info)
                     url = f'{URL}/history/import'
                     data = {"dataset": dataset}
-                    response = Worker.unpack_thread_queue(APIClient.post_request, url, data)
+                    response = Worker.unpack_thread_queue(APIClient.post_request, url, data, compress=True)
                     print(response)
                     if response.get('success') is True:
                         succeed = response.get('succeed')
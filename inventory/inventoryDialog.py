@@ -6,6 +6,7 @@ from config import URL
 from utils.db_utils import load_categories
 from utils.worker import Worker
 from utils.app_logger import get_logger
+from utils.ui_components import create_loading_bar, set_loading_state
 
 error_logger = get_logger(logger_name='error_logger', log_file='error.log')
 
@@ -134,10 +135,21 @@ class UpdateInventoryDialog(BaseInventoryDialog):
         self.set_inventory_info()
 
     def set_inventory_info(self):
+        """非阻塞地获取库存信息, 返回前显示加载状态并禁用修改按钮"""
+        self.loading_bar = create_loading_bar(self)
+        self.viewLayout.insertWidget(1, self.loading_bar)
+        set_loading_state(self.loading_bar, True, self.yesButton)
+        url = URL + f'/inventory/{self.cargo_id}'
+        Worker.run_async(APIClient.get_request, url, callback=self.on_inventory_info_loaded,
+                         error_callback=self.on_inventory_info_failed)
+
+    def on_inventory_info_failed(self, error: Exception):
+        set_loading_state(self.loading_bar, False, self.yesButton)
+        error_logger.error(f'inventoryDialog.set_inventory_info: {error}')
+
+    def on_inventory_info_loaded(self, response):
+        set_loading_state(self.loading_bar, False, self.yesButton)
         try:
-            url = URL + f'/inventory/{self.cargo_id}'
-            # response = APIClient.get_request(url)
-            response = Worker.unpack_thread_queue(APIClient.get_request, url)
             if response['success']:
                 data = response['inventory']
                 self.cargo_name_input.setText(data['cargo_name'])
@@ -1,18 +1,26 @@
-import math, sys, openpyxl
+import sys
 from datetime import datetime
-from config import URL
-from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QApplication, QHeaderView, QTableWidgetItem, \
-     QFileDialog
-from qfluentwidgets import CardWidget, PushButton, TableWidget, setCustomStyleSheet, InfoBar, CheckBox, \
-    MessageBox, LineEdit, ComboBox, PrimaryPushButton, StrongBodyLabel, SmoothMode
+from config import URL, INFINITE_SCROLL_DEFAULT, BATCH_EDIT_MAX
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QApplication, QFileDialog
+from qfluentwidgets import CardWidget, PushButton, setCustomStyleSheet, InfoBar, \
+    MessageBox, LineEdit, ComboBox, PrimaryPushButton, StrongBodyLabel, SwitchButton
 from utils.custom_styles import ADD_BUTTON_STYLE
 from backendRequests.jsonRequests import APIClient
+from backendRequests.paginatedSource import PaginatedSource
+from backendRequests.bootstrap import BootstrapPrefetch
 from inventory.inventoryDialog import AddInventoryDialog, UpdateInventoryDialog
 from utils.db_utils import load_categories
-from utils.ui_components import create_btn_widget
+from utils.ui_components import create_loading_bar, set_loading_state, create_table_view, attach_infinite_scroll, \
+    create_progress_bar, update_progress_bar
+from utils.incremental_populator import IncrementalPopulator
+from utils.table_model import ColumnSpec, RecordTableModel, LazyRecordTableModel
+from utils.selection_store import SelectionStore
+from utils.sort_filter_proxy import RecordSortFilterProxyModel, numeric_sort_key, pinyin_sort_key
+from utils.record_store import compacted_copy
+from utils.optimistic import optimistic_update
 from utils.token_utils import get_privilege
 from utils.worker import Worker
+from utils.reference_data import ReferenceDataStore
 from utils.app_logger import get_logger
 
 error_logger = get_logger(logger_name='error_logger', log_file='error.log')
@@ -26,21 +34,36 @@ class InventoryInterface(QWidget):
         # 后端返回的数据条目集合
         self.inventories = []
         self.permission = ''
-        self.enm_header = []
-        self.column_count = 0
 
         # 分页属性
         self.current_page = 1
         self.per_page = 20
         self.total_pages = 1
+        # 是否使用连续滚动模式代替翻页
+        self.infinite_scroll = INFINITE_SCROLL_DEFAULT
+
+        # 当前显示的搜索结果对应的 URL, 为 None 时按分类分页显示
+        self.search_url = None
+
+        # 最近一次加载请求的序号, 用于丢弃过期的返回结果
+        self.load_seq = 0
+        # 数据变更后发起的刷新请求的序号, 其结果按主键与当前数据比较后更新
+        self.refresh_seq = 0
+        # 分页数据源, 并发获取总量与页数据, 总量按分类缓存
+        self.source = PaginatedSource(
+            count_url=self.build_count_url,
+            page_url=self.build_page_url,
+            count_parser=self.parse_count,
+            per_page=self.per_page
+        )
+        # 登录后已预取的首页数据与总量直接写入缓存, 首次加载无需等待后端
+        BootstrapPrefetch.seed_source(self.source)
 
         self.setup_ui()
         self.load_data()
 
     def setup_ui(self):
         self.permission = get_privilege(APIClient.jwt_token)
-        self.enm_header = ['cargo_id', 'cargo_name', 'model', 'categories', 'count', 'price', 'specification', 'total_price'] if self.permission != 'W' else ['cargo_id', 'cargo_name', 'model', 'categories', 'count']
-        self.column_count = 10 if self.permission != 'W' else 7
 
         # 父布局 - 垂直布局
         layout = QVBoxLayout(self)
@@ -54,8 +77,9 @@ class InventoryInterface(QWidget):
         self.categoriesComboBox = ComboBox(self)
         self.categoriesComboBox.setFixedWidth(200)
         self.categoriesComboBox.addItem('所有类别', None)
-        self.categoriesComboBox.addItems(load_categories())
+        self.categoriesComboBox.addItems(load_categories() or [])
         self.categoriesComboBox.currentIndexChanged.connect(self.on_category_selected)
+        ReferenceDataStore.instance().changed.connect(self.on_reference_data_changed)
 
         self.search_label = StrongBodyLabel(self)
         self.search_label.setText("条件搜索: ")
@@ -70,11 +94,24 @@ class InventoryInterface(QWidget):
         self.searchButton = PushButton('搜索', self)
         self.searchButton.clicked.connect(self.search_inventories)
 
+        # 在已加载的数据中即时过滤, 不请求后端
+        self.filter_input = LineEdit(self)
+        self.filter_input.setPlaceholderText('筛选当前数据')
+        self.filter_input.setClearButtonEnabled(True)
+        self.filter_input.setFixedWidth(150)
+
+        self.scroll_mode_switch = SwitchButton(self)
+        self.scroll_mode_switch.setOnText('连续滚动')
+        self.scroll_mode_switch.setOffText('分页显示')
+        self.scroll_mode_switch.setChecked(self.infinite_scroll)
+        self.scroll_mode_switch.checkedChanged.connect(self.on_scroll_mode_changed)
+
         self.operations_label = StrongBodyLabel(self)
         self.operations_label.setText('执行操作: ')
         self.operationsComboBox = ComboBox(self)
         self.operationsComboBox.setFixedWidth(150)
-        self.operationsComboBox.addItems(['---------------', '新增记录', '批量删除', '批量编辑', '导出为Excel', '从Excel中导入'])
+        self.operationsComboBox.addItems(['---------------', '新增记录', '批量删除', '批量编辑', '导出为Excel', '从Excel中导入',
+                                          '选中全部匹配结果', '取消选中'])
         self.execBtn = PushButton('执行', self)
         setCustomStyleSheet(self.execBtn, ADD_BUTTON_STYLE, ADD_BUTTON_STYLE)
         self.execBtn.clicked.connect(self.exec_operations)
@@ -91,33 +128,64 @@ class InventoryInterface(QWidget):
         buttons_layout.addWidget(self.model_input)
         buttons_layout.addWidget(self.searchButton)
         buttons_layout.addStretch(1)
+        buttons_layout.addWidget(self.filter_input)
+        buttons_layout.addWidget(self.scroll_mode_switch)
         buttons_layout.addWidget(self.operations_label)
         buttons_layout.addWidget(self.operationsComboBox)
         buttons_layout.addWidget(self.execBtn)
 
         layout.addWidget(card_widget)
 
-        # 添加Table
-        self.table_widget = TableWidget(self)
-        self.table_widget.setBorderRadius(8)
-        self.table_widget.setBorderVisible(True)
-        self.table_widget.verticalHeader().setVisible(True)  # 不显示行号
-        self.table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.table_widget.scrollDelagate.verticalSmoothScroll.setSmoothMode(SmoothMode.NO_SMOOTH)
+        # 加载状态进度条
+        self.loading_bar = create_loading_bar(self)
+        layout.addWidget(self.loading_bar)
+        # 大量搜索结果分批填充时的进度条
+        self.progress_bar = create_progress_bar(self)
+        layout.addWidget(self.progress_bar)
 
-        # 设置表头
-        self.table_widget.setColumnCount(self.column_count)
+        # 添加Table, 权限为 W 时不显示价格与操作列
         if self.permission != 'W':
-            self.table_widget.setHorizontalHeaderLabels(
-                ["", "货品编号", "货品名称", "型号", "类别", "数量", "单价", "规格", "总价", "操作"])
+            columns = [
+                ColumnSpec('cargo_id', '货品编号'),
+                ColumnSpec('cargo_name', '货品名称', sort_key=pinyin_sort_key),
+                ColumnSpec('model', '型号'),
+                ColumnSpec('categories', '类别'),
+                ColumnSpec('count', '数量', sort_key=numeric_sort_key),
+                ColumnSpec('price', '单价', sort_key=numeric_sort_key),
+                ColumnSpec('specification', '规格'),
+                ColumnSpec('total_price', '总价', sort_key=numeric_sort_key),
+                ColumnSpec(None, '操作', action=lambda record: self.update_inventory(record['cargo_id'])),
+            ]
         else:
-            self.table_widget.setHorizontalHeaderLabels(
-                ["", "货品编号", "货品名称", "型号", "类别", "数量", "规格"])
-
-        # self.custom_header = CustomHeaderView(orientation=Qt.Orientation.Horizontal, parent=self.table_widget)
-        # self.table_widget.setHorizontalHeader(self.custom_header)
-
-        layout.addWidget(self.table_widget)
+            columns = [
+                ColumnSpec('cargo_id', '货品编号'),
+                ColumnSpec('cargo_name', '货品名称', sort_key=pinyin_sort_key),
+                ColumnSpec('model', '型号'),
+                ColumnSpec('categories', '类别'),
+                ColumnSpec('count', '数量', sort_key=numeric_sort_key),
+                ColumnSpec('specification', '规格'),
+            ]
+        # 选中集合按 cargo_id 记录, 分页与连续滚动模型共用
+        self.selection = SelectionStore(self)
+        self.table_model = RecordTableModel(columns, id_key='cargo_id', checkable=True, selection=self.selection,
+                                            parent=self)
+        # 点击表头排序与文本过滤只作用于已加载的数据
+        self.proxy_model = RecordSortFilterProxyModel(self.table_model, self)
+        self.filter_input.textChanged.connect(self.proxy_model.set_filter_text)
+        self.table_view = create_table_view(self, self.proxy_model, show_row_numbers=True, sortable=True)
+        # 搜索结果较多时分批填充, 填充期间界面保持响应
+        self.populator = IncrementalPopulator(self.table_view, self.table_model, self.proxy_model, self)
+        self.populator.progress.connect(lambda value, total: update_progress_bar(self.progress_bar, value, total))
+        self.populator.finished.connect(lambda: self.progress_bar.setVisible(False))
+        # 连续滚动模式的模型, 与分页模式共用数据源与页缓存
+        self.lazy_model = LazyRecordTableModel(columns, self.source, id_key='cargo_id', checkable=True,
+                                               selection=self.selection, parent=self)
+        self.lazy_model.loading_changed.connect(self.set_loading)
+        self.lazy_model.load_failed.connect(
+            lambda message: InfoBar.warning(title='获取数据失败', content=message, parent=self, duration=5000))
+        attach_infinite_scroll(self.table_view, self.lazy_model)
+
+        layout.addWidget(self.table_view)
 
         # 创建分页布局
         self.paginationWidget = QWidget(self)
@@ -139,6 +207,18 @@ class InventoryInterface(QWidget):
         self.setStyleSheet("InventoryInterface {background-color:white;}")
         self.resize(1280, 760)
 
+    def on_reference_data_changed(self, name: str):
+        """类别列表发生变化时重新填充分类选框, 保留当前选中项且不触发重新加载"""
+        if name != 'categories':
+            return
+        current = self.categoriesComboBox.currentText()
+        self.categoriesComboBox.blockSignals(True)
+        self.categoriesComboBox.clear()
+        self.categoriesComboBox.addItem('所有类别', None)
+        self.categoriesComboBox.addItems(load_categories() or [])
+        self.categoriesComboBox.setCurrentText(current)
+        self.categoriesComboBox.blockSignals(False)
+
     def exec_operations(self):
         index = self.operationsComboBox.currentIndex()
         match index:
@@ -147,54 +227,100 @@ class InventoryInterface(QWidget):
             case 2:
                 self.batch_delete_inventory()
             case 3:
-                ids = self.get_selected_inventory_ids()
-                if len(ids) != 0:
-                    for cargo_id in ids:
-                        self.update_inventory(cargo_id)
-                else:
-                    InfoBar.warning(title='操作失败', content='请先选择要编辑的条目', parent=self, duration=4000)
+                self.batch_edit_inventory()
             case 4:
                 self.export_to_excel()
             case 5:
                 self.import_from_excel()
+            case 6:
+                self.select_all_matching()
+            case 7:
+                self.selection.clear()
         self.operationsComboBox.setCurrentIndex(0)
 
-    def get_count(self):
-        """获取数据的总量或者分类数据的总量，用于设置分页控制器"""
-        try:
-            url = URL + '/inventory/count'
-            if self.categoriesComboBox.currentIndex() != 0:
-                # 当分类选框有实际选中时，构造带参的url参数为category=被选中的分类Text
-                url += '?category=' + self.categoriesComboBox.currentText()
-            response = Worker.unpack_thread_queue(APIClient.get_request, url)
-            count = response['count']
-            return count
-        except Exception as e:
-            error_logger.error(f'inventoryInterface.get_count: {e}')
+    def set_loading(self, loading: bool):
+        """切换加载状态, 加载期间禁用搜索、操作与翻页按钮"""
+        set_loading_state(self.loading_bar, loading, self.categoriesComboBox, self.searchButton, self.execBtn,
+                          self.prevButton, self.nextButton)
+
+    def start_request(self) -> int:
+        """开始一次新的加载并返回请求序号, 之前尚未返回的请求结果将被丢弃, 尚未完成的分批填充也会停止"""
+        self.populator.cancel()
+        self.load_seq += 1
+        self.set_loading(True)
+        return self.load_seq
+
+    def finish_request(self, seq: int) -> bool:
+        """请求返回时调用, 如果该请求已被更新的请求取代则返回 False"""
+        if seq != self.load_seq:
+            return False
+        self.set_loading(False)
+        self.update_pagination_controls()
+        return True
+
+    def on_request_failed(self, seq: int, error: Exception, source: str):
+        if self.finish_request(seq):
+            InfoBar.error(title='服务器状态异常', content='无法连接到后端服务器', parent=self, duration=5000)
+        error_logger.error(f'inventoryInterface.{source}: {error}')
+
+    def get_filter_params(self) -> dict:
+        """当前的分类过滤条件, 分类选框为全部类别时为空"""
+        if self.categoriesComboBox.currentIndex() != 0:
+            return {'category': self.categoriesComboBox.currentText()}
+        return {}
+
+    @staticmethod
+    def build_count_url(params: dict) -> str:
+        """获取数据的总量或者分类数据的总量的url，用于设置分页控制器"""
+        url = URL + '/inventory/count'
+        if params.get('category'):
+            # 当分类选框有实际选中时，构造带参的url参数为category=被选中的分类Text
+            url += '?category=' + params['category']
+        return url
+
+    @staticmethod
+    def build_page_url(page: int, params: dict) -> str:
+        url = f'{URL}/inventory/page/{page}'
+        if params.get('category'):
+            url += '?category=' + params['category']
+        return url
+
+    @staticmethod
+    def parse_count(response) -> int:
+        if isinstance(response, dict):
+            return response.get('count') or 0
+        return 0
 
     def load_data(self):
+        """非阻塞地从后端获取数据, 总量与页数据并发请求, 总量在翻页之间复用"""
+        self.set_search_url(None)
+        if self.infinite_scroll:
+            # 丢弃尚未返回的分页请求, 由连续滚动模型从第一页开始加载
+            self.populator.cancel()
+            self.load_seq += 1
+            self.set_table_model(self.lazy_model)
+            self.hide_pagination(False)
+            self.lazy_model.reset(self.get_filter_params())
+            return
+        seq = self.start_request()
+        self.source.fetch(self.current_page, self.get_filter_params(),
+                          callback=lambda page_result: self.on_page_loaded(seq, page_result),
+                          error_callback=lambda e: self.on_request_failed(seq, e, 'load_data'))
+
+    def on_page_loaded(self, seq: int, page_result: dict):
+        if seq != self.load_seq:
+            return
+        self.total_pages = page_result['total_pages']
+        self.finish_request(seq)
+        result = page_result['response']
         try:
-            # 从后端获取数据
-            url = f'{URL}/inventory/page/{self.current_page}'
-            if self.categoriesComboBox.currentIndex() == 0:
-                # 分类选框为全部类别时的分页控制器
-                count = self.get_count()
-                if count != 0:
-                    self.total_pages = math.ceil(count / self.per_page)
-                else:
-                    self.total_pages = 1
-                self.update_pagination_controls()
-                result = Worker.unpack_thread_queue(APIClient.get_request, url)
-            else:
-                # 当分类被选中时，构造带参url
-                url += '?category=' + self.categoriesComboBox.currentText()
-                result = Worker.unpack_thread_queue(APIClient.get_request, url)
-                self.update_pagination_controls()
             # 判断返回值类型
             if isinstance(result, (dict, list)):  # 有效 JSON
                 if result['success'] is True:  # 有数据
                     self.inventories = result['data']
-                    self.populate_table()
+                    self.populate_table(refresh=seq == self.refresh_seq)
+                    # 渲染完成后在后台预取相邻页, 翻页时直接命中缓存
+                    self.source.prefetch_adjacent(self.current_page, self.total_pages, self.get_filter_params())
                 else:
                     InfoBar.warning(title='获取数据失败', content=result['message'], parent=self, duration=5000)
             elif isinstance(result, str):  # 错误信息
@@ -219,30 +345,35 @@ class InventoryInterface(QWidget):
             self.prevButton.setDisabled(True)
             self.nextButton.setDisabled(True)
 
-    def populate_table(self):
-        """生成表格, 遍历从后端获取的数据并逐行填入到表格中"""
-        self.table_widget.setRowCount(len(self.inventories))
-        for row, inventory_info in enumerate(self.inventories):
-            self.setup_table_row(row, inventory_info)
-
-    def setup_table_row(self, row: int, inventory_info: dict):
-        # 将多选框绘制到每行的首列
-        checkbox = CheckBox()
-        self.table_widget.setCellWidget(row, 0, checkbox)
-        # ['cargo_id', 'cargo_name', 'model', 'categories', 'count', 'price', 'total_price']
-        for col, key in enumerate(self.enm_header):
-            value = inventory_info.get(key, '')
-            # 单元格赋值
-            item = QTableWidgetItem(str(value))
-            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
-            self.table_widget.setItem(row, col + 1, item)  #注意：第一列是多选框，所以在赋值时从第二列开始
-        if self.permission != 'W':
-            # 为每行添加编辑按钮
-            action_widget = create_btn_widget(
-                callback=lambda: self.update_inventory(inventory_info['cargo_id'])
-            )
-            self.table_widget.setCellWidget(row, self.column_count - 1, action_widget)  # 将组件添加到每行的最后一列
+    def populate_table(self, refresh: bool = False):
+        """
+        将从后端获取的数据交给表格模型, 单元格内容在绘制时按需生成; 数据量较大时分批插入
+        :param refresh: 数据变更后的刷新, 按主键比较后只更新变化的行, 保持滚动位置与选中状态
+        """
+        self.set_table_model(self.proxy_model)
+        if refresh:
+            self.table_model.update_records(self.inventories)
+        else:
+            self.populator.populate(self.inventories)
+
+    def refresh_data(self):
+        """新增、修改、删除数据后调用: 丢弃缓存并重新获取当前页, 结果与表格中的数据比较后更新"""
+        self.source.invalidate()
+        self.load_data()
+        self.refresh_seq = self.load_seq
+
+    def set_table_model(self, model):
+        """切换表格使用的模型(分页或连续滚动); 连续滚动模式不支持客户端排序与过滤"""
+        if self.table_view.model() is not model:
+            self.table_view.setModel(model)
+            sortable = model is self.proxy_model
+            self.table_view.setSortingEnabled(sortable)
+            self.filter_input.setEnabled(sortable)
+
+    def on_scroll_mode_changed(self, checked: bool):
+        self.infinite_scroll = checked
+        self.current_page = 1
+        self.load_data()
 
     def update_inventory(self, cargo_id: str):
         try:
@@ -250,18 +381,23 @@ class InventoryInterface(QWidget):
             if dialog.exec():
                 new_inventory_info = dialog.get_inventory_info()
                 url = f'{URL}/inventory/update/{cargo_id}'
-                #response = APIClient.post_request(f'http://127.0.0.1:5000/inventory/update/{cargo_id}', new_inventory_info)
-                response = Worker.unpack_thread_queue(APIClient.post_request, url, new_inventory_info)
-                if response.get('success'):
-                    InfoBar.success(title='操作成功', content=response.get('message'), parent=self, duration=4000)
-                    self.load_data()
-                    self.populate_table()
-                else:
-                    InfoBar.error(title='操作失败', content=response.get('message'), parent=self, duration=4000)
+                # 先修改表格中的对应行, 请求在后台执行, 失败时回滚
+                model = self.lazy_model if self.infinite_scroll else self.table_model
+                optimistic_update(model, cargo_id, new_inventory_info, APIClient.post_request, url, new_inventory_info,
+                                  on_success=self.on_update_succeeded, on_failure=self.on_update_failed)
         except Exception as e:
             InfoBar.error(title='操作失败', content=str(e), parent=self, duration=4000)
             error_logger.error(f'inventoryInterface.update_inventory: {str(e)}')
 
+    def on_update_succeeded(self, response: dict):
+        """乐观更新的请求成功后重新获取当前页, 与后端数据对账"""
+        InfoBar.success(title='操作成功', content=response.get('message'), parent=self, duration=4000)
+        ReferenceDataStore.instance().invalidate('categories')
+        self.refresh_data()
+
+    def on_update_failed(self, message: str):
+        InfoBar.error(title='操作失败', content=f'{message}, 已撤销表格中的修改', parent=self, duration=4000)
+
     def add_inventory(self):
         """添加库存记录"""
         try:
@@ -269,21 +405,35 @@ class InventoryInterface(QWidget):
             if dialog.exec():
                 inventory_info = dialog.get_inventory_info()
                 url = f'{URL}/inventory/create'
-                response = Worker.unpack_thread_queue(APIClient.post_request, url, inventory_info)
-                if response.get('success'):
-                    InfoBar.success(title='操作成功', content=response.get('message'), parent=self, duration=4000)
-                    self.load_data()
-                    self.populate_table()
-                else:
-                    InfoBar.error(title='操作失败', content=response.get('message'), parent=self, duration=4000)
+                self.set_loading(True)
+                Worker.run_async(APIClient.post_request, url, inventory_info, callback=self.on_inventory_added,
+                                 error_callback=lambda e: self.on_action_failed('add_inventory', e))
         except Exception as e:
             InfoBar.error(title='操作失败', content=str(e), parent=self, duration=4000)
             error_logger.error(f'inventoryInterface.add_inventory: {str(e)}')
 
+    def on_inventory_added(self, response):
+        self.set_loading(False)
+        if isinstance(response, dict) and response.get('success'):
+            InfoBar.success(title='操作成功', content=response.get('message'), parent=self, duration=4000)
+            ReferenceDataStore.instance().invalidate('categories')
+            self.refresh_data()
+        else:
+            message = response.get('message') if isinstance(response, dict) else str(response)
+            InfoBar.error(title='操作失败', content=message, parent=self, duration=4000)
+
+    def on_action_failed(self, source: str, error: Exception):
+        """新增、删除、导出等后台请求失败时恢复按钮状态并提示"""
+        self.set_loading(False)
+        InfoBar.error(title='操作失败', content=str(error), parent=self, duration=4000)
+        error_logger.error(f'inventoryInterface.{source}: {error}')
+
     def batch_delete_inventory(self):
         """批量删除"""
+        self.with_selected_inventory_ids(self.delete_inventories)
+
+    def delete_inventories(self, selected_inventory_ids: list):
         try:
-            selected_inventory_ids = self.get_selected_inventory_ids()
             if not selected_inventory_ids:
                 InfoBar.warning(title='删除失败', content='请先选中要删除的条目', parent=self, duration=4000)
                 return
@@ -292,99 +442,137 @@ class InventoryInterface(QWidget):
                 if w.exec():
                     url = f'{URL}/inventory/delete'
                     #response = APIClient.delete_request('http://127.0.0.1:5000/inventory/delete', selected_inventory_ids)
-                    response = Worker.unpack_thread_queue(APIClient.delete_request, url, selected_inventory_ids)
-                    if response.get('success'):
-                        InfoBar.success(title='操作成功', content=response.get('message'), parent=self, duration=4000)
-                        self.load_data()
-                        self.populate_table()
-                    else:
-                        InfoBar.error(title='操作失败', content=response.get('error'), parent=self, duration=4000)
+                    self.set_loading(True)
+                    Worker.run_async(APIClient.delete_request, url, [str(cargo_id) for cargo_id in selected_inventory_ids],
+                                     callback=self.on_inventories_deleted,
+                                     error_callback=lambda e: self.on_action_failed('batch_delete_inventory', e))
         except Exception as e:
             InfoBar.error(title='操作失败', content=str(e), parent=self, duration=4000)
             error_logger.error(f'inventoryInterface.batch_delete_inventory: {str(e)}')
 
+    def on_inventories_deleted(self, response):
+        self.set_loading(False)
+        if isinstance(response, dict) and response.get('success'):
+            InfoBar.success(title='操作成功', content=response.get('message'), parent=self, duration=4000)
+            self.selection.clear()
+            ReferenceDataStore.instance().invalidate('categories')
+            self.refresh_data()
+        else:
+            message = response.get('error') if isinstance(response, dict) else str(response)
+            InfoBar.error(title='操作失败', content=message, parent=self, duration=4000)
+
+    def batch_edit_inventory(self):
+        """依次打开选中条目的编辑对话框; 选中全部匹配结果或超过 BATCH_EDIT_MAX 条时不逐条编辑"""
+        if self.selection.all_matching:
+            InfoBar.warning(title='无法批量编辑', content='已选中全部匹配结果, 请勾选需要编辑的条目后再试',
+                            parent=self, duration=4000)
+            return
+        ids = self.selection.selected_ids()
+        if len(ids) == 0:
+            InfoBar.warning(title='操作失败', content='请先选择要编辑的条目', parent=self, duration=4000)
+        elif len(ids) > BATCH_EDIT_MAX:
+            InfoBar.warning(title='无法批量编辑',
+                            content=f'一次最多编辑 {BATCH_EDIT_MAX} 个条目, 当前选中了 {len(ids)} 个',
+                            parent=self, duration=4000)
+        else:
+            for cargo_id in ids:
+                self.update_inventory(cargo_id)
+
+    def with_selected_inventory_ids(self, callback):
+        """以被选中的 cargo_id 列表调用 callback, 选中全部匹配结果时先在后台向后端查询全部匹配的条目"""
+        self.selection.resolve_async(self.resolve_matching_ids, callback)
+
+    def matching_url(self) -> str:
+        """返回当前过滤条件下全部匹配条目的 URL"""
+        if self.search_url:
+            return self.search_url
+        category = self.get_filter_params().get('category')
+        return f'{URL}/inventory/all?category={category}' if category else URL + '/inventory/all'
+
+    def set_search_url(self, url):
+        self.search_url = url
+        # 过滤条件变化后, 之前的"选中全部匹配结果"不再对应当前结果
+        if self.selection.all_matching and self.selection.filter_key != self.matching_url():
+            self.selection.clear()
+
+    def select_all_matching(self):
+        """选中当前过滤条件下的全部条目, 包括尚未加载的页"""
+        if self.search_url:
+            count = len(self.inventories)
+        else:
+            count = self.source.cached_count(self.get_filter_params()) or 0
+        self.selection.select_all_matching(self.matching_url(), count)
+        InfoBar.success(title='已选中', content=f'已选中全部 {count} 条匹配记录', parent=self, duration=4000)
+
+    def resolve_matching_ids(self, url: str, on_resolved):
+        """
+        在后台查询全部匹配的条目, 完成后以 cargo_id 列表调用 on_resolved
+        url 为当前过滤条件对应的后端查询(按类别或搜索条件), 由后端完成筛选
+        """
+        self.set_loading(True)
+
+        def finished(response):
+            self.set_loading(False)
+            if not isinstance(response, dict) or response.get('success') is not True:
+                InfoBar.error(title='操作失败', content='无法获取匹配的条目', parent=self, duration=4000)
+                return
+            on_resolved([inventory['cargo_id'] for inventory in response.get('data') or []])
 
-    def get_selected_inventory_ids(self) -> list:
-        """获取并返回多选框被选中的数据的cargo_id"""
-        selected_inventory_ids = []
-        for row in range(self.table_widget.rowCount()):
-            checkbox = self.table_widget.cellWidget(row, 0)
-            if checkbox.isChecked():
-                cargo_id = str(self.table_widget.item(row, 1).text())
-                selected_inventory_ids.append(cargo_id)
+        def failed(e):
+            self.set_loading(False)
+            InfoBar.error(title='操作失败', content='无法获取匹配的条目', parent=self, duration=4000)
+            error_logger.error(f'inventoryInterface.resolve_matching_ids: {e}')
 
-        return selected_inventory_ids
+        Worker.run_async(APIClient.get_request, url, callback=finished, error_callback=failed)
 
     def search_inventories(self):
+        cargo_name = self.cargo_name_input.text()
+        model = self.model_input.text()
+        if not cargo_name and not model:
+            self.current_page = 1
+            self.load_data()
+            self.hide_pagination(not self.infinite_scroll)
+        else:
+            url = f"{URL}/inventory/search?"
+            if cargo_name:
+                url += f"cargo_name={cargo_name}"
+            if model:
+                url += f"&model={model}"
+            self.categoriesComboBox.setCurrentIndex(0)
+            self.set_search_url(url)
+            seq = self.start_request()
+            Worker.run_async(APIClient.get_request, url,
+                             callback=lambda response: self.on_search_finished(seq, response),
+                             error_callback=lambda e: self.on_request_failed(seq, e, 'search_inventories'))
+
+    def on_search_finished(self, seq: int, response):
+        if not self.finish_request(seq):
+            return
         try:
-            cargo_name = self.cargo_name_input.text()
-            model = self.model_input.text()
-            if not cargo_name and not model:
-                self.load_data()
+            if response.get('success'):
+                self.inventories = compacted_copy(response.get('data'))
                 self.populate_table()
-                self.current_page = 1
-                self.update_pagination_controls()
-                self.hide_pagination(True)
+                self.hide_pagination(False)
             else:
-                url = f"{URL}/inventory/search?"
-                if cargo_name:
-                    url += f"cargo_name={cargo_name}"
-                if model:
-                    url += f"&model={model}"
-                self.categoriesComboBox.setCurrentIndex(0)
-                # response = APIClient.get_request(url)
-                response = Worker.unpack_thread_queue(APIClient.get_request, url)
-
-                if response.get('success'):
-                    self.inventories = response.get('data')
-                    self.populate_table()
-                    self.categoriesComboBox.setCurrentIndex(0)
-                    self.hide_pagination(False)
-                else:
-                    InfoBar.warning(title='操作失败', content=response.get('message'), parent=self, duration=4000)
-                    self.categoriesComboBox.setCurrentIndex(0)
+                InfoBar.warning(title='操作失败', content=response.get('message'), parent=self, duration=4000)
         except Exception as e:
             InfoBar.error(title='操作失败', content=str(e), parent=self, duration=4000)
             error_logger.error(f'inventoryInterface.search_inventories: {str(e)}')
 
     def on_category_selected(self):
-        """当分类栏中有项目被选中时的操作"""
-        try:
-            category_page_count = self.get_count()
-            self.total_pages = math.ceil(category_page_count / self.per_page)
-            # 更新分页控制器
-            self.current_page = 1
-            self.update_pagination_controls()
-            index = self.categoriesComboBox.currentIndex()
-            if index == 0:
-                # 如果选中的index为0，即全部类别，显示全部数据，设置分页为初始状态
-                self.load_data()
-                self.populate_table()
-            else:
-                url = f"{URL}/inventory/search?category={self.categoriesComboBox.currentText()}"
-                # response = APIClient.get_request(url)
-                response = Worker.unpack_thread_queue(APIClient.get_request, url)
-                if response.get('success'):
-                    # print(response.get('data'))
-                    self.inventories = response.get('data')
-                    self.populate_table()
-                else:
-                    InfoBar.warning(title='操作失败', content=response.get('message'), parent=self, duration=4000)
-        except Exception as e:
-            InfoBar.error(title='操作失败', content=str(e), parent=self, duration=4000)
-            error_logger.error(f'inventoryInterface.search_inventories: {str(e)}')
+        """当分类栏中有项目被选中时, 回到第一页并按分类分页加载"""
+        self.current_page = 1
+        self.load_data()
 
     def load_prev_page(self):
         if self.current_page > 1:
             self.current_page -= 1
             self.load_data()
-            self.populate_table()
 
     def load_next_page(self):
         if self.current_page < self.total_pages:
             self.current_page += 1
             self.load_data()
-            self.populate_table()
 
     def hide_pagination(self, res):
         self.paginationWidget.setVisible(res)
@@ -399,42 +587,58 @@ class InventoryInterface(QWidget):
                 else:
                     url = f'{URL}/inventory/all?category={category}'
                 # response = APIClient.get_request(url)
-                response = Worker.unpack_thread_queue(APIClient.get_request, url)
-                if response.get('error'):
-                    InfoBar.warning(title='操作失败', content=response.get('error'), parent=self, duration=4000)
-                    return
-                if response.get('success') is False:
-                    InfoBar.warning(title='操作失败', content=response.get('message'), parent=self, duration=4000)
-                    return
+                self.set_loading(True)
+                Worker.run_async(APIClient.get_request, url,
+                                 callback=lambda response: self.on_export_data_loaded(category, response),
+                                 error_callback=lambda e: self.on_action_failed('export_to_excel', e))
+        except Exception as e:
+            InfoBar.error(title="操作失败", content=str(e), parent=self, duration=4000)
+            error_logger.error(f'inventoryInterface.export_to_excel: {str(e)}')
+
+    def on_export_data_loaded(self, category: str, response):
+        self.set_loading(False)
+        try:
+            if not isinstance(response, dict):
+                InfoBar.warning(title='操作失败', content=str(response), parent=self, duration=4000)
+                return
+            if response.get('error'):
+                InfoBar.warning(title='操作失败', content=response.get('error'), parent=self, duration=4000)
+                return
+            if response.get('success') is False:
+                InfoBar.warning(title='操作失败', content=response.get('message'), parent=self, duration=4000)
+                return
+            else:
+                # 导出的数据只读取一次, 直接使用响应体, 不再转换为 CompactRecord
+                exported_data = response.get('data')
+                date = datetime.today().strftime('%Y-%m-%d')
+                filename = f"{category}库存记录-{date}"
+                # openpyxl 导入较慢, 只在导出/导入 Excel 时才导入
+                import openpyxl
+                wb = openpyxl.Workbook()
+                ws = wb.active
+                ws.title = filename
+                # 写入表头
+                headers = ["货品编号", "货品名称", "型号", "类别", "数量", "单价", "规格", "总价"]
+                ws.append(headers)
+                # 写入库存信息
+                for inventory in exported_data:
+                    row = [
+                        inventory['cargo_id'],
+                        inventory['cargo_name'],
+                        inventory['model'],
+                        inventory['categories'],
+                        inventory['count'],
+                        inventory['price'],
+                        inventory['specification'],
+                        inventory['total_price']
+                    ]
+                    ws.append(row)
+                file_path, _ = QFileDialog.getSaveFileName(self, "保存文件", f"{filename}.xlsx", "Excel Files (*.xlsx)")
+                if file_path:
+                    wb.save(file_path)
+                    InfoBar.success(title="操作成功", content="已成功导出数据为Excel文件", parent=self, duration=4000)
                 else:
-                    exported_data = response.get('data')
-                    date = datetime.today().strftime('%Y-%m-%d')
-                    filename = f"{category}库存记录-{date}"
-                    wb = openpyxl.Workbook()
-                    ws = wb.active
-                    ws.title = filename
-                    # 写入表头
-                    headers = ["货品编号", "货品名称", "型号", "类别", "数量", "单价", "规格", "总价"]
-                    ws.append(headers)
-                    # 写入库存信息
-                    for inventory in exported_data:
-                        row = [
-                            inventory['cargo_id'],
-                            inventory['cargo_name'],
-                            inventory['model'],
-                            inventory['categories'],
-                            inventory['count'],
-                            inventory['price'],
-                            inventory['specification'],
-                            inventory['total_price']
-                        ]
-                        ws.append(row)
-                    file_path, _ = QFileDialog.getSaveFileName(self, "保存文件", f"{filename}.xlsx", "Excel Files (*.xlsx)")
-                    if file_path:
-                        wb.save(file_path)
-                        InfoBar.success(title="操作成功", content="已成功导出数据为Excel文件", parent=self, duration=4000)
-                    else:
-                        InfoBar.warning(title="操作失败", content="操作被终止", parent=self, duration=4000)
+                    InfoBar.warning(title="操作失败", content="操作被终止", parent=self, duration=4000)
         except Exception as e:
             InfoBar.error(title="操作失败", content=str(e), parent=self, duration=4000)
             error_logger.error(f'inventoryInterface.export_to_excel: {str(e)}')
@@ -446,6 +650,7 @@ class InventoryInterface(QWidget):
                 InfoBar.warning("操作取消", "用户终止了导入操作", parent=self, duration=4000)
                 return
             else:
+                import openpyxl
                 wb = openpyxl.load_workbook(filename=file_path)
                 ws = wb.active
                 expected_header = ["货品编号", "货品名称", "型号", "类别", "数量", "单价", "规格", "总价"]
@@ -478,7 +683,7 @@ class InventoryInterface(QWidget):
                     posted_data = {
                         "dataset": dataset
                     }
-                    response = Worker.unpack_thread_queue(APIClient.post_request, url, posted_data)
+                    response = Worker.unpack_thread_queue(APIClient.post_request, url, posted_data, compress=True)
                     res = response.get('success')
                     skipped_row_backend = response.get('skipped_row')
                     skipped_row.append(skipped_row_backend)
@@ -488,9 +693,10 @@ class InventoryInterface(QWidget):
                         imported_count = int(response.get("imported"))
                         skipped_count += int(response.get("skipped"))
                         InfoBar.success(title="导入成功", content=f"导入了 {imported_count} 条, 忽略了 {skipped_count} 条, 被忽略的条目为: {skipped_row}", parent=self, duration=5000)
+                        ReferenceDataStore.instance().invalidate('categories')
+                        self.source.invalidate()
                         self.current_page = 1
                         self.load_data()
-                        self.populate_table()
         except Exception as e:
             InfoBar.error(title="操作失败", content=str(e), parent=self, duration=5000)
             error_logger.error(f'inventoryInterface.import_from_excel: {str(e)}')
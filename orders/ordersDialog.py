@@ -9,6 +9,7 @@ from utils.functional_utils import convert_date_to_chinese
 from config import URL
 from backendRequests.jsonRequests import APIClient
 from utils.worker import Worker
+from utils.ui_components import create_loading_bar, set_loading_state
 
 
 class BaseOrderDialog(MessageBoxBase):
@@ -164,10 +165,21 @@ class UpdateOrderDialog(BaseOrderDialog):
         self.set_order_info()
 
     def set_order_info(self):
+        """非阻塞地获取订单信息, 返回前显示加载状态并禁用确定按钮"""
+        self.loading_bar = create_loading_bar(self)
+        self.viewLayout.insertWidget(1, self.loading_bar)
+        set_loading_state(self.loading_bar, True, self.yesButton)
+        url = URL + f'/orders/{self.order_id}'
+        Worker.run_async(APIClient.get_request, url, callback=self.on_order_info_loaded,
+                         error_callback=self.on_order_info_failed)
+
+    def on_order_info_failed(self, error: Exception):
+        set_loading_state(self.loading_bar, False, self.yesButton)
+        InfoBar.error(title='系统异常', content=str(error), parent=self, duration=5000)
+
+    def on_order_info_loaded(self, response):
+        set_loading_state(self.loading_bar, False, self.yesButton)
         try:
-            url = URL + f'/orders/{self.order_id}'
-            # response = APIClient.get_request(url)
-            response = Worker.unpack_thread_queue(APIClient.get_request, url)
             if response['success'] is True:
                 data = response['data']
                 # print(data)
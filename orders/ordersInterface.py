@@ -2,22 +2,32 @@ import math
 import sys
 from datetime import datetime
 
-import openpyxl
 import requests
-from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QHeaderView, QApplication, QTableWidgetItem, QFileDialog
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QHeaderView, QApplication, QFileDialog
 from qfluentwidgets import CardWidget, StrongBodyLabel, ComboBox, LineEdit, PushButton, setCustomStyleSheet, \
-    TableWidget, SmoothMode, PrimaryPushButton, InfoBar, CheckBox
+    PrimaryPushButton, InfoBar, SwitchButton
 
 from urllib.parse import urlencode
 from utils.worker import Worker
 from backendRequests.jsonRequests import APIClient
+from backendRequests.paginatedSource import PaginatedSource
+from backendRequests.bootstrap import BootstrapPrefetch
 from utils.custom_styles import ADD_BUTTON_STYLE
 from utils.db_utils import load_categories
-from config import URL
+from utils.reference_data import ReferenceDataStore
+from config import URL, INFINITE_SCROLL_DEFAULT, BATCH_EDIT_MAX
 from orders.ordersDialog import AddOrderDialog, UpdateOrderDialog
+from orders.ordersTableModel import OrdersTableModel, ORDER_COLUMNS
 from utils.functional_utils import convert_date_to_chinese
+from utils.record_store import compacted_copy
+from utils.optimistic import optimistic_insert, optimistic_update
 from utils.app_logger import get_logger
+from utils.table_model import LazyRecordTableModel
+from utils.sort_filter_proxy import RecordSortFilterProxyModel
+from utils.selection_store import SelectionStore
+from utils.ui_components import create_loading_bar, set_loading_state, create_table_view, attach_infinite_scroll, \
+    create_progress_bar, update_progress_bar
+from utils.incremental_populator import IncrementalPopulator
 
 error_logger = get_logger(logger_name='error_logger', log_file='error.log')
 
@@ -35,6 +45,25 @@ class OrdersInterface(QWidget):
         self.current_page = 1
         self.per_page = 20
         self.total_pages = 1
+        # 是否使用连续滚动模式代替翻页
+        self.infinite_scroll = INFINITE_SCROLL_DEFAULT
+
+        # 当前显示的搜索结果对应的 URL, 为 None 时显示全部订单
+        self.search_url = None
+
+        # 最近一次加载请求的序号, 用于丢弃过期的返回结果
+        self.load_seq = 0
+        # 数据变更后发起的刷新请求的序号, 其结果按主键与当前数据比较后更新
+        self.refresh_seq = 0
+        # 分页数据源, 并发获取总量与页数据
+        self.source = PaginatedSource(
+            count_url=lambda params: URL + '/orders/count',
+            page_url=lambda page, params: URL + f'/orders/page/{page}',
+            count_parser=self.parse_count,
+            per_page=self.per_page
+        )
+        # 登录后已预取的首页数据与总量直接写入缓存, 首次加载无需等待后端
+        BootstrapPrefetch.seed_source(self.source)
 
         self.setup_ui()
         self.load_data()
@@ -52,7 +81,8 @@ class OrdersInterface(QWidget):
         self.categoriesComboBox = ComboBox(self)
         self.categoriesComboBox.setFixedWidth(130)
         self.categoriesComboBox.addItem('所有类别')
-        self.categoriesComboBox.addItems(load_categories())
+        self.categoriesComboBox.addItems(load_categories() or [])
+        ReferenceDataStore.instance().changed.connect(self.on_reference_data_changed)
         #self.categoriesComboBox.currentIndexChanged.connect(self.on_category_selected)
 
         self.typeComboBox = ComboBox(self)
@@ -75,12 +105,25 @@ class OrdersInterface(QWidget):
         self.searchButton2 = PushButton('搜索', self)
         self.searchButton2.clicked.connect(self.search_orders_by_id)
 
+        # 在已加载的数据中即时过滤, 不请求后端
+        self.filter_input = LineEdit(self)
+        self.filter_input.setPlaceholderText('筛选当前数据')
+        self.filter_input.setClearButtonEnabled(True)
+        self.filter_input.setFixedWidth(150)
+
+        self.scroll_mode_switch = SwitchButton(self)
+        self.scroll_mode_switch.setOnText('连续滚动')
+        self.scroll_mode_switch.setOffText('分页显示')
+        self.scroll_mode_switch.setChecked(self.infinite_scroll)
+        self.scroll_mode_switch.checkedChanged.connect(self.on_scroll_mode_changed)
+
         self.operations_label = StrongBodyLabel(self)
         self.operations_label.setText('执行操作: ')
         self.operationsComboBox = ComboBox(self)
         self.operationsComboBox.setFixedWidth(150)
         self.operationsComboBox.addItems(
-            ['---------------', '新增记录', '批量删除', '批量编辑', '导出为Excel', '从Excel中导入'])
+            ['---------------', '新增记录', '批量删除', '批量编辑', '导出为Excel', '从Excel中导入',
+             '选中全部匹配结果', '取消选中'])
         self.execBtn = PushButton('执行', self)
         setCustomStyleSheet(self.execBtn, ADD_BUTTON_STYLE, ADD_BUTTON_STYLE)
         self.execBtn.clicked.connect(self.exec_operations)
@@ -99,30 +142,44 @@ class OrdersInterface(QWidget):
 
         buttons_layout.addStretch(1)
 
+        buttons_layout.addWidget(self.filter_input)
+
+        buttons_layout.addWidget(self.scroll_mode_switch)
         buttons_layout.addWidget(self.operations_label)
         buttons_layout.addWidget(self.operationsComboBox)
         buttons_layout.addWidget(self.execBtn)
 
         layout.addWidget(card_widget)
 
-        # 添加Table
-        self.table_widget = TableWidget(self)
-        self.table_widget.setBorderRadius(8)
-        self.table_widget.setBorderVisible(True)
-        self.table_widget.verticalHeader().setVisible(False)  # 不显示行号
-        self.table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.table_widget.scrollDelagate.verticalSmoothScroll.setSmoothMode(SmoothMode.NO_SMOOTH)
-
-        # 设置表头
-        self.table_widget.setColumnCount(17)
-        self.table_widget.setHorizontalHeaderLabels(
-            ["", "单号", "类型", "货品id", "货品名称", "型号", "类别", "供应商", "归属项目", "状态", "经办人",
-             "提交日期", "审核日期", "单价",  "数量", "规格", "总价"])
-
-        # self.custom_header = CustomHeaderView(orientation=Qt.Orientation.Horizontal, parent=self.table_widget)
-        # self.table_widget.setHorizontalHeader(self.custom_header)
+        # 加载状态进度条
+        self.loading_bar = create_loading_bar(self)
+        layout.addWidget(self.loading_bar)
+        # 大量搜索结果分批填充时的进度条
+        self.progress_bar = create_progress_bar(self)
+        layout.addWidget(self.progress_bar)
+
+        # 添加Table, 数据由模型提供, 视图只绘制可见行
+        # 选中集合按 order_id 记录, 分页与连续滚动模型共用
+        self.selection = SelectionStore(self)
+        self.table_model = OrdersTableModel(self.selection, self)
+        # 点击表头排序与文本过滤只作用于已加载的数据
+        self.proxy_model = RecordSortFilterProxyModel(self.table_model, self)
+        self.filter_input.textChanged.connect(self.proxy_model.set_filter_text)
+        self.table_view = create_table_view(self, self.proxy_model, sortable=True)
+        # 搜索结果较多时分批填充, 填充期间界面保持响应
+        self.populator = IncrementalPopulator(self.table_view, self.table_model, self.proxy_model, self)
+        self.populator.progress.connect(lambda value, total: update_progress_bar(self.progress_bar, value, total))
+        self.populator.finished.connect(lambda: self.progress_bar.setVisible(False))
+        self.adjust_column_widths()
+        # 连续滚动模式的模型, 与分页模式共用数据源与页缓存
+        self.lazy_model = LazyRecordTableModel(ORDER_COLUMNS, self.source, id_key='order_id', checkable=True,
+                                               selection=self.selection, parent=self)
+        self.lazy_model.loading_changed.connect(self.set_loading)
+        self.lazy_model.load_failed.connect(
+            lambda message: InfoBar.warning(title='获取数据失败', content=message, parent=self, duration=5000))
+        attach_infinite_scroll(self.table_view, self.lazy_model)
 
-        layout.addWidget(self.table_widget)
+        layout.addWidget(self.table_view)
 
         # 创建分页布局
         self.paginationWidget = QWidget(self)
@@ -151,31 +208,78 @@ class OrdersInterface(QWidget):
             '出库': 'outbound'
         }
 
-    def get_count(self):
-        url = URL + '/orders/count'
-        try:
-            response = Worker.unpack_thread_queue(APIClient.get_request, url)
-            if response.get("success") is True:
-                return response.get("data")
-            else:
-                return 0
-        except Exception as e:
-            error_logger.error(f'ordersInterface.get_count: {e}')
+    def on_reference_data_changed(self, name: str):
+        """类别列表发生变化时重新填充类别选框, 保留当前选中项"""
+        if name != 'categories':
+            return
+        current = self.categoriesComboBox.currentText()
+        self.categoriesComboBox.blockSignals(True)
+        self.categoriesComboBox.clear()
+        self.categoriesComboBox.addItem('所有类别')
+        self.categoriesComboBox.addItems(load_categories() or [])
+        self.categoriesComboBox.setCurrentText(current)
+        self.categoriesComboBox.blockSignals(False)
+
+    def set_loading(self, loading: bool):
+        """切换加载状态, 加载期间禁用搜索、操作与翻页按钮"""
+        set_loading_state(self.loading_bar, loading, self.searchButton1, self.searchButton2, self.execBtn,
+                          self.prevButton, self.nextButton)
+
+    def start_request(self) -> int:
+        """开始一次新的加载并返回请求序号, 之前尚未返回的请求结果将被丢弃, 尚未完成的分批填充也会停止"""
+        self.populator.cancel()
+        self.load_seq += 1
+        self.set_loading(True)
+        return self.load_seq
+
+    def finish_request(self, seq: int) -> bool:
+        """请求返回时调用, 如果该请求已被更新的请求取代则返回 False"""
+        if seq != self.load_seq:
+            return False
+        self.set_loading(False)
+        self.update_pagination_controls()
+        return True
+
+    def on_request_failed(self, seq: int, error: Exception, source: str):
+        if self.finish_request(seq):
+            InfoBar.error(title='服务器状态异常', content='无法连接到后端服务器', parent=self, duration=10000)
+        error_logger.error(f'ordersInterface.{source}: {error}')
+
+    @staticmethod
+    def parse_count(response) -> int:
+        if isinstance(response, dict) and response.get('success') is True:
+            return response.get('data') or 0
+        return 0
 
     def load_data(self):
+        """非阻塞地获取当前页数据, 总量与页数据并发请求, 总量在翻页之间复用"""
+        self.set_search_url(None)
+        if self.infinite_scroll:
+            # 丢弃尚未返回的分页请求, 由连续滚动模型从第一页开始加载
+            self.populator.cancel()
+            self.load_seq += 1
+            self.set_table_model(self.lazy_model)
+            self.hide_pagination(False)
+            self.lazy_model.reset()
+            return
+        seq = self.start_request()
+        self.source.fetch(self.current_page,
+                          callback=lambda page_result: self.on_page_loaded(seq, page_result),
+                          error_callback=lambda e: self.on_request_failed(seq, e, 'load_data'))
+
+    def on_page_loaded(self, seq: int, page_result: dict):
+        if seq != self.load_seq:
+            return
+        self.total_pages = page_result['total_pages']
+        self.finish_request(seq)
+        result = page_result['response']
         try:
-            url = URL + f'/orders/page/{self.current_page}'
-            # 分类选框为全部类别时的分页控制器
-            count = self.get_count()
-            self.total_pages = math.ceil(count / self.per_page) if count != 0 else 1
-            self.update_pagination_controls()
-            result = Worker.unpack_thread_queue(APIClient.get_request, url)
-
             if isinstance(result, (dict, list)):  # 有效 JSON
                 if result['success'] is True:  # 有数据
                     self.orders = result['data']
-                    self.populate_table()
-                    self.update_pagination_controls()
+                    self.populate_table(refresh=seq == self.refresh_seq)
+                    # 渲染完成后在后台预取相邻页, 翻页时直接命中缓存
+                    self.source.prefetch_adjacent(self.current_page, self.total_pages)
                 elif result['success'] is False:
                     InfoBar.warning(title='获取数据失败', content='无数据', parent=self, duration=5000)
             elif isinstance(result, str):  # 错误信息
@@ -185,82 +289,55 @@ class OrdersInterface(QWidget):
         except Exception as e:
             error_logger.error(f'ordersInterface.load_data: {e}')
 
-    def populate_table(self):
-        """生成表格, 遍历从后端获取的数据并逐行填入到表格中"""
-        self.table_widget.setRowCount(len(self.orders))
-        for row, order_info in enumerate(self.orders):
-            self.setup_table_row(row, order_info)
-        self.adjust_column_widths()
-
-    def setup_table_row(self, row: int, order_info: dict):
-        # 将多选框绘制到每行的首列
-        checkbox = CheckBox()
-        self.table_widget.setCellWidget(row, 0, checkbox)
-        order_info = self.reconstruct_data(order_info)
-        # ["", "单号", "类型", "货品id", "货品名称", "型号", "类别", "单价", "供应商", "归属项目", "状态", "经办人", "提交日期", "审核日期", "操作数量"]
-        for col, key in enumerate(
-                ['order_id', 'order_type', 'cargo_id', 'cargo_name', 'model', 'categories', 'provider',
-                 'project', 'status', 'employee_name', 'published_at', 'processed_at', 'price', 'count', 'specification', 'total_price']):
-            value = order_info.get(key, '')
-            # 单元格赋值
-            item = QTableWidgetItem(str(value))
-            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
-            self.table_widget.setItem(row, col + 1, item)  #注意：第一列是多选框，所以在赋值时从第二列开始
+    def populate_table(self, refresh: bool = False):
+        """
+        将从后端获取的数据交给表格模型, 单元格内容在绘制时按需生成; 数据量较大时分批插入
+        :param refresh: 数据变更后的刷新, 按主键比较后只更新变化的行, 保持滚动位置与选中状态
+        """
+        self.set_table_model(self.proxy_model)
+        if refresh:
+            self.table_model.update_records(self.orders)
+        else:
+            self.populator.populate(self.orders)
 
+    def refresh_data(self):
+        """新增、修改、删除数据后调用: 丢弃缓存并重新获取当前页, 结果与表格中的数据比较后更新"""
+        self.source.invalidate()
+        self.load_data()
+        self.refresh_seq = self.load_seq
+
+    def set_table_model(self, model):
+        """切换表格使用的模型(分页或连续滚动), 切换后重新设置列宽; 连续滚动模式不支持客户端排序与过滤"""
+        if self.table_view.model() is not model:
+            self.table_view.setModel(model)
+            self.adjust_column_widths()
+            sortable = model is self.proxy_model
+            self.table_view.setSortingEnabled(sortable)
+            self.filter_input.setEnabled(sortable)
+
+    def on_scroll_mode_changed(self, checked: bool):
+        self.infinite_scroll = checked
+        self.current_page = 1
+        self.load_data()
 
     def adjust_column_widths(self):
+        header = self.table_view.horizontalHeader()
         # 设置第一列（多选框列）为固定宽度
-        self.table_widget.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)
-        self.table_widget.setColumnWidth(0, 50)  # 第一列宽度固定为 50 像素
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)
+        self.table_view.setColumnWidth(0, 50)  # 第一列宽度固定为 50 像素
 
         # 设置第二列（order_id 列）为固定宽度
-        self.table_widget.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Fixed)
-        self.table_widget.setColumnWidth(1, 150)  # 第二列宽度固定为 150 像素
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Fixed)
+        self.table_view.setColumnWidth(1, 150)  # 第二列宽度固定为 150 像素
 
-        self.table_widget.horizontalHeader().setSectionResizeMode(14, QHeaderView.ResizeMode.Fixed)
-        self.table_widget.setColumnWidth(14, 10)
-        self.table_widget.horizontalHeader().setSectionResizeMode(15, QHeaderView.ResizeMode.Fixed)
-        self.table_widget.setColumnWidth(15, 10)
+        header.setSectionResizeMode(14, QHeaderView.ResizeMode.Fixed)
+        self.table_view.setColumnWidth(14, 10)
+        header.setSectionResizeMode(15, QHeaderView.ResizeMode.Fixed)
+        self.table_view.setColumnWidth(15, 10)
 
         # 让其他列自动调整宽度以适应表格大小
-        for col in range(2, self.table_widget.columnCount()):
-            self.table_widget.horizontalHeader().setSectionResizeMode(
-                col, QHeaderView.ResizeMode.Stretch
-            )
-
-    def reconstruct_data(self, data):
-        try:
-            order_type_mapping = {
-                "inbound": "入库",
-                "outbound": "出库"
-            }
-            status_mapping = {
-                "pass": "已完成",
-                "waiting": "待处理",
-                "reject": "已取消"
-            }
-            newData = {
-                "order_id": data['order_id'],
-                "order_type": order_type_mapping[data['order_type']],
-                "cargo_id": data['cargo_id'],
-                "cargo_name": data['cargo_name'],
-                "model": data['model'],
-                "categories": data['categories'],
-                "price": data['price'],
-                "provider": data['provider'],
-                "project": data['project'],
-                "status": status_mapping[data['status']],
-                "employee_name": data['employee_name'],
-                "published_at": convert_date_to_chinese(data['published_at']),
-                "processed_at": convert_date_to_chinese(data['processed_at']),
-                "count": data['count'],
-                "specification": data['specification'],
-                "total_price": data['total_price']
-            }
-            return newData
-        except Exception as e:
-            error_logger.error(f'ordersInterface.reconstruct_data: {e}')
+        for col in range(2, self.table_model.columnCount()):
+            header.setSectionResizeMode(col, QHeaderView.ResizeMode.Stretch)
 
     def print_reciept_action(self, order_id):
         """
@@ -268,11 +345,15 @@ class OrdersInterface(QWidget):
         :param order_id: 订单id
         :return:
         """
+        url = URL + f'/orders/print/{order_id}'
+        self.set_loading(True)
+        Worker.run_async(APIClient.get_request, url, is_stream=True,
+                         callback=lambda response: self.on_reciept_loaded(order_id, response),
+                         error_callback=lambda e: self.on_action_failed('print_reciept_action', e))
+
+    def on_reciept_loaded(self, order_id, response):
+        self.set_loading(False)
         try:
-            url = URL + f'/orders/print/{order_id}'
-            # response = APIClient.get_request(url, is_stream=True)
-            response = Worker.unpack_thread_queue(APIClient.get_request, url, is_stream=True)
-
             if isinstance(response, bytes):
                 file_path, _ = QFileDialog.getSaveFileName(
                     self,
@@ -294,6 +375,12 @@ class OrdersInterface(QWidget):
             InfoBar.error(title='保存失败', content=str(e), parent=self, duration=5000)
             error_logger.error(f'ordersInterface.print_reciept_action: {e}')
 
+    def on_action_failed(self, source: str, error: Exception):
+        """打印、导出等后台请求失败时恢复按钮状态并提示"""
+        self.set_loading(False)
+        InfoBar.error(title='操作失败', content=str(error), parent=self, duration=5000)
+        error_logger.error(f'ordersInterface.{source}: {error}')
+
     def update_pagination_controls(self):
         # print(f'total_pages: {self.total_pages}')
         # 判断分页是否有数据，如果有显示当前是第几页，一共几页，否则显示0页
@@ -314,21 +401,26 @@ class OrdersInterface(QWidget):
         self.paginationWidget.setVisible(res)
 
     def search_orders_by_id(self):
+        order_id = self.oreder_number_input.text()
+        if not order_id:
+            self.load_data()
+            return
+        url = URL + f'/orders/{order_id}'
+        self.set_search_url(url)
+        seq = self.start_request()
+        Worker.run_async(APIClient.get_request, url,
+                         callback=lambda response: self.on_search_by_id_finished(seq, response),
+                         error_callback=lambda e: self.on_request_failed(seq, e, 'search_orders_by_id'))
+
+    def on_search_by_id_finished(self, seq: int, response):
+        if not self.finish_request(seq):
+            return
         try:
-            order_id = self.oreder_number_input.text()
-            if not order_id:
-                self.load_data()
-                self.populate_table()
-                return
-            url = URL + f'/orders/{order_id}'
-            # response = APIClient.get_request(url)
-            response = Worker.unpack_thread_queue(APIClient.get_request, url)
-            # print(response)  # 调试：打印响应内容
-
             if response.get("success") is True:
                 self.orders = response.get("data")
                 if isinstance(self.orders, dict):  # 单个订单，转为列表
                     self.orders = [self.orders]
+                self.orders = compacted_copy(self.orders)
                 self.populate_table()
             elif response.get("success") is False:
                 InfoBar.warning(
@@ -350,47 +442,89 @@ class OrdersInterface(QWidget):
         if self.categoriesComboBox.currentIndex() == 0 and self.typeComboBox.currentIndex() == 0 and self.statusComboBox.currentIndex() == 0:
             self.load_data()
         else:
-            try:
-                base_url = f'{URL}/orders/search?'
-                category = self.categoriesComboBox.currentText()
-                order_type = self.typeComboBox.currentText()
-                order_status = self.statusComboBox.currentText()
-                # print(category, self.data_mapping[order_type], order_status)
-                query_params = {
-                    'i.categories': category if category != '所有类别' else None,  # 忽略空值
-                    'o.order_type': self.data_mapping[order_type] if order_type != '全部类型' else None,
-                    'o.status': self.data_mapping[order_status] if order_status != '所有状态' else None,
-                }
-                query_params = {k: v for k, v in query_params.items() if v is not None}
-                # 编码查询参数并拼接 URL
-                url = base_url + urlencode(query_params)
-
-                # response = APIClient.get_request(url)
-                response = Worker.unpack_thread_queue(APIClient.get_request, url)
-                if response.get("success") is True:
-                    data = response.get('data')
-                    self.orders = data
-                    self.populate_table()
-                    count = len(self.orders)
-                    # print(f'search count: {count}')
-                    self.total_pages = math.ceil(count / self.per_page)
-                    self.update_pagination_controls()
-                elif response.get("success") is False:
+            base_url = f'{URL}/orders/search?'
+            category = self.categoriesComboBox.currentText()
+            order_type = self.typeComboBox.currentText()
+            order_status = self.statusComboBox.currentText()
+            # print(category, self.data_mapping[order_type], order_status)
+            query_params = {
+                'i.categories': category if category != '所有类别' else None,  # 忽略空值
+                'o.order_type': self.data_mapping[order_type] if order_type != '全部类型' else None,
+                'o.status': self.data_mapping[order_status] if order_status != '所有状态' else None,
+            }
+            query_params = {k: v for k, v in query_params.items() if v is not None}
+            # 编码查询参数并拼接 URL
+            url = base_url + urlencode(query_params)
+            self.set_search_url(url)
+            seq = self.start_request()
+            Worker.run_async(APIClient.get_request, url,
+                             callback=lambda response: self.on_search_by_conditions_finished(seq, response),
+                             error_callback=lambda e: self.on_request_failed(seq, e, 'search_orders_by_conditions'))
+
+    def on_search_by_conditions_finished(self, seq: int, response):
+        if seq != self.load_seq:
+            return
+        try:
+            if response.get("success") is True:
+                data = response.get('data')
+                self.orders = compacted_copy(data)
+                count = len(self.orders)
+                # print(f'search count: {count}')
+                self.total_pages = math.ceil(count / self.per_page)
+                self.finish_request(seq)
+                self.populate_table()
+            else:
+                self.finish_request(seq)
+                if response.get("success") is False:
                     InfoBar.warning(title='没有结果', content='没有与查询条件相匹配的结果', parent=self, duration=5000)
-                # 打印结果
-            except Exception as e:
-                InfoBar.error(title='查询失败', content=str(e), parent=self, duration=5000)
-                error_logger.error(f'ordersInterface.search_orders_by_conditions: {e}')
-
-    def get_selected_order_ids(self) -> list:
-        """获取并返回多选框被选中的数据的cargo_id"""
-        selected_order_ids = []
-        for row in range(self.table_widget.rowCount()):
-            checkbox = self.table_widget.cellWidget(row, 0)
-            if checkbox.isChecked():
-                cargo_id = str(self.table_widget.item(row, 1).text())
-                selected_order_ids.append(cargo_id)
-        return selected_order_ids
+        except Exception as e:
+            self.finish_request(seq)
+            InfoBar.error(title='查询失败', content=str(e), parent=self, duration=5000)
+            error_logger.error(f'ordersInterface.search_orders_by_conditions: {e}')
+
+    def with_selected_order_ids(self, callback):
+        """以被选中的 order_id 列表调用 callback, 选中全部匹配结果时先在后台向后端查询全部匹配的订单"""
+        self.selection.resolve_async(self.resolve_matching_ids, callback)
+
+    def matching_url(self) -> str:
+        """返回当前过滤条件下全部匹配订单的 URL"""
+        return self.search_url or URL + '/orders/all'
+
+    def set_search_url(self, url):
+        self.search_url = url
+        # 过滤条件变化后, 之前的"选中全部匹配结果"不再对应当前结果
+        if self.selection.all_matching and self.selection.filter_key != self.matching_url():
+            self.selection.clear()
+
+    def select_all_matching(self):
+        """选中当前过滤条件下的全部订单, 包括尚未加载的页"""
+        count = len(self.orders) if self.search_url else self.source.cached_count() or 0
+        self.selection.select_all_matching(self.matching_url(), count)
+        InfoBar.success(title='已选中', content=f'已选中全部 {count} 条匹配记录', parent=self, duration=4000)
+
+    def resolve_matching_ids(self, url: str, on_resolved):
+        """
+        在后台查询全部匹配的订单, 完成后以 order_id 列表调用 on_resolved
+        url 为当前过滤条件对应的后端查询(有过滤条件时为 /orders/search), 由后端完成筛选
+        """
+        self.set_loading(True)
+
+        def finished(response):
+            self.set_loading(False)
+            if not isinstance(response, dict) or response.get('success') is not True:
+                InfoBar.error(title='操作失败', content='无法获取匹配的订单', parent=self, duration=4000)
+                return
+            data = response.get('data') or []
+            if isinstance(data, dict):  # 单个订单
+                data = [data]
+            on_resolved([order['order_id'] for order in data])
+
+        def failed(e):
+            self.set_loading(False)
+            InfoBar.error(title='操作失败', content='无法获取匹配的订单', parent=self, duration=4000)
+            error_logger.error(f'ordersInterface.resolve_matching_ids: {e}')
+
+        Worker.run_async(APIClient.get_request, url, callback=finished, error_callback=failed)
 
     def exec_operations(self):
         index = self.operationsComboBox.currentIndex()
@@ -400,13 +534,27 @@ class OrdersInterface(QWidget):
             case 2:
                 self.batch_delete_orders()
             case 3:
-                ids = self.get_selected_order_ids()
-                for order_id in ids:
-                    self.batch_update_orders(order_id)
+                self.batch_edit_orders()
             case 4:
                 self.export_to_excel()
             case 5:
                 self.import_from_excel()
+            case 6:
+                self.select_all_matching()
+            case 7:
+                self.selection.clear()
+
+    def displayed_model(self):
+        """当前显示的表格模型(分页或连续滚动)"""
+        return self.lazy_model if self.infinite_scroll else self.table_model
+
+    def on_mutation_succeeded(self, response: dict):
+        """乐观更新的请求成功后重新获取当前页, 与后端数据对账"""
+        InfoBar.success(title='操作成功', content=response.get("message"), parent=self, duration=4000)
+        self.refresh_data()
+
+    def on_mutation_failed(self, message: str):
+        InfoBar.error(title='操作失败', content=f'{message}, 已撤销表格中的修改', parent=self, duration=4000)
 
     def add_order(self):
         try:
@@ -414,16 +562,11 @@ class OrdersInterface(QWidget):
             if dialog.exec():
                 url = URL + f'/orders/create'
                 order_info = dialog.get_order_info()
-                # response = APIClient.post_request(url, order_info)
-                response = Worker.unpack_thread_queue(APIClient.post_request, url, order_info)
-                # print(response)
-                if response.get("success") is True:
-                    InfoBar.success(title='操作成功', content=response.get("message"), parent=self, duration=4000)
-                    self.load_data()
-                elif response.get("success") is False:
-                    InfoBar.error(title='操作失败', content=response.get("message"), parent=self, duration=4000)
-                else:
-                    InfoBar.error(title='操作失败', content=response.get("error"), parent=self, duration=4000)
+                # 新订单先显示在表格顶部, 请求在后台执行; 日期由后端生成
+                pending = {spec.key: order_info.get(spec.key, '') for spec in ORDER_COLUMNS}
+                pending.update(published_at='', processed_at='')
+                optimistic_insert(self.displayed_model(), pending, APIClient.post_request, url, order_info,
+                                  on_success=self.on_mutation_succeeded, on_failure=self.on_mutation_failed)
         except Exception as e:
             InfoBar.error(title='系统错误', content=str(e), parent=self, duration=4000)
             error_logger.error(f'ordersInterface.add_order: {e}')
@@ -431,40 +574,59 @@ class OrdersInterface(QWidget):
     def batch_delete_orders(self):
         pass
 
+    def batch_edit_orders(self):
+        """依次打开选中订单的编辑对话框; 选中全部匹配结果或超过 BATCH_EDIT_MAX 条时不逐条编辑"""
+        if self.selection.all_matching:
+            InfoBar.warning(title='无法批量编辑', content='已选中全部匹配结果, 请勾选需要编辑的订单后再试',
+                            parent=self, duration=4000)
+            return
+        ids = self.selection.selected_ids()
+        if len(ids) > BATCH_EDIT_MAX:
+            InfoBar.warning(title='无法批量编辑',
+                            content=f'一次最多编辑 {BATCH_EDIT_MAX} 条订单, 当前选中了 {len(ids)} 条',
+                            parent=self, duration=4000)
+            return
+        for order_id in ids:
+            self.batch_update_orders(order_id)
+
     def batch_update_orders(self, order_id):
         try:
             dialog = UpdateOrderDialog(order_id=order_id, parent=self)
             if dialog.exec():
                 new_order_info = dialog.get_order_info()
                 url = URL + f'/orders/update/{order_id}'
-                # response = APIClient.post_request(url, new_order_info)
-                response = Worker.unpack_thread_queue(APIClient.post_request, url, new_order_info)
-                if response.get("success") is True:
-                    InfoBar.success(title='操作成功', content=response.get("message"), parent=self, duration=4000)
-                    self.load_data()
-                else:
-                    InfoBar.error(title='操作失败', content=response.get("message"), parent=self, duration=4000)
+                # 先修改表格中的对应行, 请求在后台执行, 失败时回滚; 日期字段在对话框中为转换后的格式, 不参与本地修改
+                changes = {key: value for key, value in new_order_info.items()
+                           if key not in ('published_at', 'processed_at')}
+                optimistic_update(self.displayed_model(), order_id, changes, APIClient.post_request, url,
+                                  new_order_info, on_success=self.on_mutation_succeeded,
+                                  on_failure=self.on_mutation_failed)
         except Exception as e:
             InfoBar.error(title='操作失败', content=str(e), parent=self, duration=4000)
             error_logger.error(f'ordersInterface.batch_update_orders: {e}')
 
     def export_to_excel(self):
+        self.with_selected_order_ids(self.export_orders)
+
+    def export_orders(self, ids: list):
+        """在后台获取要导出的订单(选中的订单或全部订单), 返回后再生成 Excel 文件"""
+        print(ids)
+        if len(ids) != 0:
+            request = (APIClient.post_request, URL + '/orders/batch_query', {"ids": [str(order_id) for order_id in ids]})
+        else:
+            request = (APIClient.get_request, URL + '/orders/all')
+        self.set_loading(True)
+        Worker.run_async(*request, callback=self.on_export_data_loaded,
+                         error_callback=lambda e: self.on_action_failed('export_to_excel', e))
+
+    def on_export_data_loaded(self, response):
+        self.set_loading(False)
         try:
             print_data = []
-            ids = self.get_selected_order_ids()
-            print(ids)
-            if len(ids) != 0:
-                url = URL + '/orders/batch_query'
-                data = {"ids": ids}
-                response = Worker.unpack_thread_queue(APIClient.post_request, url, data)
-                if response.get('success') is True:
-                    print_data = response.get("data")
-            else:
-                url = URL + '/orders/all'
-                response = Worker.unpack_thread_queue(APIClient.get_request, url)
-                if response.get("success") is True:
-                    print_data = response.get("data")
+            if isinstance(response, dict) and response.get("success") is True:
+                print_data = response.get("data")
             # print(print_data)
+            # 导出的数据只读取一次, 不转换为 CompactRecord: 响应体仍被请求缓存持有, 转换只会额外占用内存
             if print_data is None:
                 InfoBar.warning(title="操作失败", content="无效的数据", parent=self, duration=4000)
                 return
@@ -472,17 +634,19 @@ class OrdersInterface(QWidget):
                 # print(data)
                 date = datetime.today().strftime('%Y-%m-%d')
                 filename = f"订单记录-{date}"
+                # openpyxl 导入较慢, 只在导出/导入 Excel 时才导入
+                import openpyxl
                 wb = openpyxl.Workbook()
                 ws = wb.active
                 ws.title = filename
                 headers = ['单号', '类型', '货品id', '货品名称', '型号', '类别', '供应商', '项目', '状态',
                            '经办人', '提交日期', '审核日期', '单价', '数量', '规格', '总价']
                 ws.append(headers)
-                status_to_chinese = lambda status: {
+                status_to_chinese = {
                     'pass': '完成',
                     'reject': '取消',
                     'waiting': '待处理'
-                }.get(status, '未知')
+                }.get
                 for order in print_data:
                     row = [
                         order['order_id'],
@@ -493,7 +657,7 @@ class OrdersInterface(QWidget):
                         order['categories'],
                         order['provider'] if order['provider'] != 'null' else None,
                         order['project'] if order['project'] != 'null' else None,
-                        status_to_chinese(order['status']),
+                        status_to_chinese(order['status'], '未知'),
                         order['employee_name'],
                         convert_date_to_chinese(order['published_at']),
                         convert_date_to_chinese(order['processed_at']),
@@ -522,6 +686,7 @@ class OrdersInterface(QWidget):
                 InfoBar.warning("操作取消", "用户终止了导入操作", parent=self, duration=4000)
                 return
             else:
+                import openpyxl
                 wb = openpyxl.load_workbook(filename=file_path)
                 ws = wb.active
                 expected_header = ['单号', '类型', '货品id', '货品名称', '型号', '类别', '供应商', '项目', '状态',
@@ -563,7 +728,7 @@ class OrdersInterface(QWidget):
                     }
                     # print(f'skipped: {skipped}, dataset: {json}')
 
-                    response = Worker.unpack_thread_queue(APIClient.post_request, url, json)
+                    response = Worker.unpack_thread_queue(APIClient.post_request, url, json, compress=True)
                     print(response)
                     res = response.get('success')
                     print(res)
@@ -577,8 +742,7 @@ class OrdersInterface(QWidget):
                             failed_count = len(failed_order_ids) if failed_order_ids is not None else 0
                             success_count = total_count - failed_count
                             InfoBar.success(title='导入成功', content=f'成功导入了{success_count}条数据, 失败了{failed_count}条数据, 导入失败的订单id为{failed_order_ids}', parent=self, duration=5000)
-                        self.load_data()
-                        self.populate_table()
+                        self.refresh_data()
         except Exception as e:
             error_logger.error(f'ordersInterface.import_from_excel: {str(e)}')
 
@@ -586,13 +750,11 @@ class OrdersInterface(QWidget):
         if self.current_page > 1:
             self.current_page -= 1
             self.load_data()
-            self.populate_table()
 
     def load_next_page(self):
         if self.current_page < self.total_pages:
             self.current_page += 1
             self.load_data()
-            self.populate_table()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,46 @@
+from utils.functional_utils import convert_date_to_chinese
+from utils.normalize import label_formatter
+from utils.sort_filter_proxy import numeric_sort_key, date_sort_key, pinyin_sort_key
+from utils.table_model import ColumnSpec, RecordTableModel
+
+ORDER_TYPE_MAPPING = {
+    "inbound": "入库",
+    "outbound": "出库"
+}
+STATUS_MAPPING = {
+    "pass": "已完成",
+    "waiting": "待处理",
+    "reject": "已取消"
+}
+
+
+def format_date(value) -> str:
+    """未审核的订单与尚未提交到后端的新订单没有日期, 显示为空"""
+    return convert_date_to_chinese(value) if value else ''
+
+
+ORDER_COLUMNS = [
+    ColumnSpec('order_id', '单号'),
+    ColumnSpec('order_type', '类型', label_formatter(ORDER_TYPE_MAPPING)),
+    ColumnSpec('cargo_id', '货品id'),
+    ColumnSpec('cargo_name', '货品名称', sort_key=pinyin_sort_key),
+    ColumnSpec('model', '型号'),
+    ColumnSpec('categories', '类别'),
+    ColumnSpec('provider', '供应商'),
+    ColumnSpec('project', '归属项目'),
+    ColumnSpec('status', '状态', label_formatter(STATUS_MAPPING)),
+    ColumnSpec('employee_name', '经办人'),
+    ColumnSpec('published_at', '提交日期', format_date, sort_key=date_sort_key),
+    ColumnSpec('processed_at', '审核日期', format_date, sort_key=date_sort_key),
+    ColumnSpec('price', '单价', sort_key=numeric_sort_key),
+    ColumnSpec('count', '数量', sort_key=numeric_sort_key),
+    ColumnSpec('specification', '规格'),
+    ColumnSpec('total_price', '总价', sort_key=numeric_sort_key),
+]
+
+
+class OrdersTableModel(RecordTableModel):
+    """订单表格模型, 首列为多选框, 选中状态按 order_id 记录"""
+
+    def __init__(self, selection=None, parent=None):
+        super().__init__(ORDER_COLUMNS, id_key='order_id', checkable=True, selection=selection, parent=parent)
@@ -1,8 +1,9 @@
 from PyQt6.QtWidgets import QGridLayout
-from qfluentwidgets import MessageBoxBase, SubtitleLabel, LineEdit, StrongBodyLabel
+from qfluentwidgets import MessageBoxBase, SubtitleLabel, LineEdit, StrongBodyLabel, InfoBar
 from config import URL
 from backendRequests.jsonRequests import APIClient
 from utils.worker import Worker
+from utils.ui_components import create_loading_bar, set_loading_state
 from utils.app_logger import get_logger
 
 error_logger = get_logger(logger_name='error_logger', log_file='error.log')
@@ -51,10 +52,22 @@ class UpdateProjectDialog(BaseProjectDialog):
         self.set_project_info()
 
     def set_project_info(self):
+        """非阻塞地获取项目信息, 返回前显示加载状态并禁用修改按钮"""
+        self.loading_bar = create_loading_bar(self)
+        self.viewLayout.insertWidget(1, self.loading_bar)
+        set_loading_state(self.loading_bar, True, self.yesButton)
+        url = URL + f'/project/search?name={self.project_name}'
+        Worker.run_async(APIClient.get_request, url, callback=self.on_project_info_loaded,
+                         error_callback=self.on_project_info_failed)
+
+    def on_project_info_failed(self, error: Exception):
+        set_loading_state(self.loading_bar, False, self.yesButton)
+        InfoBar.error(title='加载失败', content=str(error), parent=self, duration=5000)
+        error_logger.error(f'projectDialog.set_project_info: {error}')
+
+    def on_project_info_loaded(self, response):
+        set_loading_state(self.loading_bar, False, self.yesButton)
         try:
-            url = URL + f'/project/search?name={self.project_name}'
-            # response = APIClient.get_request(url)
-            response = Worker.unpack_thread_queue(APIClient.get_request, url)
             if response.get('success') is True:
                 data = response['data']
                 print(data[0].get('project_name'))
@@ -1,16 +1,18 @@
 import sys
 
-from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QHeaderView, QApplication, QTableWidgetItem
-from qfluentwidgets import CardWidget, StrongBodyLabel, LineEdit, PushButton, ComboBox, setCustomStyleSheet, \
-    TableWidget, SmoothMode, CheckBox, InfoBar
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QHeaderView, QApplication
+from qfluentwidgets import CardWidget, StrongBodyLabel, LineEdit, PushButton, ComboBox, setCustomStyleSheet, InfoBar
 
 from project.projectDialog import AddProjectDialog, UpdateProjectDialog
 from utils.custom_styles import ADD_BUTTON_STYLE
 from config import URL
 from backendRequests.jsonRequests import APIClient
+from backendRequests.bootstrap import BootstrapPrefetch
 from utils.worker import Worker
+from utils.reference_data import ReferenceDataStore
 from utils.app_logger import get_logger
+from utils.table_model import ColumnSpec, RecordTableModel
+from utils.ui_components import create_table_view
 
 error_logger = get_logger(logger_name='error_logger', log_file='error.log')
 
@@ -60,56 +62,38 @@ class ProjectInterface(QWidget):
 
         layout.addWidget(card_widget)
 
-        self.table_widget = TableWidget(self)
-        self.table_widget.setBorderRadius(8)
-        self.table_widget.setBorderVisible(True)
-        self.table_widget.verticalHeader().setVisible(False)  # 不显示行号
-        self.table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.table_widget.scrollDelagate.verticalSmoothScroll.setSmoothMode(SmoothMode.NO_SMOOTH)
-
-        self.table_widget.setColumnCount(2)
-        self.table_widget.setHorizontalHeaderLabels(["", "项目名"])
+        self.table_model = RecordTableModel([ColumnSpec('project_name', '项目名')], id_key='project_name',
+                                            checkable=True, parent=self)
+        self.table_view = create_table_view(self, self.table_model)
+        self.adjust_column_widths()
 
-        layout.addWidget(self.table_widget)
+        layout.addWidget(self.table_view)
 
         self.setStyleSheet("ProjectInterface {background-color:white;}")
         self.resize(1280, 760)
 
     def populate_table(self):
-        """生成表格, 遍历从后端获取的数据并逐行填入到表格中"""
-        self.table_widget.setRowCount(len(self.projects))
-        for row, project_info in enumerate(self.projects):
-            self.setup_table_row(row, project_info)
-        self.adjust_column_widths()
+        """将从后端获取的数据交给表格模型, 单元格内容在绘制时按需生成"""
+        self.table_model.set_records(self.projects)
 
     def adjust_column_widths(self):
         # 设置第一列为固定宽度
-        self.table_widget.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)
-        self.table_widget.setColumnWidth(0, 50)  # 第一列宽度固定为 50 像素
-
-        # 让其他列自动调整宽度以适应表格大小
-        for col in range(2, self.table_widget.columnCount()):
-            self.table_widget.horizontalHeader().setSectionResizeMode(
-                col, QHeaderView.ResizeMode.Stretch
-            )
-
-    def setup_table_row(self, row: int, project_info: dict):
-        # 将多选框绘制到每行的首列
-        checkbox = CheckBox()
-        self.table_widget.setCellWidget(row, 0, checkbox)
-        for col, key in enumerate(['project_name']):
-            value = project_info.get(key, '')
-            # 单元格赋值
-            item = QTableWidgetItem(str(value))
-            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
-            self.table_widget.setItem(row, col + 1, item)  #注意：第一列是多选框，所以在赋值时从第二列开始
+        self.table_view.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)
+        self.table_view.setColumnWidth(0, 50)  # 第一列宽度固定为 50 像素
 
     def load_data(self):
         url = URL + '/project/all'
         # response = APIClient.get_request(url)
+        # 首次加载优先使用登录后预取的结果, 没有时在后台请求, 返回后再填充表格
+        response = BootstrapPrefetch.take(url)
+        if response is not None:
+            self.on_data_loaded(response)
+            return
+        Worker.run_async(APIClient.get_request, url, callback=self.on_data_loaded,
+                         error_callback=lambda e: error_logger.error(f'projectInterface.load_data: {e}'))
+
+    def on_data_loaded(self, response):
         try:
-            response = Worker.unpack_thread_queue(APIClient.get_request, url)
             if response.get('success') is True:
                 data = response['data']
                 self.projects = [ item for item in data if item['project_name'] != 'null']
@@ -130,7 +114,7 @@ class ProjectInterface(QWidget):
             # print(response)
             if response.get('success') is True:
                 data = response['data']
-                self.projects = [data] if isinstance(data, str) else data
+                self.projects = [{'project_name': data}] if isinstance(data, str) else data
                 print(self.projects)
                 self.populate_table()
             elif response.get('error') is not None:
@@ -163,6 +147,7 @@ class ProjectInterface(QWidget):
                 response = Worker.unpack_thread_queue(APIClient.post_request, url, data)
                 if response.get('success') is True:
                     InfoBar.success(title='操作成功', content=response.get('message'), parent=self)
+                    ReferenceDataStore.instance().invalidate('projects')
                     self.load_data()
                     self.populate_table()
                 elif response.get('error') is not None:
@@ -185,6 +170,9 @@ class ProjectInterface(QWidget):
                 print(response)
                 if response.get('success') is True:
                     InfoBar.success(title='操作成功', content='项目名称已更改', parent=self, duration=5000)
+                    # 名称即主键, 改名后旧名称不再有效
+                    self.table_model.selection.set_selected(project_name, False)
+                    ReferenceDataStore.instance().invalidate('projects')
                     self.load_data()
                     self.populate_table()
                 elif response.get('success') is False:
@@ -196,15 +184,8 @@ class ProjectInterface(QWidget):
             error_logger.error(f'projectInterface.edit_project: {str(e)}')
 
     def get_selected_project(self):
-        """获取并返回多选框被选中的数据的cargo_id"""
-        selected_project_name = []
-        for row in range(self.table_widget.rowCount()):
-            checkbox = self.table_widget.cellWidget(row, 0)
-            if checkbox.isChecked():
-                project_name = str(self.table_widget.item(row, 1).text())
-                selected_project_name.append(project_name)
-
-        return selected_project_name
+        """获取并返回多选框被选中的数据的project_name"""
+        return [str(name) for name in self.table_model.selection.selected_ids()]
 
 
 if __name__ == '__main__':
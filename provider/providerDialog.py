@@ -1,8 +1,9 @@
 from PyQt6.QtWidgets import QGridLayout
-from qfluentwidgets import MessageBoxBase, SubtitleLabel, LineEdit, StrongBodyLabel
+from qfluentwidgets import MessageBoxBase, SubtitleLabel, LineEdit, StrongBodyLabel, InfoBar
 from config import URL
 from backendRequests.jsonRequests import APIClient
 from utils.worker import Worker
+from utils.ui_components import create_loading_bar, set_loading_state
 from utils.app_logger import get_logger
 
 error_logger = get_logger(logger_name='error_logger', log_file='error.log')
@@ -51,9 +52,22 @@ class UpdateProviderDialog(BaseProviderDialog):
         self.set_provider_info()
 
     def set_provider_info(self):
+        """非阻塞地获取供应商信息, 返回前显示加载状态并禁用修改按钮"""
+        self.loading_bar = create_loading_bar(self)
+        self.viewLayout.insertWidget(1, self.loading_bar)
+        set_loading_state(self.loading_bar, True, self.yesButton)
         url = URL + f'/providers/search?name={self.provider_name}'
+        Worker.run_async(APIClient.get_request, url, callback=self.on_provider_info_loaded,
+                         error_callback=self.on_provider_info_failed)
+
+    def on_provider_info_failed(self, error: Exception):
+        set_loading_state(self.loading_bar, False, self.yesButton)
+        InfoBar.error(title='加载失败', content=str(error), parent=self, duration=5000)
+        error_logger.error(f'providerDialog.ser_provider_info: {str(error)}')
+
+    def on_provider_info_loaded(self, response):
+        set_loading_state(self.loading_bar, False, self.yesButton)
         try:
-            response = Worker.unpack_thread_queue(APIClient.get_request, url)
             # print(response)
             if response.get('success') is True:
                 data = response['data']
@@ -0,0 +1,46 @@
+"""
+基准测试冒烟测试
+以很小的数据量在 offscreen 平台的子进程中运行各基准测试, 只检查能否正常运行结束,
+避免界面或模型的接口变化使基准测试无法运行而未被发现
+
+运行: python -m pytest tests
+"""
+import importlib.util
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HAS_GUI = bool(importlib.util.find_spec('PyQt6') and importlib.util.find_spec('qfluentwidgets'))
+
+
+def run_benchmark(module: str, *args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    return subprocess.run([sys.executable, '-m', module, *args], cwd=ROOT, env=env,
+                          capture_output=True, text=True, timeout=300)
+
+
+class BenchmarkTestCase(unittest.TestCase):
+    def assertRuns(self, module: str, *args: str):
+        result = run_benchmark(module, *args)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+class BenchmarkSmokeTest(BenchmarkTestCase):
+    def test_record_store(self):
+        self.assertRuns('benchmarks.bench_record_store', '--rows', '200')
+
+
+@unittest.skipUnless(HAS_GUI, '需要 PyQt6 与 qfluentwidgets')
+class GuiBenchmarkSmokeTest(BenchmarkTestCase):
+
+    def test_orders_table(self):
+        self.assertRuns('benchmarks.bench_orders_table', '--rows', '50', '--legacy-max', '50')
+
+    def test_sort_filter(self):
+        self.assertRuns('benchmarks.bench_sort_filter', '--rows', '200', '--repeat', '1')
+
+
+if __name__ == '__main__':
+    unittest.main()
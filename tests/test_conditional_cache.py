@@ -0,0 +1,129 @@
+"""
+条件请求缓存测试
+使用本地的 http.server 模拟后端: 首次 GET 返回带 ETag 的响应体, 请求头中的 If-None-Match 匹配时返回 304
+
+运行: python -m pytest tests  或  python -m unittest discover tests
+"""
+import importlib.util
+import json
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from backendRequests.conditionalCache import ConditionalCache
+
+ETAG = '"v1"'
+BODY = {'success': True, 'data': [{'order_id': 1, 'status': 'pass'}]}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.received.append(self.headers.get('If-None-Match'))
+        if self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.send_header('ETag', ETAG)
+            self.end_headers()
+            return
+        payload = json.dumps(BODY).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('ETag', ETAG)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.server.received = []  # 每次请求的 If-None-Match 请求头
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/orders/all'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class ConditionalCacheTest(StubServerTestCase):
+    def get(self, cache: ConditionalCache):
+        """与 APIClient._get_request 相同的流程: 附加条件请求头, 304 时返回缓存的响应体"""
+        request = urllib.request.Request(self.url, headers=cache.validators(self.url))
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                body = json.loads(response.read())
+                cache.store(self.url, response.headers, body)
+                return body
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return cache.body(self.url)
+            raise
+
+    def test_not_modified_returns_cached_body(self):
+        cache = ConditionalCache()
+        first = self.get(cache)
+        second = self.get(cache)
+        self.assertEqual(self.server.received, [None, ETAG])
+        self.assertEqual(first, BODY)
+        self.assertIs(second, first)
+
+    def test_response_without_validators_is_not_cached(self):
+        cache = ConditionalCache()
+        cache.store(self.url, {}, BODY)
+        self.assertEqual(cache.validators(self.url), {})
+        self.assertIsNone(cache.body(self.url))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ConditionalCache(max_entries=2)
+        for key in ('a', 'b'):
+            cache.store(key, {'ETag': ETAG}, key)
+        cache.validators('a')  # a 最近被使用, 超出容量时淘汰 b
+        cache.store('c', {'ETag': ETAG}, 'c')
+        self.assertEqual(cache.body('a'), 'a')
+        self.assertIsNone(cache.body('b'))
+
+    def test_body_over_size_limit_is_not_cached(self):
+        cache = ConditionalCache(max_body_bytes=100)
+        cache.store('a', {'ETag': ETAG}, 'a', size=50)
+        cache.store('a', {'ETag': ETAG}, 'a', size=200)  # 超过单条上限, 同时丢弃旧缓存
+        self.assertIsNone(cache.body('a'))
+        self.assertEqual(cache.validators('a'), {})
+
+    def test_entries_are_evicted_over_byte_budget(self):
+        cache = ConditionalCache(max_bytes=100)
+        for key in ('a', 'b', 'c'):
+            cache.store(key, {'ETag': ETAG}, key, size=40)
+        self.assertIsNone(cache.body('a'))
+        self.assertEqual(cache.body('b'), 'b')
+        self.assertEqual(cache.body('c'), 'c')
+        cache.discard('b')
+        cache.store('d', {'ETag': ETAG}, 'd', size=60)  # b 被移除后 c + d 未超过上限
+        self.assertEqual(cache.body('c'), 'c')
+        self.assertEqual(cache.body('d'), 'd')
+
+
+@unittest.skipUnless(importlib.util.find_spec('requests') and importlib.util.find_spec('PyQt6'),
+                     'APIClient 需要 requests 与 PyQt6')
+class APIClientConditionalGetTest(StubServerTestCase):
+    def setUp(self):
+        super().setUp()
+        from backendRequests.jsonRequests import APIClient
+        self.client = APIClient
+        self.client.conditional_cache.clear()
+
+    def test_second_get_sends_if_none_match_and_reuses_body(self):
+        # 直接调用 _get_request, 绕过合并相同请求的 SingleFlight, 确保两次都发往后端
+        first = self.client._get_request(self.url).result()
+        second = self.client._get_request(self.url).result()
+        self.assertEqual(self.server.received, [None, ETAG])
+        self.assertEqual(first, BODY)
+        self.assertIs(second, first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,21 @@
+"""
+登录窗口启动时间回归测试
+在 offscreen 平台运行 benchmarks.check_startup_budget, 登录窗口显示耗时超过预算,
+或登录前导入了应延迟加载的模块时测试失败
+
+运行: python -m pytest tests
+"""
+import unittest
+
+from tests.test_benchmarks import HAS_GUI, run_benchmark
+
+
+@unittest.skipUnless(HAS_GUI, '需要 PyQt6 与 qfluentwidgets')
+class StartupBudgetTest(unittest.TestCase):
+    def test_login_window_within_budget(self):
+        result = run_benchmark('benchmarks.check_startup_budget', '--repeat', '3')
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,9 @@ from PyQt6.QtWidgets import QGridLayout
 from qfluentwidgets import MessageBoxBase, SubtitleLabel, LineEdit, ComboBox, PasswordLineEdit, StrongBodyLabel, InfoBar
 from backendRequests.jsonRequests import APIClient
 from utils.worker import Worker
+from utils.ui_components import create_loading_bar, set_loading_state
 from utils.functional_utils import hash_password
+from utils.db_utils import load_employees
 from config import URL
 from utils.app_logger import get_logger
 
@@ -68,20 +70,8 @@ class BaseUserDialog(MessageBoxBase):
         self.username_input.setFocus()
 
     def load_employees(self):
-        url = URL + '/employees/all'
-        try:
-            response = Worker.unpack_thread_queue(APIClient.get_request, url)
-
-            employees = []
-            if isinstance(response, (dict, list)):  # 有效 JSON
-                if response.get('success') is True:  # 有数据
-                    data = response.get('data')
-                    for employee_info in data:
-                        employee_name = employee_info.get('employee_name')
-                        employees.append(employee_name)
-            return employees
-        except Exception as e:
-            error_logger.error(f'userDialog.load_employees: {e}')
+        """员工姓名列表, 从参考数据缓存中读取"""
+        return load_employees()
 
     def _validateInput(self) -> list:
         username = self.username_input.text().strip()
@@ -150,31 +140,40 @@ class UpdateUserDialog(BaseUserDialog):
         self.employee_combo.setDisabled(True)
 
     def set_user_info(self):
+        """非阻塞地获取用户信息及其对应的员工姓名, 全部返回前显示加载状态并禁用修改按钮"""
+        self.loading_bar = create_loading_bar(self)
+        self.viewLayout.insertWidget(1, self.loading_bar)
+        set_loading_state(self.loading_bar, True, self.yesButton)
         url = URL + f'/users/{self.user_id}'
+        Worker.run_async(APIClient.get_request, url, callback=self.on_user_info_loaded,
+                         error_callback=lambda e: self.on_load_failed('set_user_info', e))
+
+    def on_load_failed(self, source: str, error: Exception):
+        set_loading_state(self.loading_bar, False, self.yesButton)
+        error_logger.error(f'userDialog.{source}: {error}')
+
+    def on_user_info_loaded(self, response):
         try:
-            response = Worker.unpack_thread_queue(APIClient.get_request, url)
             if response.get('success') is True:
                 user = response.get('user')
                 self.user_id_input.setText(user.get('user_id'))
                 self.username_input.setText(user.get('username'))
-                self.employee_combo.setCurrentText(self._get_employee_name(user.get('employee_id')))
                 self.status_combo.setCurrentText('启用' if user.get('status') == 1 else '停用')
                 self.privilege_combo.setCurrentText(user.get('privilege'))
                 self.password_input.setText(None)
                 self.verify_password_input.setText(None)
+                url = URL + f'/employees/{user.get("employee_id")}'
+                Worker.run_async(APIClient.get_request, url, callback=self.on_employee_loaded,
+                                 error_callback=lambda e: self.on_load_failed('_get_employee_name', e))
+                return
         except Exception as e:
             error_logger.error(f'userDialog.set_user_info: {e}')
+        set_loading_state(self.loading_bar, False, self.yesButton)
 
-    def _get_employee_name(self, employee_id):
-        url = URL + f'/employees/{employee_id}'
+    def on_employee_loaded(self, response):
+        set_loading_state(self.loading_bar, False, self.yesButton)
         try:
-            response = Worker.unpack_thread_queue(APIClient.get_request, url)
             if response.get('success') is True:
-                info = response.get('data')
-                employee_name = info.get('employee_name')
-                return employee_name
-            else:
-                return None
+                self.employee_combo.setCurrentText(response.get('data').get('employee_name'))
         except Exception as e:
             error_logger.error(f'userDialog._get_employee_name: {e}')
-            return None
@@ -1,15 +1,16 @@
 import sys
 
-from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QHeaderView, QApplication, QTableWidgetItem
-from qfluentwidgets import CardWidget, StrongBodyLabel, LineEdit, PushButton, setCustomStyleSheet, SmoothMode, \
-    TableWidget, InfoBar
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QApplication
+from qfluentwidgets import CardWidget, StrongBodyLabel, LineEdit, PushButton, setCustomStyleSheet, InfoBar
 
 from utils.custom_styles import ADD_BUTTON_STYLE
 from config import URL
 from backendRequests.jsonRequests import APIClient
+from backendRequests.bootstrap import BootstrapPrefetch
 from utils.worker import Worker
-from utils.ui_components import create_btn_widget
+from utils.ui_components import create_table_view
+from utils.table_model import ColumnSpec, RecordTableModel
+from utils.optimistic import optimistic_update
 from utils.functional_utils import convert_date_to_chinese
 from utils.app_logger import get_logger
 from users.userDialog import AddUserDialog, UpdateUserDialog
@@ -53,60 +54,46 @@ class UserInterface(QWidget):
 
         layout.addWidget(card_widget)
 
-        self.table_widget = TableWidget(self)
-        self.table_widget.setBorderRadius(8)
-        self.table_widget.setBorderVisible(True)
-        self.table_widget.verticalHeader().setVisible(True)  # 不显示行号
-        self.table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.table_widget.scrollDelagate.verticalSmoothScroll.setSmoothMode(SmoothMode.NO_SMOOTH)
+        self.table_model = RecordTableModel([
+            ColumnSpec('user_id', '用户id'),
+            ColumnSpec('username', '用户名'),
+            ColumnSpec('password', '密码', lambda value: '********'),
+            ColumnSpec('employee_id', '所属员工'),
+            ColumnSpec('created_at', '创建日期', convert_date_to_chinese),
+            ColumnSpec('status', '状态', lambda value: '启用' if value == 1 else '停用'),
+            ColumnSpec('privilege', '权限'),
+            ColumnSpec(None, '操作', action=lambda record: self.update_user(record['user_id'])),
+        ], id_key='user_id', parent=self)
+        self.table_view = create_table_view(self, self.table_model, show_row_numbers=True)
 
-        # 设置表头
-        self.table_widget.setColumnCount(8)
-        self.table_widget.setHorizontalHeaderLabels(
-            ["用户id", "用户名", "密码", "所属员工", "创建日期", "状态", "权限", "操作"])
-
-        layout.addWidget(self.table_widget)
+        layout.addWidget(self.table_view)
 
         self.setStyleSheet("UserInterface {background-color:white;}")
         self.resize(1280, 760)
 
-    def populate_table(self):
-        """生成表格, 遍历从后端获取的数据并逐行填入到表格中"""
-        self.table_widget.setRowCount(len(self.users))
-        for row, user_info in enumerate(self.users):
-            self.setup_table_row(row, user_info)
-
-    def setup_table_row(self, row: int, user_info: dict):
-        # 将多选框绘制到每行的首列
-        for col, key in enumerate(
-                ['user_id', 'username', 'password', 'employee_id', 'created_at', 'status', 'privilege']):
-            match key:
-                case 'password':
-                    value = '********'
-                case 'created_at':
-                    value = convert_date_to_chinese(user_info.get(key, ''))
-                case 'status':
-                    value = '启用' if user_info.get(key, '') == 1 else '停用'
-                case _:
-                    value = user_info.get(key)
-            # 单元格赋值
-            item = QTableWidgetItem(str(value))
-            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
-            self.table_widget.setItem(row, col, item)  #注意：第一列是多选框，所以在赋值时从第二列开始
-        # 为每行添加编辑按钮
-        action_widget = create_btn_widget(
-            callback=lambda: self.update_user(user_info['user_id'])
-        )
-        self.table_widget.setCellWidget(row, 7, action_widget)  # 将组件添加到每行的最后一列
-
-    def load_data(self):
+    def populate_table(self, refresh: bool = False):
+        """将从后端获取的数据交给表格模型, 单元格内容在绘制时按需生成; refresh 为 True 时只更新变化的行"""
+        if refresh:
+            self.table_model.update_records(self.users)
+        else:
+            self.table_model.set_records(self.users)
+
+    def load_data(self, refresh: bool = False):
+        """:param refresh: 数据变更后的刷新, 按 user_id 比较后只更新变化的行"""
         url = URL + '/users/all'
+        # response = APIClient.get_request(url)
+        # 首次加载优先使用登录后预取的结果, 没有时在后台请求, 返回后再填充表格
+        response = BootstrapPrefetch.take(url)
+        if response is not None:
+            self.on_data_loaded(response, refresh)
+            return
+        Worker.run_async(APIClient.get_request, url, callback=lambda response: self.on_data_loaded(response, refresh),
+                         error_callback=lambda e: error_logger.error(f'userInterface.load_data: {e}'))
+
+    def on_data_loaded(self, response, refresh: bool = False):
         try:
-            # response = APIClient.get_request(url)
-            response = Worker.unpack_thread_queue(APIClient.get_request, url)
             self.users = response.get("users")
-            self.populate_table()
+            self.populate_table(refresh)
         except Exception as e:
             InfoBar.error(title='系统错误', content=str(e), parent=self, duration=5000)
             error_logger.error(f'userInterface.load_data: {str(e)}')
@@ -117,20 +104,23 @@ class UserInterface(QWidget):
             if dialog.exec():
                 url = URL + f'/users/update/{user_id}'
                 user_info = dialog.get_user_info()
-
-                response = Worker.unpack_thread_queue(APIClient.post_request, url, user_info)
-                print(response)
-                if response.get('success') is True:
-                    InfoBar.success(title='更新成功', content='已完成用户资料更新', parent=self, duration=5000)
-                    self.load_data()
-                elif response.get('success') is False:
-                    InfoBar.error(title='更新失败', content='未能完成用户资料更新', parent=self, duration=5000)
-                else:
-                    InfoBar.error(title='系统错误', content=response.get('error'), parent=self, duration=5000)
+                if user_info is None:  # 两次输入的密码不一致
+                    return
+                # 先修改表格中的对应行, 请求在后台执行, 失败时回滚
+                optimistic_update(self.table_model, user_id, user_info, APIClient.post_request, url, user_info,
+                                  on_success=self.on_update_succeeded, on_failure=self.on_update_failed)
         except Exception as e:
             InfoBar.error(title='系统错误', content=str(e), parent=self, duration=5000)
             error_logger.error(f'userInterface.update_user: {str(e)}')
 
+    def on_update_succeeded(self, response: dict):
+        InfoBar.success(title='更新成功', content='已完成用户资料更新', parent=self, duration=5000)
+        self.load_data(refresh=True)
+
+    def on_update_failed(self, message: str):
+        InfoBar.error(title='更新失败', content=f'未能完成用户资料更新: {message}, 已撤销表格中的修改', parent=self,
+                      duration=5000)
+
     def add_user(self):
         dialog = AddUserDialog(self)
         url = URL + '/users/create'
@@ -142,7 +132,7 @@ class UserInterface(QWidget):
                 if response.get('success') is True:
                     InfoBar.success(title='用户创建成功', content=f'{user_info.get('employee_name')}已被成功创建',
                                     parent=self, duration=5000)
-                    self.load_data()
+                    self.load_data(refresh=True)
                 elif response.get('success') is False:
                     InfoBar.error(title='用户创建失败', content='未能成功创建用户', parent=self, duration=5000)
                 else:
@@ -1,29 +1,37 @@
 from datetime import datetime
-from config import SALT
+from functools import lru_cache
+from config import SALT, DATE_CACHE_SIZE
 import hashlib
 
 
+# 英文与中文的星期和月份映射
+WEEK_MAP = {
+    "Mon": "星期一", "Tue": "星期二", "Wed": "星期三",
+    "Thu": "星期四", "Fri": "星期五", "Sat": "星期六", "Sun": "星期日"
+}
+MONTH_MAP = {
+    "Jan": "1", "Feb": "2", "Mar": "3", "Apr": "4",
+    "May": "5", "Jun": "6", "Jul": "7", "Aug": "8",
+    "Sep": "9", "Oct": "10", "Nov": "11", "Dec": "12"
+}
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
 def convert_date_to_chinese(date_str):
+    """
+    将后端返回的日期字符串(如 'Tue, 05 Nov 2024 00:00:00 GMT')转换为 '2024-11-5 '
+    表格中同一日期会反复出现, 结果按原始字符串缓存(有界 LRU)
+    """
+    # 快速路径: 直接拆分字段, 避免 strptime 与 strftime 的开销
+    parts = date_str.split(' ')
+    if len(parts) == 6 and parts[0][:3] in WEEK_MAP and parts[2] in MONTH_MAP and parts[5] in ('GMT', 'UTC') \
+            and parts[1].isdigit() and 1 <= int(parts[1]) <= 31 and parts[3].isdigit():
+        return f"{int(parts[3])}-{MONTH_MAP[parts[2]]}-{int(parts[1])} "
+
     # 将英文日期字符串解析为 datetime 对象
     date_obj = datetime.strptime(date_str, "%a, %d %b %Y %H:%M:%S %Z")
-
-    # 英文与中文的星期和月份映射
-    week_map = {
-        "Mon": "星期一", "Tue": "星期二", "Wed": "星期三",
-        "Thu": "星期四", "Fri": "星期五", "Sat": "星期六", "Sun": "星期日"
-    }
-    month_map = {
-        "Jan": "1", "Feb": "2", "Mar": "3", "Apr": "4",
-        "May": "5", "Jun": "6", "Jul": "7", "Aug": "8",
-        "Sep": "9", "Oct": "10", "Nov": "11", "Dec": "12"
-    }
-
-    # 获取中文星期和月份
-    week_chinese = week_map[date_obj.strftime("%a")]
-    month_chinese = month_map[date_obj.strftime("%b")]
-
     # 格式化为中文日期字符串
-    chinese_date = f"{date_obj.year}-{month_chinese}-{date_obj.day} "
+    chinese_date = f"{date_obj.year}-{date_obj.month}-{date_obj.day} "
     # {week_chinese}
     return chinese_date
 
@@ -0,0 +1,86 @@
+import time
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from config import INCREMENTAL_POPULATE_THRESHOLD, INCREMENTAL_BATCH_ROWS, INCREMENTAL_TIME_SLICE_MS
+
+
+class IncrementalPopulator(QObject):
+    """
+    分批向表格模型填充大量数据
+    每次事件循环只插入 INCREMENTAL_TIME_SLICE_MS 毫秒内能完成的批次, 之后让出事件循环, 界面在填充期间保持响应;
+    插入期间关闭视图刷新, 填充期间关闭表头排序并暂停代理模型的排序与过滤, 全部插入后统一排序一次;
+    发起新的请求时调用 cancel() 停止填充
+    """
+    progress = pyqtSignal(int, int)  # 已插入行数, 总行数
+    finished = pyqtSignal()  # 填充完成或被取消
+
+    def __init__(self, view, model, proxy=None, parent=None):
+        """
+        :param view: 表格视图
+        :param model: RecordTableModel, 数据通过 append_records 追加
+        :param proxy: 视图使用的 RecordSortFilterProxyModel, 没有时为 None
+        """
+        super().__init__(parent)
+        self.view = view
+        self.model = model
+        self.proxy = proxy
+        self.records = []
+        self.position = 0
+        self._sorting_enabled = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._populate_batch)
+
+    @property
+    def active(self) -> bool:
+        return self._timer.isActive() or self.position < len(self.records)
+
+    def populate(self, records: list):
+        """填充数据; 数据量不超过 INCREMENTAL_POPULATE_THRESHOLD 时一次性替换"""
+        self.cancel()
+        records = records or []
+        if len(records) <= INCREMENTAL_POPULATE_THRESHOLD:
+            self.model.set_records(records)
+            self.finished.emit()
+            return
+        self.records = records
+        self.position = 0
+        self._sorting_enabled = self.view.isSortingEnabled()
+        self.view.setSortingEnabled(False)
+        if self.proxy is not None:
+            self.proxy.set_suspended(True)
+        self.model.set_records([])
+        self.progress.emit(0, len(records))
+        self._timer.start(0)
+
+    def cancel(self):
+        """停止填充, 已插入的行保留在表格中"""
+        if not self.active:
+            return
+        self._timer.stop()
+        self._finish()
+
+    def _populate_batch(self):
+        deadline = time.perf_counter() + INCREMENTAL_TIME_SLICE_MS / 1000
+        self.view.setUpdatesEnabled(False)
+        try:
+            while self.position < len(self.records) and time.perf_counter() < deadline:
+                batch = self.records[self.position:self.position + INCREMENTAL_BATCH_ROWS]
+                self.model.append_records(batch)
+                self.position += len(batch)
+        finally:
+            self.view.setUpdatesEnabled(True)
+        self.progress.emit(self.position, len(self.records))
+        if self.position < len(self.records):
+            self._timer.start(0)
+        else:
+            self._finish()
+
+    def _finish(self):
+        self.records = []
+        self.position = 0
+        if self.proxy is not None:
+            self.proxy.set_suspended(False)
+        self.view.setSortingEnabled(self._sorting_enabled)
+        self.finished.emit()
@@ -0,0 +1,44 @@
+import importlib
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+
+from utils.app_logger import get_logger
+
+error_logger = get_logger(logger_name='error_logger', log_file='error.log')
+
+
+class LazyInterface(QWidget):
+    """
+    子界面的占位控件
+    注册到导航栏时只创建一个空的 QWidget, 第一次切换到该界面(或空闲预热)时才导入模块并构建真正的界面,
+    界面构造函数中的加载请求也随之推迟; objectName 与真正的界面一致, 导航路由不受影响
+    """
+
+    def __init__(self, module: str, class_name: str, parent=None):
+        """
+        :param module: 界面所在模块, 例如 'orders.ordersInterface'
+        :param class_name: 界面类名, 例如 'OrdersInterface'
+        """
+        super().__init__(parent)
+        self.setObjectName(class_name)
+        self.module = module
+        self.class_name = class_name
+        self.interface = None
+        self.vbox = QVBoxLayout(self)
+        self.vbox.setContentsMargins(0, 0, 0, 0)
+
+    @property
+    def built(self) -> bool:
+        return self.interface is not None
+
+    def ensure_built(self):
+        """构建真正的界面并返回, 已构建时直接返回; 构建失败时返回 None, 下次切换时重试"""
+        if self.interface is None:
+            try:
+                interface_class = getattr(importlib.import_module(self.module), self.class_name)
+                self.interface = interface_class()
+            except Exception as e:
+                error_logger.error(f'LazyInterface.ensure_built({self.class_name}): {str(e)}')
+                return None
+            self.vbox.addWidget(self.interface)
+        return self.interface
@@ -0,0 +1,41 @@
+from utils.app_logger import get_logger
+
+error_logger = get_logger(logger_name='error_logger', log_file='error.log')
+
+
+def label_formatter(labels: dict):
+    """
+    由标签映射构建格式化函数, 映射中的值预先转换为字符串, 未知的值原样显示
+    :param labels: 字段值 -> 显示文本, 如 STATUS_MAPPING
+    """
+    table = {key: str(value) for key, value in labels.items()}
+    get = table.get
+    return lambda value: get(value) or str(value)
+
+
+def normalize_records(records: list, columns: list) -> list:
+    """
+    按列批量格式化一组记录(通常为一页或一块), 返回每行显示文本组成的元组列表
+    逐列 map 格式化函数, 省去逐格查找列定义与分支判断的开销;
+    某列格式化失败时退回逐格格式化, 失败的单元格显示原始值
+    :param columns: ColumnSpec 列表, 操作列显示 action_text
+    """
+    formatted_columns = []
+    for spec in columns:
+        if spec.is_action:
+            formatted_columns.append([spec.action_text] * len(records))
+            continue
+        values = [record.get(spec.key, '') for record in records]
+        try:
+            formatted_columns.append(list(map(spec.formatter, values)))
+        except Exception:
+            formatted_columns.append([_format_cell(spec, value) for value in values])
+    return list(zip(*formatted_columns))
+
+
+def _format_cell(spec, value) -> str:
+    try:
+        return spec.formatter(value)
+    except Exception as e:
+        error_logger.error(f'normalize_records: {spec.key}: {e}')
+        return str(value)
@@ -0,0 +1,68 @@
+from utils.app_logger import get_logger
+from utils.worker import Worker
+
+error_logger = get_logger(logger_name='error_logger', log_file='error.log')
+
+
+def response_error(response):
+    """后端返回成功时返回 None, 否则返回错误信息"""
+    if isinstance(response, dict):
+        if response.get('success') is True:
+            return None
+        return response.get('message') or response.get('error') or '未知错误'
+    return str(response)
+
+
+def optimistic_update(model, record_id, changes: dict, func, *args, on_success=None, on_failure=None):
+    """
+    乐观更新: 立即修改表格中 record_id 对应的行, 请求在后台执行, 不再等待后端返回与重新加载
+    后端返回成功时调用 on_success(response), 由调用方与后端数据对账; 失败时将该行恢复为原记录并调用 on_failure(错误信息)
+    :param model: RecordTableModel
+    :param func: 请求函数, 如 APIClient.post_request
+    :param args: 请求参数
+    """
+    original = model.patch_record(record_id, changes)
+
+    def rollback(message: str):
+        if original is not None:
+            model.replace_record(record_id, original)
+        if on_failure is not None:
+            on_failure(message)
+
+    return _run(func, args, on_success, rollback)
+
+
+def optimistic_insert(model, record, func, *args, on_success=None, on_failure=None):
+    """
+    乐观新增: 立即在表格顶部插入 record, 请求在后台执行; 失败时移除该行并调用 on_failure(错误信息)
+    :param record: 待提交的记录, 需包含模型的 id_key 字段
+    """
+    record_id = record.get(model.id_key)
+    model.insert_record(0, record)
+
+    def rollback(message: str):
+        model.remove_record(record_id)
+        if on_failure is not None:
+            on_failure(message)
+
+    return _run(func, args, on_success, rollback)
+
+
+def _run(func, args, on_success, rollback):
+    def finished(response):
+        error = response_error(response)
+        if error is None:
+            # 后端已接受修改, on_success 中的异常只记录日志, 不能回滚该行
+            if on_success is not None:
+                try:
+                    on_success(response)
+                except Exception as e:
+                    error_logger.error(f'optimistic.on_success: {e}')
+        else:
+            rollback(error)
+
+    def failed(e):
+        error_logger.error(f'optimistic: {e}')
+        rollback(str(e))
+
+    return Worker.run_async(func, *args, callback=finished, error_callback=failed)
@@ -0,0 +1,129 @@
+import keyword
+import sys
+from collections.abc import Mapping
+from functools import lru_cache
+
+# 取值重复度高的字段, 转换时驻留(intern)字符串, 相同的值只保留一份
+INTERNED_FIELDS = frozenset({
+    'order_type', 'status', 'categories', 'provider', 'project', 'employee_name', 'specification',
+    'published_at', 'processed_at',
+})
+
+
+class CompactRecord:
+    """
+    紧凑的记录对象, 字段保存在 __slots__ 中, 不再为每条记录分配 dict
+    提供 get / [] / in / keys / items 等只读映射接口, 可以直接替换后端返回的 dict 交给表格模型与导出功能使用;
+    只能修改已有字段, 不能新增字段
+    """
+    __slots__ = ()
+    _fields = ()
+    _field_set = frozenset()
+
+    def get(self, key, default=None):
+        if key in self._field_set:
+            return getattr(self, key, default)
+        return default
+
+    def __getitem__(self, key):
+        if key not in self._field_set:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self._field_set:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key) -> bool:
+        return key in self._field_set
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def keys(self):
+        return self._fields
+
+    def values(self) -> list:
+        return [getattr(self, field, None) for field in self._fields]
+
+    def items(self) -> list:
+        return [(field, getattr(self, field, None)) for field in self._fields]
+
+    def to_dict(self) -> dict:
+        return dict(self.items())
+
+    def replace(self, changes: dict):
+        """返回修改了部分已有字段的副本, 原记录不变"""
+        record = type(self)()
+        for field in self._fields:
+            if field in changes:
+                setattr(record, field, changes[field])
+            elif hasattr(self, field):
+                setattr(record, field, getattr(self, field))
+        return record
+
+    def __eq__(self, other):
+        if isinstance(other, (CompactRecord, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'CompactRecord({self.to_dict()!r})'
+
+
+Mapping.register(CompactRecord)
+
+
+@lru_cache(maxsize=None)
+def record_class(fields: tuple):
+    """按字段名元组创建(并缓存)对应的记录类, 字段名不能作为属性名时返回 None"""
+    for field in fields:
+        if not isinstance(field, str) or not field.isidentifier() or keyword.iskeyword(field) \
+                or field.startswith('_') or hasattr(CompactRecord, field):
+            return None
+    return type('Record', (CompactRecord,), {'__slots__': fields, '_fields': fields, '_field_set': frozenset(fields)})
+
+
+def compact_record(data):
+    """将一条 dict 记录转换为 CompactRecord, 无法转换时原样返回"""
+    if not isinstance(data, dict):
+        return data
+    cls = record_class(tuple(data))
+    if cls is None:
+        return data
+    record = cls()
+    for key, value in data.items():
+        if key in INTERNED_FIELDS and type(value) is str:
+            value = sys.intern(value)
+        setattr(record, key, value)
+    return record
+
+
+def compact_records(records):
+    """
+    原地将记录列表中的 dict 转换为 CompactRecord 并返回该列表
+    逐条替换, 转换过程中已转换的 dict 随即释放, 峰值内存不会翻倍;
+    传入单个 dict 时返回转换后的记录, 其他类型原样返回
+    """
+    if isinstance(records, dict):
+        return compact_record(records)
+    if isinstance(records, list):
+        for i, data in enumerate(records):
+            records[i] = compact_record(data)
+    return records
+
+
+def compacted_copy(records):
+    """
+    与 compact_records 相同, 但转换结果写入新列表, 不修改传入的列表;
+    用于后端返回的响应体, 它可能同时被条件请求缓存与合并的请求共享
+    """
+    if isinstance(records, list):
+        return compact_records(list(records))
+    return compact_records(records)
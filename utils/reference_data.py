@@ -0,0 +1,156 @@
+import time
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from backendRequests.asyncRequests import AsyncAPIClient
+from backendRequests.jsonRequests import APIClient
+from config import URL, REFERENCE_DATA_TTL
+from utils.worker import Worker
+from utils.app_logger import get_logger
+
+error_logger = get_logger(logger_name='error_logger', log_file='error.log')
+
+CATEGORIES_URL = URL + '/inventory/categories/get'
+PROVIDERS_URL = URL + '/providers/all'
+PROJECTS_URL = URL + '/project/all'
+EMPLOYEES_URL = URL + '/employees/all'
+
+
+def parse_categories(items) -> list or None:
+    if items.get('success') is True:
+        seen = set()
+        unique_values = [item['categories'] for item in items['categories'] if
+                         item['categories'] not in seen and not seen.add(item['categories'])]
+        return unique_values
+    else:
+        return None
+
+
+def parse_providers(items) -> list or None:
+    if items['success'] is True:
+        providers = items['data']
+        data = []
+        for provider in providers:
+            data.append(provider.get('provider_name'))
+
+        return data
+    else:
+        return None
+
+
+def parse_projects(items) -> list or None:
+    if items['success'] is True:
+        projects = items['data']
+        data = []
+        for project in projects:
+            if project.get('project_name') != 'null':
+                data.append(project.get('project_name'))
+
+        return data
+    else:
+        return None
+
+
+def parse_employees(items) -> list or None:
+    if isinstance(items, (dict, list)) and items.get('success') is True:
+        return [employee_info.get('employee_name') for employee_info in items.get('data')]
+    else:
+        return None
+
+
+class ReferenceDataStore(QObject):
+    """
+    参考数据缓存
+    类别、供应商、项目与员工列表很少变化, 在内存中按集合缓存 REFERENCE_DATA_TTL 秒;
+    增删改这些数据后调用 invalidate, 缓存会在后台(多个集合时并发)刷新并发出 changed 信号, 下拉框据此重新填充
+    只能在 GUI 线程中使用
+    """
+    changed = pyqtSignal(str)  # 发生变化的集合名称
+
+    COLLECTIONS = {
+        'categories': (CATEGORIES_URL, parse_categories),
+        'providers': (PROVIDERS_URL, parse_providers),
+        'projects': (PROJECTS_URL, parse_projects),
+        'employees': (EMPLOYEES_URL, parse_employees),
+    }
+
+    _instance = None
+
+    def __init__(self):
+        super().__init__()
+        self._cache = {}  # name -> (数据, 获取时间)
+
+    @staticmethod
+    def instance() -> 'ReferenceDataStore':
+        if ReferenceDataStore._instance is None:
+            ReferenceDataStore._instance = ReferenceDataStore()
+        return ReferenceDataStore._instance
+
+    def get(self, name: str) -> list or None:
+        """
+        获取集合数据, 缓存过期或不存在时同步向后端请求
+        :param name: categories / providers / projects / employees
+        :return: 数据列表的副本, 获取失败时返回 None
+        """
+        entry = self._cache.get(name)
+        if entry is not None and time.monotonic() - entry[1] < REFERENCE_DATA_TTL.get(name, 0):
+            return list(entry[0])
+        url, parser = self.COLLECTIONS[name]
+        try:
+            data = parser(Worker.unpack_thread_queue(APIClient.get_request, url))
+        except Exception as e:
+            error_logger.error(f'ReferenceDataStore.get({name}): {e}')
+            return None
+        self._store(name, data)
+        return list(data) if data is not None else None
+
+    def seed(self, name: str, response):
+        """用已获取到的后端返回结果填充缓存, 例如登录后的预取结果"""
+        try:
+            self._store(name, self.COLLECTIONS[name][1](response))
+        except Exception as e:
+            error_logger.error(f'ReferenceDataStore.seed({name}): {e}')
+
+    def invalidate(self, *names: str):
+        """丢弃一个或多个集合的缓存并在后台重新获取, 获取完成后发出 changed 信号"""
+        for name in names:
+            self._cache.pop(name, None)
+        self.refresh(*names)
+
+    def refresh(self, *names: str):
+        """
+        在后台并发重新获取一个或多个集合(不指定时为全部), 每个集合获取成功后更新缓存并发出 changed 信号;
+        获取失败的集合保留原有缓存
+        """
+        names = names or tuple(self.COLLECTIONS)
+        AsyncAPIClient.run(self._fetch_async(names),
+                           callback=lambda responses: self._on_fetched(names, responses),
+                           error_callback=lambda e: error_logger.error(f'ReferenceDataStore.refresh{names}: {e}'))
+
+    @staticmethod
+    async def _fetch_async(names: tuple) -> list:
+        return await AsyncAPIClient.gather(
+            *(AsyncAPIClient.get_request(ReferenceDataStore.COLLECTIONS[name][0]) for name in names),
+            return_exceptions=True
+        )
+
+    def _on_fetched(self, names: tuple, responses: list):
+        for name, response in zip(names, responses):
+            if isinstance(response, Exception):
+                error_logger.error(f'ReferenceDataStore.refresh({name}): {response}')
+            else:
+                self._on_refreshed(name, response)
+
+    def _on_refreshed(self, name: str, response):
+        try:
+            data = self.COLLECTIONS[name][1](response)
+        except Exception as e:
+            error_logger.error(f'ReferenceDataStore._on_refreshed({name}): {e}')
+            return
+        if data is not None:
+            self._store(name, data)
+            self.changed.emit(name)
+
+    def _store(self, name: str, data):
+        if data is not None:
+            self._cache[name] = (data, time.monotonic())
@@ -0,0 +1,125 @@
+import glob
+import hashlib
+import os
+
+from PyQt6.QtCore import Qt, QSize, QStandardPaths
+from PyQt6.QtGui import QIcon, QPixmap
+
+from config import RESOURCE_CACHE_DIR
+from utils.app_logger import get_logger
+from windows.mypath import resource_path
+
+error_logger = get_logger(logger_name='error_logger', log_file='error.log')
+
+# 进程内缓存: 同一路径(与尺寸)的图标与图片只解码一次
+_icons = {}  # (路径, 尺寸) -> QIcon
+_pixmaps = {}  # (路径, 宽, 高, 缩放模式) -> QPixmap
+
+
+def load_icon(path: str, sizes: tuple = None) -> QIcon:
+    """
+    按路径缓存的图标, 只能在 GUI 线程中调用
+    :param path: 图标文件路径, SVG 图标无需指定 sizes
+    :param sizes: 位图图标需要的边长列表, 每个尺寸使用预先缩放并缓存到磁盘的图片
+    """
+    key = (path, sizes)
+    icon = _icons.get(key)
+    if icon is None:
+        if sizes:
+            icon = QIcon()
+            for size in sizes:
+                pixmap = load_pixmap(path, QSize(size, size), Qt.AspectRatioMode.KeepAspectRatio)
+                if not pixmap.isNull():
+                    icon.addPixmap(pixmap)
+        else:
+            icon = QIcon(path)
+        _icons[key] = icon
+    return icon
+
+
+def load_pixmap(path: str, size: QSize = None,
+                aspect_mode=Qt.AspectRatioMode.KeepAspectRatioByExpanding) -> QPixmap:
+    """
+    按路径与尺寸缓存的图片, 只能在 GUI 线程中调用
+    指定 size 时优先读取磁盘缓存中已缩放好的图片, 没有时解码原图、平滑缩放后写入磁盘缓存,
+    之后的启动与重新登录无需再解码与缩放原图; 原图修改后(大小变化)缓存自动失效
+    """
+    key = (path, size.width(), size.height(), aspect_mode) if size is not None else (path, None, None, None)
+    pixmap = _pixmaps.get(key)
+    if pixmap is None:
+        pixmap = _load_scaled(path, size, aspect_mode) if size is not None else QPixmap(path)
+        _pixmaps[key] = pixmap
+    return pixmap
+
+
+def clear_resource_cache(disk: bool = False):
+    """清空进程内缓存, disk 为 True 时同时删除磁盘缓存"""
+    _icons.clear()
+    _pixmaps.clear()
+    if disk:
+        for cached in glob.glob(os.path.join(cache_dir(), '*')):
+            try:
+                os.remove(cached)
+            except OSError as e:
+                error_logger.error(f'resource_cache.clear_resource_cache: {e}')
+
+
+def cache_dir() -> str:
+    """
+    磁盘缓存目录: 配置了 RESOURCE_CACHE_DIR 时使用该目录,
+    否则使用当前用户的缓存目录(QStandardPaths.CacheLocation)下的 resources 子目录, 不依赖程序的工作目录
+    """
+    if RESOURCE_CACHE_DIR:
+        return os.path.abspath(RESOURCE_CACHE_DIR)
+    location = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+    return os.path.join(location or os.path.join(os.path.expanduser('~'), '.cache', 'wms'), 'resources')
+
+
+def _load_scaled(path: str, size: QSize, aspect_mode) -> QPixmap:
+    cached_path = _cached_path(path, size, aspect_mode)
+    if cached_path is not None and os.path.exists(cached_path):
+        pixmap = QPixmap(cached_path)
+        if not pixmap.isNull():
+            return pixmap
+    pixmap = QPixmap(path)
+    if pixmap.isNull():
+        return pixmap
+    pixmap = pixmap.scaled(size, aspect_mode, Qt.TransformationMode.SmoothTransformation)
+    if cached_path is not None:
+        _save(pixmap, cached_path)
+    return pixmap
+
+
+def _cached_path(path: str, size: QSize, aspect_mode) -> str or None:
+    """
+    磁盘缓存文件名: 原文件名-宽x高-缩放模式-校验值
+    校验值由原图相对于资源目录的路径与文件大小计算; 打包后的程序每次启动时资源解压到不同的临时目录,
+    文件的绝对路径与修改时间都会变化, 不参与计算
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    name, ext = os.path.splitext(os.path.basename(path))
+    ext = '.jpg' if ext.lower() in ('.jpg', '.jpeg') else '.png'  # 照片保持 JPG, 其余(包括 SVG)保存为 PNG
+    relative_path = os.path.relpath(os.path.abspath(path), os.path.abspath(resource_path)).replace(os.sep, '/')
+    digest = hashlib.sha1(f'{relative_path}|{stat.st_size}'.encode('utf-8')).hexdigest()[:12]
+    return os.path.join(cache_dir(), f'{name}-{size.width()}x{size.height()}-m{aspect_mode.value}-{digest}{ext}')
+
+
+def _save(pixmap: QPixmap, cached_path: str):
+    """先写入临时文件再替换, 并删除同一图片同一尺寸与缩放模式的旧版本"""
+    directory = os.path.dirname(cached_path)
+    prefix = os.path.basename(cached_path).rsplit('-', 1)[0]
+    ext = os.path.splitext(cached_path)[1]
+    temp_path = cached_path + '.tmp'
+    try:
+        os.makedirs(directory, exist_ok=True)
+        if not pixmap.save(temp_path, 'JPG' if ext == '.jpg' else 'PNG', 95):
+            return
+        os.replace(temp_path, cached_path)
+        for stale in glob.glob(os.path.join(directory, glob.escape(prefix) + '-*' + ext)):
+            if stale != cached_path:
+                os.remove(stale)
+    except OSError as e:
+        error_logger.error(f'resource_cache._save: {e}')
@@ -0,0 +1,83 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class SelectionStore(QObject):
+    """
+    按主键记录的选中集合
+    与表格模型分离, 翻页、切换分页/连续滚动模式、重新排序后选中状态保持不变;
+    "选中全部匹配结果"时只记录过滤条件(filter_key)与被单独取消选中的 id,
+    执行批量操作时再通过 resolver 异步向后端查询全部匹配的 id, 尚未加载到表格中的记录也会包含在内
+    """
+    changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.ids = {}  # 用 dict 保存选中的 id, 保持选中的先后顺序
+        self.all_matching = False
+        self.filter_key = None  # 选中全部匹配结果时的过滤条件, 交给 resolver 解析
+        self.matching_count = 0
+        self.excluded = set()  # 选中全部匹配结果后又被取消选中的 id
+
+    def is_selected(self, record_id) -> bool:
+        if self.all_matching:
+            return record_id not in self.excluded
+        return record_id in self.ids
+
+    def set_selected(self, record_id, selected: bool):
+        if self.all_matching:
+            if selected:
+                self.excluded.discard(record_id)
+            else:
+                self.excluded.add(record_id)
+        elif selected:
+            self.ids[record_id] = None
+        else:
+            self.ids.pop(record_id, None)
+        self.changed.emit()
+
+    def select_all_matching(self, filter_key, count: int = 0):
+        """
+        选中当前过滤条件下的全部记录
+        :param filter_key: 过滤条件, 由 resolver 解析为 id 列表, 例如获取全部匹配记录的 URL
+        :param count: 匹配的记录总数, 仅用于显示
+        """
+        self.ids.clear()
+        self.excluded.clear()
+        self.all_matching = True
+        self.filter_key = filter_key
+        self.matching_count = count
+        self.changed.emit()
+
+    def clear(self):
+        self.ids.clear()
+        self.excluded.clear()
+        self.all_matching = False
+        self.filter_key = None
+        self.matching_count = 0
+        self.changed.emit()
+
+    def count(self) -> int:
+        if self.all_matching:
+            return max(self.matching_count - len(self.excluded), 0)
+        return len(self.ids)
+
+    def selected_ids(self, resolver=None) -> list:
+        """
+        返回选中的 id 列表
+        :param resolver: 函数 (filter_key) -> 全部匹配的 id 列表, 选中全部匹配结果时必须提供
+        """
+        if not self.all_matching:
+            return list(self.ids)
+        return [record_id for record_id in resolver(self.filter_key) if record_id not in self.excluded]
+
+    def resolve_async(self, resolver, callback):
+        """
+        获取选中的 id 列表后调用 callback(id 列表); 未选中全部匹配结果时立即调用
+        :param resolver: 函数 (filter_key, on_resolved), 在后台查询全部匹配的 id, 完成后在 GUI 线程中调用 on_resolved(id 列表)
+        """
+        if not self.all_matching:
+            callback(list(self.ids))
+            return
+        excluded = set(self.excluded)
+        resolver(self.filter_key,
+                 lambda record_ids: callback([record_id for record_id in record_ids if record_id not in excluded]))
@@ -0,0 +1,294 @@
+from functools import lru_cache
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from utils.functional_utils import MONTH_MAP
+from utils.normalize import normalize_records
+from utils.app_logger import get_logger
+
+error_logger = get_logger(logger_name='error_logger', log_file='error.log')
+
+try:
+    from pypinyin import lazy_pinyin  # 用于按拼音排序中文名称
+except ImportError:
+    lazy_pinyin = None
+    error_logger.warning('sort_filter_proxy: 未安装 pypinyin, 中文名称将按文本(码位)顺序排序而不是按拼音排序')
+
+# 排序键统一为 (类别, 值): 数值 < 文本 < 空值, 不同类型的字段值之间也可以比较
+_EMPTY_KEY = (2, '')
+
+
+def default_sort_key(value):
+    if value is None or value == '':
+        return _EMPTY_KEY
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return 0, value
+    return 1, str(value)
+
+
+def numeric_sort_key(value):
+    """按数值排序, 后端以字符串返回的价格、总价等字段也按数值比较"""
+    if value is None or value == '':
+        return _EMPTY_KEY
+    try:
+        return 0, float(value)
+    except (TypeError, ValueError):
+        return 1, str(value)
+
+
+def date_sort_key(value):
+    """按日期排序, 日期格式如 'Tue, 05 Nov 2024 00:00:00 GMT'"""
+    if not value:
+        return _EMPTY_KEY
+    parts = str(value).split(' ')
+    if len(parts) == 6 and parts[2] in MONTH_MAP and parts[1].isdigit() and parts[3].isdigit():
+        return 0, (int(parts[3]), int(MONTH_MAP[parts[2]]), int(parts[1]), parts[4])
+    return 1, str(value)
+
+
+@lru_cache(maxsize=8192)
+def _pinyin(text: str) -> str:
+    return ' '.join(lazy_pinyin(text)).lower()
+
+
+def pinyin_sort_key(value):
+    """中文名称按拼音排序, 未安装 pypinyin 时按文本排序"""
+    if value is None or value == '':
+        return _EMPTY_KEY
+    text = str(value)
+    return 1, _pinyin(text) if lazy_pinyin is not None else text
+
+
+class RecordSortFilterProxyModel(QAbstractTableModel):
+    """
+    RecordTableModel 的排序/过滤代理模型, 只在已加载的数据上操作, 不请求后端
+    每列的排序键与每行的检索文本在数据加载后首次使用时计算一次并缓存, 之后重新排序或过滤只是对行号列表排序/筛选;
+    点击表头时按该列排序, 之前排序的列作为次要排序条件(最多 MAX_SORT_COLUMNS 列);
+    未排序、未过滤时行号一一对应, 源模型的插入/删除直接转发给视图; 暂停(set_suspended)期间源模型末尾追加的行
+    按原顺序追加; 其他情况下重建整个映射
+    """
+    MAX_SORT_COLUMNS = 3
+
+    def __init__(self, source, parent=None):
+        """
+        :param source: RecordTableModel
+        """
+        super().__init__(parent)
+        self.source = source
+        self.rows = []  # 代理行号 -> 源行号
+        self._proxy_rows = []  # 源行号 -> 代理行号, 被过滤掉的行为 -1
+        self.sort_order = []  # [(列号, Qt.SortOrder)], 主排序列在前
+        self.filter_text = ''
+        self.column_filters = {}  # 字段名 -> 需要完全匹配的字段值
+        self._sort_keys = {}  # 列号 -> 每个源行的排序键
+        self._search_texts = None  # 每个源行的检索文本(小写)
+        self.suspended = False
+        self._identity = True  # 代理行号与源行号是否一一对应
+        self._pending = None  # 正在进行的插入/删除的处理方式: 'identity'、'append' 或 'reset'
+
+        source.modelAboutToBeReset.connect(self.beginResetModel)
+        source.modelReset.connect(self._on_source_reset)
+        source.rowsAboutToBeInserted.connect(self._on_source_rows_about_to_be_inserted)
+        source.rowsInserted.connect(self._on_source_rows_inserted)
+        source.rowsAboutToBeRemoved.connect(self._on_source_rows_about_to_be_removed)
+        source.rowsRemoved.connect(self._on_source_rows_removed)
+        source.dataChanged.connect(self._on_source_data_changed)
+        self._rebuild()
+
+    # 代理接口, 供 create_table_view、ActionButtonDelegate 等按视图当前模型调用
+    @property
+    def selection(self):
+        return self.source.selection
+
+    def record(self, row: int):
+        return self.source.record(self.rows[row])
+
+    def column_spec(self, column: int):
+        return self.source.column_spec(column)
+
+    def action_columns(self) -> list:
+        return self.source.action_columns()
+
+    def toggle_checked(self, index):
+        self.source.toggle_checked(self.mapToSource(index))
+
+    def mapToSource(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        return self.source.index(self.rows[index.row()], index.column())
+
+    def mapFromSource(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        row = self._proxy_rows[index.row()]
+        return self.index(row, index.column()) if row >= 0 else QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.source.columnCount()
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Vertical and role == Qt.ItemDataRole.DisplayRole:
+            return section + 1
+        return self.source.headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        return self.source.data(self.mapToSource(index), role) if index.isValid() else None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        return self.source.setData(self.mapToSource(index), value, role) if index.isValid() else False
+
+    def flags(self, index):
+        return self.source.flags(self.mapToSource(index))
+
+    def sort(self, column: int, order=Qt.SortOrder.AscendingOrder):
+        """由视图在点击表头时调用; column 为 -1 或多选框列时恢复原始顺序"""
+        spec = self.source.column_spec(column) if 0 <= column < self.columnCount() else None
+        if spec is None or spec.is_action:
+            self.sort_order = []
+        else:
+            self.sort_order = [(column, order)] + [item for item in self.sort_order if item[0] != column]
+            del self.sort_order[self.MAX_SORT_COLUMNS:]
+        self._reapply()
+
+    def set_filter_text(self, text: str):
+        """按文本过滤, 以空格分隔的多个关键字需同时出现在该行任意列的显示文本中"""
+        self.filter_text = text.strip().lower()
+        self._reapply()
+
+    def set_column_filter(self, key: str, value=None):
+        """按字段值过滤, value 为 None 时取消该字段的过滤"""
+        if value is None:
+            self.column_filters.pop(key, None)
+        else:
+            self.column_filters[key] = value
+        self._reapply()
+
+    def clear_filters(self):
+        self.filter_text = ''
+        self.column_filters.clear()
+        self._reapply()
+
+    def set_suspended(self, suspended: bool):
+        """暂停排序与过滤, 用于分批填充数据期间; 恢复时对全部数据重新排序与过滤"""
+        if suspended == self.suspended:
+            return
+        self.suspended = suspended
+        if not suspended:
+            self._sort_keys.clear()
+            self._search_texts = None
+            self._reapply()
+
+    def _on_source_rows_about_to_be_inserted(self, parent, first: int, last: int):
+        if self._identity:
+            self._pending = 'identity'
+            self.beginInsertRows(QModelIndex(), first, last)
+        elif self.suspended and first == len(self._proxy_rows):
+            self._pending = 'append'
+            start = len(self.rows)
+            self.beginInsertRows(QModelIndex(), start, start + last - first)
+        else:
+            self._pending = 'reset'
+            self.beginResetModel()
+
+    def _on_source_rows_inserted(self, parent, first: int, last: int):
+        if self._pending == 'reset':
+            self._on_source_reset()
+            return
+        self._sort_keys.clear()
+        self._search_texts = None
+        if self._pending == 'identity':
+            self._set_identity(len(self.source.records))
+        else:
+            start = len(self.rows)
+            self.rows.extend(range(first, last + 1))
+            self._proxy_rows.extend(range(start, start + last - first + 1))
+        self.endInsertRows()
+
+    def _on_source_rows_about_to_be_removed(self, parent, first: int, last: int):
+        self._pending = 'identity' if self._identity else 'reset'
+        if self._identity:
+            self.beginRemoveRows(QModelIndex(), first, last)
+        else:
+            self.beginResetModel()
+
+    def _on_source_rows_removed(self, parent, first: int, last: int):
+        if self._pending == 'reset':
+            self._on_source_reset()
+            return
+        self._sort_keys.clear()
+        self._search_texts = None
+        self._set_identity(len(self.source.records))
+        self.endRemoveRows()
+
+    def _reapply(self):
+        self.beginResetModel()
+        self._rebuild()
+        self.endResetModel()
+
+    def _on_source_reset(self):
+        # 数据已替换, 丢弃之前计算的排序键与检索文本
+        self._sort_keys.clear()
+        self._search_texts = None
+        self._rebuild()
+        self.endResetModel()
+
+    def _on_source_data_changed(self, top_left, bottom_right, roles=()):
+        if list(roles) != [Qt.ItemDataRole.CheckStateRole]:
+            # 字段值被修改, 排序键与检索文本在下次排序/过滤时重新计算, 不会自动重新排序
+            self._sort_keys.clear()
+            self._search_texts = None
+        if self.rows:
+            self.dataChanged.emit(self.index(0, top_left.column()),
+                                  self.index(len(self.rows) - 1, bottom_right.column()), roles)
+
+    def _rebuild(self):
+        records = self.source.records
+        if self.suspended or not (self.sort_order or self.filter_text or self.column_filters):
+            self._set_identity(len(records))
+            return
+        rows = list(range(len(records)))
+        if self.filter_text:
+            texts = self._get_search_texts()
+            for keyword in self.filter_text.split():
+                rows = [row for row in rows if keyword in texts[row]]
+        for key, value in self.column_filters.items():
+            rows = [row for row in rows if records[row].get(key) == value]
+        # 稳定排序: 从次要排序列开始依次排序, 最后按主排序列排序
+        for column, order in reversed(self.sort_order):
+            rows.sort(key=self._get_sort_keys(column).__getitem__, reverse=order == Qt.SortOrder.DescendingOrder)
+        self._set_rows(rows, len(records))
+
+    def _set_identity(self, source_count: int):
+        self._identity = True
+        self.rows = list(range(source_count))
+        self._proxy_rows = list(range(source_count))
+
+    def _set_rows(self, rows: list, source_count: int):
+        self._identity = False
+        self.rows = rows
+        self._proxy_rows = [-1] * source_count
+        for proxy_row, row in enumerate(rows):
+            self._proxy_rows[row] = proxy_row
+
+    def _get_sort_keys(self, column: int) -> list:
+        keys = self._sort_keys.get(column)
+        if keys is None:
+            spec = self.source.column_spec(column)
+            key_func = spec.sort_key or default_sort_key
+            values = [record.get(spec.key) for record in self.source.records]
+            try:
+                keys = list(map(key_func, values))
+            except Exception:
+                keys = list(map(default_sort_key, values))
+            self._sort_keys[column] = keys
+        return keys
+
+    def _get_search_texts(self) -> list:
+        if self._search_texts is None:
+            columns = [spec for spec in self.source.columns if not spec.is_action]
+            display = normalize_records(self.source.records, columns)
+            self._search_texts = ['\x1f'.join(row).lower() for row in display]
+        return self._search_texts
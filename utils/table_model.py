@@ -0,0 +1,429 @@
+from collections import OrderedDict, deque
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+
+from config import INFINITE_SCROLL_ROW_BUDGET, NORMALIZE_BLOCK_SIZE, NORMALIZE_MAX_BLOCKS
+from utils.app_logger import get_logger
+from utils.normalize import normalize_records
+from utils.record_store import CompactRecord
+from utils.selection_store import SelectionStore
+
+error_logger = get_logger(logger_name='error_logger', log_file='error.log')
+
+
+class ColumnSpec:
+    """
+    表格列定义
+    :param key: 记录中对应的字段名, 操作列为 None
+    :param header: 表头文本
+    :param formatter: 函数 (value) -> str, 将字段值转换为显示文本, 默认为 str
+    :param alignment: 文本对齐方式
+    :param editable: 是否允许在表格中直接编辑
+    :param action: 操作列的回调, 参数为该行记录; 设置后该列绘制为按钮
+    :param action_text: 操作列按钮上的文字
+    :param sort_key: 函数 (value) -> 排序键, 供 RecordSortFilterProxyModel 使用, 默认为 default_sort_key
+    """
+    __slots__ = ('key', 'header', 'formatter', 'alignment', 'editable', 'action', 'action_text', 'sort_key')
+
+    def __init__(self, key, header: str, formatter=None, alignment=Qt.AlignmentFlag.AlignCenter, editable=False,
+                 action=None, action_text='编辑', sort_key=None):
+        self.key = key
+        self.header = header
+        self.formatter = formatter or str
+        self.alignment = alignment
+        self.editable = editable
+        self.action = action
+        self.action_text = action_text
+        self.sort_key = sort_key
+
+    @property
+    def is_action(self) -> bool:
+        return self.action is not None
+
+
+class RecordTableModel(QAbstractTableModel):
+    """
+    由列定义驱动的通用表格模型
+    只保存后端返回的原始记录, 单元格文本在视图绘制时由 data() 按需格式化, 渲染开销只与可见单元格数量有关;
+    格式化以 NORMALIZE_BLOCK_SIZE 行为一块批量进行(normalize_records), 结果缓存在有界的块 LRU 中;
+    checkable 为 True 时在首列绘制多选框(CheckStateRole), 选中状态按 id_key 对应的字段保存在 SelectionStore 中,
+    替换数据(翻页)后选中状态保持不变
+    """
+
+    def __init__(self, columns: list, id_key: str = None, checkable: bool = False, selection: SelectionStore = None,
+                 parent=None):
+        """
+        :param selection: 选中集合, 多个模型(如分页与连续滚动模型)可以共用同一个; 为 None 时创建新的
+        """
+        super().__init__(parent)
+        self.columns = columns
+        self.id_key = id_key
+        self.checkable = checkable
+        self.records = []
+        self._display_blocks = OrderedDict()  # 块号 -> 该块每行显示文本的元组列表
+        self.selection = selection if selection is not None else SelectionStore(self)
+        self.selection.changed.connect(self._on_selection_changed)
+        # 行号发生变化时缓存的块失效
+        for signal in (self.modelReset, self.rowsInserted, self.rowsRemoved):
+            signal.connect(self._clear_display_cache)
+
+    def set_records(self, records: list):
+        """替换全部数据"""
+        self.beginResetModel()
+        self.records = records or []
+        self.endResetModel()
+
+    def update_records(self, records: list):
+        """
+        按 id_key 将新数据与当前数据逐行比较后更新, 用于增删改之后刷新:
+        只对消失的行发出删除、对新增的行发出插入、对字段值变化的行发出 dataChanged,
+        视图的滚动位置与选中状态保持不变; 没有 id_key 或行的先后顺序发生变化时退回 set_records
+        """
+        records = records or []
+        if self.id_key is None:
+            self.set_records(records)
+            return
+        new_ids = [record.get(self.id_key) for record in records]
+        new_rows = {record_id: row for row, record_id in enumerate(new_ids)}
+        if len(new_rows) != len(new_ids):
+            self.set_records(records)
+            return
+        kept_ids = [record.get(self.id_key) for record in self.records if record.get(self.id_key) in new_rows]
+        kept_id_set = set(kept_ids)
+        if kept_ids != [record_id for record_id in new_ids if record_id in kept_id_set]:
+            self.set_records(records)
+            return
+
+        # 当前的列表可能与页缓存中的数据是同一个对象, 复制后再修改
+        self.records = list(self.records)
+        # 从后往前删除不再存在的行, 连续的行合并为一次删除
+        row = len(self.records) - 1
+        while row >= 0:
+            if self.records[row].get(self.id_key) in new_rows:
+                row -= 1
+                continue
+            last = row
+            while row >= 0 and self.records[row].get(self.id_key) not in new_rows:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row + 1, last)
+            del self.records[row + 1:last + 1]
+            self.endRemoveRows()
+
+        # 剩余的行与新数据中的对应行顺序一致, 依次比较; 不匹配的位置为新增的行
+        keys = [spec.key for spec in self.columns]
+        offset = 1 if self.checkable else 0
+        row = 0
+        while row < len(records):
+            if row < len(self.records) and self.records[row].get(self.id_key) == new_ids[row]:
+                old, new = self.records[row], records[row]
+                changed = [col for col, key in enumerate(keys) if key is not None and old.get(key) != new.get(key)]
+                self.records[row] = new
+                if changed:
+                    self._display_blocks.pop(row // NORMALIZE_BLOCK_SIZE, None)
+                    self.dataChanged.emit(self.index(row, changed[0] + offset), self.index(row, changed[-1] + offset),
+                                          [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+                row += 1
+                continue
+            end = new_rows[self.records[row].get(self.id_key)] if row < len(self.records) else len(records)
+            self.beginInsertRows(QModelIndex(), row, end - 1)
+            self.records[row:row] = records[row:end]
+            self.endInsertRows()
+            row = end
+
+    def find_row(self, record_id) -> int:
+        """返回 id_key 等于 record_id 的行号, 不存在时返回 -1"""
+        for row, record in enumerate(self.records):
+            if record.get(self.id_key) == record_id:
+                return row
+        return -1
+
+    def patch_record(self, record_id, changes: dict):
+        """
+        将 record_id 对应行替换为修改了字段值的副本, 只修改记录中已有的字段;
+        原记录可能同时被页缓存、条件请求缓存等共享, 不在原对象上修改
+        :return: 修改前的原记录, 用于 replace_record 回滚; 行不存在或没有字段变化时返回 None
+        """
+        row = self.find_row(record_id)
+        if row < 0:
+            return None
+        record = self.records[row]
+        patched = {key: value for key, value in changes.items() if key in record and record.get(key) != value}
+        if not patched:
+            return None
+        if isinstance(record, CompactRecord):
+            copy = record.replace(patched)
+        else:
+            copy = dict(record)
+            copy.update(patched)
+        self._replace_row(row, copy, list(patched))
+        return record
+
+    def replace_record(self, record_id, record) -> bool:
+        """将 record_id 对应行替换为 record, 用于撤销 patch_record"""
+        row = self.find_row(record_id)
+        if row < 0:
+            return False
+        old = self.records[row]
+        changed_keys = [spec.key for spec in self.columns if old.get(spec.key) != record.get(spec.key)]
+        self._replace_row(row, record, changed_keys)
+        return True
+
+    def _replace_row(self, row: int, record, changed_keys: list):
+        self.records = list(self.records)  # 不修改页缓存中的列表
+        self.records[row] = record
+        changed = [col for col, spec in enumerate(self.columns) if spec.key in changed_keys]
+        if changed:
+            offset = 1 if self.checkable else 0
+            self._display_blocks.pop(row // NORMALIZE_BLOCK_SIZE, None)
+            self.dataChanged.emit(self.index(row, changed[0] + offset), self.index(row, changed[-1] + offset),
+                                  [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+
+    def insert_record(self, row: int, record):
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.records = list(self.records)  # 不修改页缓存中的列表
+        self.records.insert(row, record)
+        self.endInsertRows()
+
+    def remove_record(self, record_id) -> bool:
+        row = self.find_row(record_id)
+        if row < 0:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.records = list(self.records)
+        del self.records[row]
+        self.endRemoveRows()
+        return True
+
+    def append_records(self, records: list):
+        """在末尾追加数据"""
+        if not records:
+            return
+        start = len(self.records)
+        self.beginInsertRows(QModelIndex(), start, start + len(records) - 1)
+        self.records.extend(records)
+        self.endInsertRows()
+
+    def record(self, row: int) -> dict:
+        return self.records[row]
+
+    def column_spec(self, column: int):
+        """返回列定义, 多选框列返回 None"""
+        if self.checkable:
+            if column == 0:
+                return None
+            column -= 1
+        return self.columns[column]
+
+    def action_columns(self) -> list:
+        """返回所有操作列的列号"""
+        offset = 1 if self.checkable else 0
+        return [col + offset for col, spec in enumerate(self.columns) if spec.is_action]
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.records)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.columns) + (1 if self.checkable else 0)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            spec = self.column_spec(section)
+            return spec.header if spec is not None else ''
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self.records[index.row()]
+        spec = self.column_spec(index.column())
+        if spec is None:
+            if role == Qt.ItemDataRole.CheckStateRole:
+                checked = self.selection.is_selected(record.get(self.id_key))
+                return Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if spec.is_action:
+                return spec.action_text
+            if role == Qt.ItemDataRole.EditRole:
+                return record.get(spec.key, '')
+            return self._display_row(index.row())[index.column() - (1 if self.checkable else 0)]
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return spec.alignment
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid():
+            return False
+        record = self.records[index.row()]
+        spec = self.column_spec(index.column())
+        if spec is None and role == Qt.ItemDataRole.CheckStateRole:
+            # 由 selection.changed 通知视图刷新
+            self.selection.set_selected(record.get(self.id_key), Qt.CheckState(value) == Qt.CheckState.Checked)
+            return True
+        if spec is not None and spec.editable and role == Qt.ItemDataRole.EditRole:
+            record[spec.key] = value
+            self._display_blocks.pop(index.row() // NORMALIZE_BLOCK_SIZE, None)
+            self.dataChanged.emit(index, index, [role])
+            return True
+        return False
+
+    def flags(self, index):
+        flags = Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
+        spec = self.column_spec(index.column()) if index.isValid() else None
+        if spec is not None and spec.editable:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def toggle_checked(self, index):
+        """切换多选框状态, 由视图的点击事件调用"""
+        if self.checkable and index.isValid() and index.column() == 0:
+            checked = self.data(index, Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+            self.setData(index, Qt.CheckState.Unchecked if checked else Qt.CheckState.Checked,
+                         Qt.ItemDataRole.CheckStateRole)
+
+    def _clear_display_cache(self, *args):
+        self._display_blocks.clear()
+
+    def _display_row(self, row: int) -> tuple:
+        """返回一行的显示文本, 首次访问时格式化该行所在的整块"""
+        block = row // NORMALIZE_BLOCK_SIZE
+        rows = self._display_blocks.get(block)
+        if rows is None:
+            start = block * NORMALIZE_BLOCK_SIZE
+            rows = normalize_records(self.records[start:start + NORMALIZE_BLOCK_SIZE], self.columns)
+            self._display_blocks[block] = rows
+            if len(self._display_blocks) > NORMALIZE_MAX_BLOCKS:
+                self._display_blocks.popitem(last=False)
+        else:
+            self._display_blocks.move_to_end(block)
+        return rows[row - block * NORMALIZE_BLOCK_SIZE]
+
+    def _on_selection_changed(self):
+        if self.checkable and self.records:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.records) - 1, 0),
+                                  [Qt.ItemDataRole.CheckStateRole])
+
+
+class LazyRecordTableModel(RecordTableModel):
+    """
+    连续滚动模式的表格模型
+    通过 canFetchMore/fetchMore 在滚动接近底部时从 PaginatedSource 获取下一页并追加到末尾;
+    只保留约 row_budget 行的窗口, 超出时淘汰最早的页, 滚动回顶部时重新获取(通常命中页缓存)
+    """
+    loading_changed = pyqtSignal(bool)
+    load_failed = pyqtSignal(str)
+
+    def __init__(self, columns: list, source, id_key: str = None, checkable: bool = False,
+                 row_budget: int = INFINITE_SCROLL_ROW_BUDGET, selection: SelectionStore = None, parent=None):
+        """
+        :param source: PaginatedSource
+        :param row_budget: 窗口中最多保留的行数, 至少保留一页
+        """
+        super().__init__(columns, id_key=id_key, checkable=checkable, selection=selection, parent=parent)
+        self.source = source
+        self.row_budget = row_budget
+        self.params = None
+        self.page_sizes = deque()  # 窗口中每页的行数, 依次对应 first_page..last_page
+        self.first_page = 1
+        self.total_pages = 1
+        self.loading = False
+        self._generation = 0  # 每次 reset 加一, 丢弃之前发出的请求结果
+
+    @property
+    def last_page(self) -> int:
+        return self.first_page + len(self.page_sizes) - 1
+
+    def reset(self, params: dict = None):
+        """清空窗口并从第一页重新加载, 过滤条件变化或数据变更后调用"""
+        self._generation += 1
+        self.params = params
+        self.page_sizes.clear()
+        self.first_page = 1
+        self.total_pages = 1
+        self.set_records([])
+        self.set_loading(False)
+        self._load(1, append=True)
+
+    def set_loading(self, loading: bool):
+        if loading != self.loading:
+            self.loading = loading
+            self.loading_changed.emit(loading)
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and not self.loading and bool(self.page_sizes) \
+            and self.last_page < self.total_pages
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self._load(self.last_page + 1, append=True)
+
+    def can_fetch_previous(self) -> bool:
+        return not self.loading and self.first_page > 1
+
+    def fetch_previous(self):
+        """重新获取窗口之前已被淘汰的一页并插入到顶部"""
+        if self.can_fetch_previous():
+            self._load(self.first_page - 1, append=False)
+
+    def _load(self, page: int, append: bool):
+        generation = self._generation
+        self.set_loading(True)
+        self.source.fetch(page, self.params,
+                          callback=lambda page_result: self._on_page_loaded(generation, page, append, page_result),
+                          error_callback=lambda e: self._on_load_failed(generation, str(e)))
+
+    def _on_page_loaded(self, generation: int, page: int, append: bool, page_result: dict):
+        if generation != self._generation:
+            return
+        self.set_loading(False)
+        response = page_result['response']
+        if not isinstance(response, dict) or response.get('success') is not True:
+            message = response.get('message') if isinstance(response, dict) else str(response)
+            self.load_failed.emit(message or '无数据')
+            return
+        self.total_pages = page_result['total_pages']
+        records = response.get('data') or []
+        if append:
+            start = len(self.records)
+            if records:
+                self.beginInsertRows(QModelIndex(), start, start + len(records) - 1)
+                self.records.extend(records)
+                self.endInsertRows()
+            self.page_sizes.append(len(records))
+        else:
+            if records:
+                self.beginInsertRows(QModelIndex(), 0, len(records) - 1)
+                self.records[:0] = records
+                self.endInsertRows()
+            self.page_sizes.appendleft(len(records))
+            self.first_page = page
+        self._evict(from_top=append)
+        # 预取窗口两端的相邻页, 继续滚动时直接命中缓存
+        self.source.prefetch_adjacent(page, self.total_pages, self.params)
+
+    def _on_load_failed(self, generation: int, error: str):
+        if generation != self._generation:
+            return
+        self.set_loading(False)
+        error_logger.error(f'LazyRecordTableModel._load: {error}')
+        self.load_failed.emit(error)
+
+    def _evict(self, from_top: bool):
+        """窗口超出 row_budget 时从另一端淘汰整页"""
+        while len(self.records) > self.row_budget and len(self.page_sizes) > 1:
+            if from_top:
+                size = self.page_sizes.popleft()
+                if size:
+                    self.beginRemoveRows(QModelIndex(), 0, size - 1)
+                    del self.records[:size]
+                    self.endRemoveRows()
+                self.first_page += 1
+            else:
+                size = self.page_sizes.pop()
+                if size:
+                    start = len(self.records) - size
+                    self.beginRemoveRows(QModelIndex(), start, len(self.records) - 1)
+                    del self.records[start:]
+                    self.endRemoveRows()
@@ -1,9 +1,10 @@
-from datetime import datetime
+from datetime import datetime, timezone, timedelta
 
-import jwt
-import pytz
 from config import TOKEN_SECRET_KEY
 
+# 东八区固定时区, 代替 pytz.timezone('Asia/Shanghai'), 启动时无需导入 pytz
+CHINA_TIMEZONE = timezone(timedelta(hours=8), 'Asia/Shanghai')
+
 
 def decode_token(token: str) -> dict:
     """
@@ -13,13 +14,13 @@ def decode_token(token: str) -> dict:
     :param secret_key: 用于验证 JWT 的密钥，如果是公钥/私钥签名的话使用公钥/私钥
     :return: 解码后的载荷（字典形式）
     """
+    import jwt  # 延迟导入, 登录窗口显示前不加载 PyJWT 及其依赖
     try:
         # 通过 PyJWT 解码 Token，验证签名并提取载荷 , options={"verify_signature": False}
         payload = jwt.decode(token, TOKEN_SECRET_KEY, algorithms=["HS256"])
-        china_timezone = pytz.timezone('Asia/Shanghai')
-        current_time = datetime.now(china_timezone)
-        exp_time = datetime.fromtimestamp(payload['exp'], china_timezone)
-        iat_time = datetime.fromtimestamp(payload['iat'], china_timezone)
+        current_time = datetime.now(CHINA_TIMEZONE)
+        exp_time = datetime.fromtimestamp(payload['exp'], CHINA_TIMEZONE)
+        iat_time = datetime.fromtimestamp(payload['iat'], CHINA_TIMEZONE)
 
         # print(f"Current time: {current_time}")
         # print(f"Token issued at: {iat_time}")
@@ -34,5 +35,6 @@ def decode_token(token: str) -> dict:
 
 
 def get_privilege(token: str) -> str:
+    import jwt
     payload = jwt.decode(token, TOKEN_SECRET_KEY, algorithms=["HS256"])
     return payload.get('permissions')
@@ -1,6 +1,8 @@
-from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QWidget, QHBoxLayout, QHeaderView
-from qfluentwidgets import PushButton, CheckBox
+from PyQt6.QtCore import Qt, QEvent, QRectF, QTimer
+from PyQt6.QtGui import QColor, QPen
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QHeaderView, QAbstractItemView
+from qfluentwidgets import PushButton, CheckBox, IndeterminateProgressBar, ProgressBar, TableView, TableItemDelegate, \
+    SmoothMode
 
 
 class CustomHeaderView(QHeaderView):
@@ -56,3 +58,136 @@ def create_combo_widget(callback) -> QWidget:
 
     layout.addWidget(print_btn)
     return widget
+
+
+def create_loading_bar(parent) -> IndeterminateProgressBar:
+    """创建加载状态进度条, 默认隐藏"""
+    loading_bar = IndeterminateProgressBar(parent, start=False)
+    loading_bar.setVisible(False)
+    return loading_bar
+
+
+def create_progress_bar(parent) -> ProgressBar:
+    """创建显示填充进度的进度条, 默认隐藏"""
+    progress_bar = ProgressBar(parent)
+    progress_bar.setRange(0, 100)
+    progress_bar.setVisible(False)
+    return progress_bar
+
+
+def update_progress_bar(progress_bar: ProgressBar, value: int, total: int):
+    """更新进度, 完成后隐藏进度条"""
+    progress_bar.setVisible(0 <= value < total)
+    if total:
+        progress_bar.setValue(value * 100 // total)
+
+
+def set_loading_state(loading_bar: IndeterminateProgressBar, loading: bool, *widgets):
+    """
+    切换加载状态: 显示/隐藏进度条, 并禁用/启用相关控件
+    :param loading_bar: create_loading_bar 创建的进度条
+    :param loading: 是否处于加载中
+    :param widgets: 加载期间需要禁用的控件
+    """
+    loading_bar.setVisible(loading)
+    if loading:
+        loading_bar.start()
+    else:
+        loading_bar.stop()
+    for widget in widgets:
+        widget.setDisabled(loading)
+
+
+class ActionButtonDelegate(TableItemDelegate):
+    """
+    操作列委托: 在单元格中绘制按钮并响应点击, 代替为每行创建 create_btn_widget 按钮控件
+    点击时以该行记录调用列定义中的 action, 列定义从视图当前的模型中读取
+    """
+
+    @staticmethod
+    def button_rect(option) -> QRectF:
+        return QRectF(option.rect).adjusted(8, 5, -8, -5)
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
+        rect = self.button_rect(option)
+        painter.setPen(QPen(QColor(0, 0, 0, 25)))
+        painter.setBrush(QColor(255, 255, 255))
+        painter.drawRoundedRect(rect, 5, 5)
+        painter.setPen(QColor(0, 0, 0))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, str(index.data(Qt.ItemDataRole.DisplayRole)))
+        painter.restore()
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        option.text = ''  # 文字由按钮绘制
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton \
+                and self.button_rect(option).contains(event.position()):
+            spec = model.column_spec(index.column())
+            spec.action(model.record(index.row()))
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
+def create_table_view(parent, model, show_row_numbers: bool = False, sortable: bool = False) -> TableView:
+    """
+    创建绑定 RecordTableModel 的表格视图
+    视图只绘制可见行, 多选框列由点击切换, 操作列使用 ActionButtonDelegate 绘制按钮
+    :param sortable: 点击表头时调用模型的 sort(), 用于 RecordSortFilterProxyModel
+    """
+    view = TableView(parent)
+    view.setModel(model)
+    view.setBorderRadius(8)
+    view.setBorderVisible(True)
+    view.verticalHeader().setVisible(show_row_numbers)
+    # 固定行高, 避免视图为计算行高而遍历所有行
+    view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+    view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+    view.scrollDelagate.verticalSmoothScroll.setSmoothMode(SmoothMode.NO_SMOOTH)
+    # 视图可能在分页模型与连续滚动模型之间切换, 始终交给当前模型处理
+    view.clicked.connect(lambda index: index.model().toggle_checked(index))
+    for column in model.action_columns():
+        view.setItemDelegateForColumn(column, ActionButtonDelegate(view))
+    if sortable:
+        # 初始不排序, 保持后端返回的顺序
+        view.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        view.setSortingEnabled(True)
+    return view
+
+
+def attach_infinite_scroll(view, model, threshold: int = 5):
+    """
+    为视图启用连续滚动: 可见区域距底部/顶部不足 threshold 行时让 LazyRecordTableModel 加载后一页/前一页;
+    顶部插入或淘汰行之后滚动到原来的首个可见行, 保持可见内容不跳动
+    """
+    anchor = {'row': -1}
+
+    def on_scrolled():
+        if view.model() is not model or model.loading:
+            return
+        top_row = view.rowAt(0)
+        bottom_row = view.rowAt(view.viewport().height() - 1)
+        if (bottom_row == -1 or bottom_row >= model.rowCount() - threshold) and model.canFetchMore():
+            model.fetchMore()
+        elif 0 <= top_row < threshold and model.can_fetch_previous():
+            model.fetch_previous()
+
+    def remember_anchor(parent, first, last):
+        anchor['row'] = view.rowAt(0) if view.model() is model and first == 0 else -1
+
+    def restore_anchor(delta: int):
+        row, anchor['row'] = anchor['row'], -1
+        if row < 0:
+            return
+        target = model.index(max(row + delta, 0), 0)
+        QTimer.singleShot(0, lambda: view.scrollTo(target, QAbstractItemView.ScrollHint.PositionAtTop))
+
+    view.verticalScrollBar().valueChanged.connect(on_scrolled)
+    model.rowsAboutToBeInserted.connect(remember_anchor)
+    model.rowsAboutToBeRemoved.connect(remember_anchor)
+    model.rowsInserted.connect(lambda parent, first, last: restore_anchor(last - first + 1))
+    model.rowsRemoved.connect(lambda parent, first, last: restore_anchor(first - last - 1))
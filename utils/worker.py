@@ -1,49 +1,184 @@
-from queue import Queue
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
 from functools import wraps
 
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot, Qt
+
+from config import WORKER_MAX_THREADS
+from utils.app_logger import get_logger
+
+error_logger = get_logger(logger_name='error_logger', log_file='error.log')
+
+
+class _ResultDispatcher(QObject):
+    """在 GUI 线程中创建, 通过队列连接把后台任务的结果投递回 GUI 线程"""
+    finished = pyqtSignal(object, object, object)  # future, callback, error_callback
+
+    def __init__(self):
+        super().__init__()
+        self.finished.connect(self._deliver, Qt.ConnectionType.QueuedConnection)
+
+    @pyqtSlot(object, object, object)
+    def _deliver(self, future: Future, callback, error_callback):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None and callback is not None:
+            result = future.result()
+            if isinstance(result, tuple) and len(result) == 1:
+                result = result[0]
+            try:
+                callback(result)
+                return
+            except Exception as e:
+                # 回调自身抛出的异常(包括回调所属的窗口在请求完成前已被销毁)不能传播到 Qt 事件循环中
+                error = e
+        if error is None:
+            return
+        error_logger.error(f'Worker._deliver: {error}')
+        if error_callback is not None:
+            try:
+                error_callback(error)
+            except Exception as e:
+                error_logger.error(f'Worker._deliver: {e}')
+
 
 class Worker:
+    """
+    共享的有界线程池
+    所有被 run_in_thread_with_result 装饰的函数都提交到同一个线程池中执行,
+    避免每次请求都新建线程, 并限制同时发往后端的请求数量
+    """
+    max_workers = WORKER_MAX_THREADS
+
+    _executor = None
+    _dispatcher = None
+    _lock = threading.Lock()
+    # 运行指标
+    _pending = 0  # 已提交但尚未开始执行的任务数(队列深度)
+    _running = 0
+    _completed = 0
+    _total_wait = 0.0  # 任务从提交到开始执行的累计等待时间
+    _max_wait = 0.0
+
     @staticmethod
-    def run_in_thread_with_result(func):
-        """装饰器：在单独线程中运行函数并返回结果"""
+    def get_executor() -> ThreadPoolExecutor:
+        with Worker._lock:
+            if Worker._executor is None:
+                Worker._executor = ThreadPoolExecutor(max_workers=Worker.max_workers, thread_name_prefix='Worker')
+            return Worker._executor
 
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            result_queue = Queue()
+    @staticmethod
+    def configure(max_workers: int):
+        """修改线程池大小, 旧线程池中的任务执行完毕后关闭"""
+        with Worker._lock:
+            Worker.max_workers = max_workers
+            old_executor, Worker._executor = Worker._executor, None
+        if old_executor is not None:
+            old_executor.shutdown(wait=False)
+
+    @staticmethod
+    def shutdown():
+        """关闭线程池, 在程序退出时调用"""
+        with Worker._lock:
+            executor, Worker._executor = Worker._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def submit(func, *args, **kwargs) -> Future:
+        """将函数提交到共享线程池, 并记录排队等待时间"""
+        submitted_at = time.perf_counter()
+
+        def task():
+            waited = time.perf_counter() - submitted_at
+            with Worker._lock:
+                Worker._pending -= 1
+                Worker._running += 1
+                Worker._total_wait += waited
+                Worker._max_wait = max(Worker._max_wait, waited)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with Worker._lock:
+                    Worker._running -= 1
+                    Worker._completed += 1
 
-            def thread_function():
-                try:
-                    result = func(*args, **kwargs)
-                    result_queue.put(result)  # 将结果放入队列
-                except Exception as e:
-                    result_queue.put(e)  # 将异常放入队列
+        with Worker._lock:
+            Worker._pending += 1
+        try:
+            return Worker.get_executor().submit(task)
+        except RuntimeError:
+            # 线程池已关闭
+            with Worker._lock:
+                Worker._pending -= 1
+            raise
+
+    @staticmethod
+    def get_metrics() -> dict:
+        """
+        线程池运行指标
+        :return: 队列深度、运行中任务数、已完成任务数、平均/最大排队等待时间(秒)
+        """
+        with Worker._lock:
+            started = Worker._completed + Worker._running
+            return {
+                'max_workers': Worker.max_workers,
+                'queue_depth': Worker._pending,
+                'running': Worker._running,
+                'completed': Worker._completed,
+                'avg_wait': Worker._total_wait / started if started else 0.0,
+                'max_wait': Worker._max_wait,
+            }
 
-            thread = threading.Thread(target=thread_function)
-            thread.start()
+    @staticmethod
+    def run_in_thread_with_result(func):
+        """装饰器：在共享线程池中运行函数并返回 Future 对象"""
 
-            return thread, result_queue  # 返回线程和队列
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return Worker.submit(func, *args, **kwargs)
 
         return wrapper
 
     @staticmethod
     def unpack_thread_queue(func, *args, **kwargs):
         """
-        解封装线程与队列元组
+        等待线程池任务完成并取出结果
         :param func: 请求函数
         :param args: URL
         :param kwargs: 携带的数据
         :return: 后端返回结果
         """
-        thread, res_que = func(*args, **kwargs)
-        thread.join()
-        response = res_que.get()
+        future = func(*args, **kwargs)
+        response = future.result()  # 任务中抛出的异常会在此处重新抛出
 
-        if isinstance(response, Exception):
-            raise response
         if isinstance(response, tuple) and len(response) == 1:
             response = response[0]
 
         return response
 
+    @staticmethod
+    def run_async(func, *args, callback=None, error_callback=None, **kwargs) -> Future:
+        """
+        非阻塞地执行被装饰的请求函数, 完成后在 GUI 线程中调用回调
+        需要在 GUI 线程中调用
+        :param func: 请求函数, 如 APIClient.get_request
+        :param args: URL
+        :param callback: 成功时的回调, 参数为后端返回结果
+        :param error_callback: 抛出异常时的回调, 参数为异常对象
+        :param kwargs: 携带的数据
+        :return: Future 对象
+        """
+        future = func(*args, **kwargs)
+        Worker.watch(future, callback, error_callback)
+        return future
 
+    @staticmethod
+    def watch(future: Future, callback=None, error_callback=None):
+        """为已有的 Future 注册回调, 结果通过队列信号在 GUI 线程中投递"""
+        if Worker._dispatcher is None:
+            Worker._dispatcher = _ResultDispatcher()
+        dispatcher = Worker._dispatcher
+        future.add_done_callback(lambda f: dispatcher.finished.emit(f, callback, error_callback))
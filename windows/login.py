@@ -1,14 +1,15 @@
 import sys, hashlib
 from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QHBoxLayout
-from PyQt6.QtGui import QPixmap, QPainter, QIcon
+from PyQt6.QtGui import QPainter
 from PyQt6.QtCore import Qt, QSize, pyqtSignal
 from qfluentwidgets import (LineEdit, Theme, setTheme,
                             PasswordLineEdit, InfoBar, InfoBarPosition, PrimaryPushButton)
 from backendRequests.jsonRequests import APIClient
 from utils.app_logger import get_logger
-from config import URL, SALT
+from config import URL, SALT, LOGO_ICON_SIZES
 from utils.worker import Worker
 from utils.functional_utils import hash_password
+from utils.resource_cache import load_icon, load_pixmap
 from windows.mypath import *
 
 error_logger = get_logger(logger_name='error_logger', log_file='error.log')
@@ -23,12 +24,11 @@ class LoginWindow(QWidget):
 
     def initUI(self):
         self.setWindowTitle('仓库管理系统 - 登录')
-        self.setWindowIcon(QIcon(logo_path))
+        self.setWindowIcon(load_icon(logo_path, LOGO_ICON_SIZES))
         self.setFixedSize(1024, 576)
 
-        self.background = QPixmap(background_path)  # Replace with your image path
-        self.background = self.background.scaled(QSize(1024, 576), Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                                                 Qt.TransformationMode.SmoothTransformation)
+        # 缩放后的背景图缓存在磁盘上, 再次启动时无需解码原图并重新缩放
+        self.background = load_pixmap(background_path, QSize(1024, 576), Qt.AspectRatioMode.KeepAspectRatioByExpanding)
 
         # Main layout
         main_layout = QHBoxLayout(self)
@@ -3,8 +3,8 @@ import sys
 
 from PyQt6.QtWidgets import QApplication
 
+from backendRequests.bootstrap import BootstrapPrefetch
 from windows.login import LoginWindow
-from windows.management import MainWindow
 
 
 class MainApp:
@@ -14,6 +14,13 @@ class MainApp:
         self.login_window.login_successful.connect(self.show_main_window)
 
     def show_main_window(self):
+        # 登录成功后在后台并发预取各界面首屏数据, 同时立即构建并显示主窗口;
+        # 界面构建时取用已到达的预取结果, 尚未到达时自行请求, 与预取中相同 URL 的请求会被 APIClient 合并
+        if self.main_window is not None:
+            return
+        BootstrapPrefetch.start()
+        # 主窗口模块在登录成功后才导入, 不影响登录窗口的显示速度
+        from windows.management import MainWindow
         self.login_window.hide()
         self.main_window = MainWindow()
         self.main_window.show()
@@ -1,20 +1,17 @@
-import sys, requests
-from PyQt6.QtGui import QIcon
+import sys
+from collections import deque
+
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QApplication
 from qfluentwidgets import (NavigationItemPosition, MessageBox,  MSFluentWindow)
 
 from utils.app_logger import get_logger
-from inventory.inventoryInterface import InventoryInterface
-from orders.ordersInterface import OrdersInterface
-from employee.employeeInterface import EmployeeInterface
-from project.projectInterface import ProjectInterface
-from provider.providerInterface import ProviderInterface
-from users.userInterface import UserInterface
-from history.historyInterface import HistoryInterface
-from operation_logs.logsInterface import LogsInterface
+from utils.lazy_interface import LazyInterface
+from utils.resource_cache import load_icon
 from backendRequests.jsonRequests import APIClient
+from backendRequests.httpSession import SessionPool
 from utils.token_utils import decode_token
-from config import URL
+from config import URL, LOGO_ICON_SIZES, INTERFACE_WARMUP, INTERFACE_WARMUP_DELAY_MS, INTERFACE_WARMUP_INTERVAL_MS
 from windows.mypath import *
 
 error_logger = get_logger(logger_name='error_logger', log_file='error.log')
@@ -25,52 +22,81 @@ class MainWindow(MSFluentWindow):
         super().__init__()
         self.payload = decode_token(APIClient.jwt_token)
         # print(f'management window payload: {self.payload}')
-        self.inventoryInterface = InventoryInterface()
-        self.ordersInterface = OrdersInterface()
-        self.employeeInterface = EmployeeInterface()
-        self.projectInterface = ProjectInterface()
-        self.providerInterface = ProviderInterface()
-        self.userInterface = UserInterface()
-        self.historyInterface = HistoryInterface()
-        self.logsInterface = LogsInterface()
+        # 子界面先以占位控件注册, 第一次切换到该界面时才构建并加载数据
+        self.inventoryInterface = LazyInterface('inventory.inventoryInterface', 'InventoryInterface')
+        self.ordersInterface = LazyInterface('orders.ordersInterface', 'OrdersInterface')
+        self.employeeInterface = LazyInterface('employee.employeeInterface', 'EmployeeInterface')
+        self.projectInterface = LazyInterface('project.projectInterface', 'ProjectInterface')
+        self.providerInterface = LazyInterface('provider.providerInterface', 'ProviderInterface')
+        self.userInterface = LazyInterface('users.userInterface', 'UserInterface')
+        self.historyInterface = LazyInterface('history.historyInterface', 'HistoryInterface')
+        self.logsInterface = LazyInterface('operation_logs.logsInterface', 'LogsInterface')
+        self.warmup_queue = deque()
 
         self.initNavigation()
         self.initWindow()
+        self.initLazyLoading()
 
     def load_subinterface_icons(self):
         return {
-            "inventory_icon": QIcon(warehouse_path),
-            "order_icon": QIcon(orders_path),
-            "project_icon": QIcon(project_path),
-            "provider_icon": QIcon(provider_path),
-            "user_icon": QIcon(users_path),
-            "employee_icon": QIcon(employee_path),
-            "file_icon": QIcon(file_path),
-            "logs_icon": QIcon(logs_path),
+            "inventory_icon": load_icon(warehouse_path),
+            "order_icon": load_icon(orders_path),
+            "project_icon": load_icon(project_path),
+            "provider_icon": load_icon(provider_path),
+            "user_icon": load_icon(users_path),
+            "employee_icon": load_icon(employee_path),
+            "file_icon": load_icon(file_path),
+            "logs_icon": load_icon(logs_path),
         }
 
     def initNavigation(self):
-        self.addSubInterface(self.inventoryInterface, self.load_subinterface_icons().get("inventory_icon"), '库存管理')
-        self.addSubInterface(self.historyInterface, self.load_subinterface_icons().get('file_icon'), '历史记录')
-        self.addSubInterface(self.ordersInterface, self.load_subinterface_icons().get("order_icon"), '出入库管理')
-        self.addSubInterface(self.projectInterface, self.load_subinterface_icons().get("project_icon"), '项目管理')
-        self.addSubInterface(self.providerInterface, self.load_subinterface_icons().get("provider_icon"), '供应商管理')
+        icons = self.load_subinterface_icons()
+        self.addSubInterface(self.inventoryInterface, icons.get("inventory_icon"), '库存管理')
+        self.addSubInterface(self.historyInterface, icons.get('file_icon'), '历史记录')
+        self.addSubInterface(self.ordersInterface, icons.get("order_icon"), '出入库管理')
+        self.addSubInterface(self.projectInterface, icons.get("project_icon"), '项目管理')
+        self.addSubInterface(self.providerInterface, icons.get("provider_icon"), '供应商管理')
 
         if self.payload.get('permissions') != 'W':
-            self.addSubInterface(self.userInterface, self.load_subinterface_icons().get("user_icon"), '用户管理')
-            self.addSubInterface(self.employeeInterface, self.load_subinterface_icons().get("employee_icon"), '员工管理')
-            self.addSubInterface(self.logsInterface, self.load_subinterface_icons().get("logs_icon"), '操作日志')
+            self.addSubInterface(self.userInterface, icons.get("user_icon"), '用户管理')
+            self.addSubInterface(self.employeeInterface, icons.get("employee_icon"), '员工管理')
+            self.addSubInterface(self.logsInterface, icons.get("logs_icon"), '操作日志')
             # position=NavigationItemPosition.BOTTOM
 
     def initWindow(self):
         self.resize(1280, 760)
-        self.setWindowIcon(QIcon(logo_path))
+        self.setWindowIcon(load_icon(logo_path, LOGO_ICON_SIZES))
         self.setWindowTitle("沈阳市二一三自动化装备有限公司仓库管理系统")
 
         desktop = QApplication.screens()[0].availableGeometry()
         w, h = desktop.width(), desktop.height()
         self.move(w // 2 - self.width() // 2, h // 2 - self.height() // 2)
 
+    def initLazyLoading(self):
+        self.stackedWidget.currentChanged.connect(self.on_interface_changed)
+        # 先让主窗口完成首次绘制, 再构建当前界面
+        QTimer.singleShot(0, self.on_interface_changed)
+        if INTERFACE_WARMUP:
+            self.warmup_queue.extend(
+                widget for widget in (self.stackedWidget.widget(i) for i in range(self.stackedWidget.count()))
+                if isinstance(widget, LazyInterface)
+            )
+            QTimer.singleShot(INTERFACE_WARMUP_DELAY_MS, self.warmup_next)
+
+    def on_interface_changed(self, *args):
+        widget = self.stackedWidget.currentWidget()
+        if isinstance(widget, LazyInterface):
+            widget.ensure_built()
+
+    def warmup_next(self):
+        """空闲时每次构建一个尚未打开过的界面, 构建之间留出间隔, 避免长时间占用事件循环"""
+        while self.warmup_queue:
+            widget = self.warmup_queue.popleft()
+            if not widget.built:
+                widget.ensure_built()
+                QTimer.singleShot(INTERFACE_WARMUP_INTERVAL_MS, self.warmup_next)
+                return
+
     def closeEvent(self, event):
         if APIClient.jwt_token is not None:
             self.destroy_token()
@@ -83,7 +109,8 @@ class MainWindow(MSFluentWindow):
             "Content-Type": "application/json"
         }
         try:
-            response = requests.post(url, headers=headers, timeout=10)
+            with SessionPool.session() as session:
+                session.post(url, headers=headers, timeout=10)
         except Exception as e:
             error_logger.error(f'Management.destroy_token: {str(e)}')
 